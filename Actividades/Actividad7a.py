@@ -5,11 +5,17 @@ Created on Thu Oct 23 11:09:03 2025
 
 @author: isaias-gl
 """
+import os
+import sys
+
 import numpy as np
 import matplotlib.pyplot as plt
 import matplotlib.animation as anim
 from PIL import Image
-from glob import glob
+
+# Dibujo de cuadros sin ventana (Tareas/animacion.py)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'Tareas'))
+from animacion import crear_escritor, figura_agg, renderizar_cuadros
 
 # Parámetros de la onda
 k = 2 * np.pi  # número de onda
@@ -18,28 +24,74 @@ k = 2 * np.pi  # número de onda
 # Definir intervalo para x (de 0 a 4π)
 x = np.linspace(0, 4*np.pi, 1000)
 
+# Número de cuadros y paso de tiempo entre ellos
+n_cuadros = 30
+paso_t = 0.1
+
+
+def figura_onda():
+    """
+    Figura de la onda (lienzo Agg, sin ventana) con una sola línea
+
+    Retorna la figura y la función que actualiza la línea y el título en el
+    cuadro i, en lugar de crear una figura nueva por cuadro
+    """
+    fig = figura_agg((8, 4))
+    ax = fig.subplots()
+    line, = ax.plot(x, np.sin(k*x), 'b-', linewidth=2)
+    titulo = ax.set_title('')
+    ax.set_xlabel('x')
+    ax.set_ylabel('f(x,t)')
+    ax.grid(True, alpha=0.3)
+    ax.set_ylim(-1.5, 1.5)
+    fig.tight_layout(rect=(0, 0, 1, 0.95))
+
+    def actualizar(i):
+        t = i * paso_t  # tiempo actual con paso de 0.1
+
+        # Calcular la función f(x,t) = sen(kx + ωt)
+        line.set_ydata(np.sin(k*x + ω*t))
+        titulo.set_text(f'Onda senoidal: f(x,t) = sen(kx + ωt)\n t = {t:.1f} s')
+        return line, titulo
+
+    return fig, actualizar
+
+
+def generar_cuadros(archivo=None, fps=30, guardar_png=False, conservar=True):
+    """
+    Dibuja los cuadros en memoria y los reparte entre las salidas pedidas
+
+    Parámetros:
+    archivo: GIF o video al que se envían los cuadros al dibujarlos (opcional)
+    fps: cuadros por segundo del archivo
+    guardar_png: además guardar figura001.png, figura002.png, ... (opcional)
+    conservar: retornar copias de los cuadros RGBA para mostrarlos
+
+    Los cuadros se leen directamente del búfer del lienzo (buffer_rgba), sin
+    pasar por archivos intermedios.
+    """
+    salida = crear_escritor(archivo, fps) if archivo is not None else None
+    cuadros = []
+    fig, actualizar = figura_onda()
+
+    try:
+        for i, cuadro in enumerate(renderizar_cuadros(fig, actualizar, range(n_cuadros))):
+            if salida is not None:
+                salida.agregar(cuadro)
+            if guardar_png:
+                # Nombres: figura001.png, figura002.png, etc.
+                Image.fromarray(cuadro).save(f'figura{i+1:03d}.png')
+            if conservar:
+                cuadros.append(cuadro.copy())
+    finally:
+        if salida is not None:
+            salida.cerrar()
+
+    return cuadros
 
-for i in range(30):
-    t = i * 0.1  # tiempo actual con paso de 0.1
-    
-    # Calcular la función f(x,t) = sen(kx + ωt)
-    f = np.sin(k*x + ω*t)
-    
-    
-    # Crear figura
-    plt.figure(figsize=(8, 4))
-    plt.plot(x, f, 'b-', linewidth=2)
-    plt.title(f'Onda senoidal: f(x,t) = sen(kx + ωt)\n t = {t:.1f} s')
-    plt.xlabel('x')
-    plt.ylabel('f(x,t)')
-    plt.grid(True, alpha=0.3)
-    plt.ylim(-1.5, 1.5)
-    
-    # Guardar figura con nombre consecutivo
-    filename = f'figura{i+1:03d}.png'  # Nombres: figura001.png, figura002.png, etc.
-    plt.savefig(filename, dpi=100, bbox_inches='tight')
-    plt.close()
 
+# Cuadros en memoria (las imágenes PNG son ahora una salida opcional)
+cuadros = generar_cuadros(guardar_png=False)
 
 # Crear figura y ejes para la animación
 # figsize=(3.6, 3.5) define el tamaño de la figura en pulgadas
@@ -52,23 +104,9 @@ fig.subplots_adjust(bottom=0, top=1, left=0, right=1)
 # Desactivar los ejes (no mostrar marcas de ejes ni bordes)
 ax.axis('off')
 
-# Lista para almacenar todos los frames de la animación
-ims = []
-
-# Obtener la lista de archivos PNG en orden alfabético
-# glob('figura0*.png') busca todos los archivos que empiezan con 'figura0' y terminan con '.png'
-# sorted() los ordena para asegurar el orden correcto en la animación
-for filename in sorted(glob('figura0*.png')):
-    # Abrir la imagen usando PIL (Python Imaging Library)
-    img = Image.open(filename)
-    
-    # Mostrar la imagen en los ejes
-    # animated=True marca este artista para ser usado en animaciones
-    im = ax.imshow(img, animated=True)
-    
-    # Agregar la imagen a la lista de frames
-    # Cada frame debe ser una lista de artistas (en este caso, solo una imagen)
-    ims.append([im])
+# Cada frame es una lista de artistas (en este caso, solo una imagen)
+# animated=True marca este artista para ser usado en animaciones
+ims = [[ax.imshow(cuadro, animated=True)] for cuadro in cuadros]
 
 # Crear la animación usando ArtistAnimation
 # fig: la figura donde se mostrará la animación
@@ -80,5 +118,5 @@ ani = anim.ArtistAnimation(fig, artists=ims, interval=30, repeat=False)
 # Mostrar la figura con la animación
 fig.show()
 
-# OPCIONAL: Guardar la animación como archivo GIF
-# ani.save('animacion_onda.gif', writer='pillow', fps=30)
\ No newline at end of file
+# OPCIONAL: Guardar la animación como archivo GIF directamente desde los cuadros
+# generar_cuadros(archivo='animacion_onda.gif', fps=30, conservar=False)
@@ -6,10 +6,17 @@ Created on Thu Oct 23 11:40:48 2025
 @author: isaias-gl
 """
 
+import os
+import sys
+
 import numpy as np
 import matplotlib.pyplot as plt
 import matplotlib.animation as anim
 
+# Exportación de animaciones sin ventana (Tareas/animacion.py)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'Tareas'))
+from animacion import exportar_animacion, figura_agg, indices_decimados
+
 # Definición de la función del paquete de onda gaussiano
 def ww(x, t, k0, a0, vp, vg):
     """
@@ -35,6 +42,101 @@ def ww(x, t, k0, a0, vp, vg):
     # Retornar la parte real del paquete normalizado
     return np.real(u / np.sqrt(tc))
 
+def preparar_paquete(x, k0, a0, vp, vg):
+    """
+    Factores del paquete que no dependen del tiempo, calculados una sola vez
+    
+    Parámetros: los mismos de ww (x ordenado de menor a mayor)
+    """
+    return {
+        'x': x,
+        'k0x': k0*x,   # fase de la portadora exp(i*k0*x)
+        'k0': k0, 'a0': a0, 'vp': vp, 'vg': vg,
+    }
+
+def paquete_bloque(factores, t, corte=40.0, out=None):
+    """
+    Parte real del paquete para varios tiempos a la vez, forma (len(t), len(x))
+    
+    Con q = 1/(4*tc), el paquete es exp(E) con
+    Re E = -q_r (x - vg*t)² - ln|tc|/2 y Im E = k0*x - q_i (x - vg*t)² - k0*vp*t - arg(tc)/2,
+    así que su parte real es exp(Re E)*cos(Im E): una exponencial real y un
+    coseno por punto en lugar de la exponencial compleja y dos productos
+    complejos. Los términos que dependen sólo de t son escalares por fila.
+    
+    Sólo se evalúa donde la envolvente supera exp(-corte) en algún tiempo del
+    bloque; fuera de esa ventana el resultado es cero (None = todo x).
+    
+    Parámetros:
+    factores: resultado de preparar_paquete
+    t: arreglo de tiempos
+    corte: umbral de la envolvente en escala logarítmica
+    out: arreglo de salida (len(t), len(x)) para reutilizar (opcional)
+    """
+    x = factores['x']
+    k0, a0, vp, vg = factores['k0'], factores['a0'], factores['vp'], factores['vg']
+    t = np.asarray(t, dtype=float)
+    if out is None:
+        out = np.empty((len(t), len(x)))
+    
+    # tc = α + iβt, donde α = a0² y β = vg/(2k0)
+    tc = a0*a0 + 1j*(0.5*vg/k0)*t
+    q = 0.25 / tc
+    
+    # |envolvente| = exp(-(x - vg*t)² a0²/(4|tc|²)): semiancho donde vale exp(-corte)
+    inicio, fin = 0, len(x)
+    if corte is not None:
+        semiancho = 2*np.max(np.abs(tc))*np.sqrt(corte)/a0
+        inicio = np.searchsorted(x, vg*np.min(t) - semiancho)
+        fin = np.searchsorted(x, vg*np.max(t) + semiancho)
+    out[:, :inicio] = 0.0
+    out[:, fin:] = 0.0
+    if fin <= inicio:
+        return out
+    
+    # (x - vg*t)² dentro de la ventana
+    d2 = x[np.newaxis, inicio:fin] - vg*t[:, np.newaxis]
+    np.square(d2, out=d2)
+    
+    # Fase: k0*x - q_i (x - vg*t)² - (k0*vp*t + arg(tc)/2)
+    fase = d2 * (-q.imag)[:, np.newaxis]
+    fase += factores['k0x'][np.newaxis, inicio:fin]
+    fase -= (k0*vp*t + 0.5*np.angle(tc))[:, np.newaxis]
+    np.cos(fase, out=fase)
+    
+    # Amplitud: exp(-q_r (x - vg*t)² - ln|tc|/2)
+    amplitud = out[:, inicio:fin]
+    np.multiply(d2, (-q.real)[:, np.newaxis], out=amplitud)
+    amplitud -= 0.5*np.log(np.abs(tc))[:, np.newaxis]
+    np.exp(amplitud, out=amplitud)
+    amplitud *= fase
+    
+    return out
+
+def ww_lote(x, tiempos, k0, a0, vp, vg, tamano_bloque=16, corte=40.0):
+    """
+    Generador del paquete para una secuencia de tiempos, por bloques (t, x)
+    
+    Produce pares (t_bloque, y_bloque) con y_bloque de forma
+    (len(t_bloque), len(x)); y_bloque reutiliza la misma memoria en cada
+    bloque, así que hay que usarlo (o copiarlo) antes de pedir el siguiente.
+    Un bloque más grande aprovecha mejor la vectorización a cambio de memoria
+    y de una ventana espacial más ancha.
+    
+    Parámetros:
+    x, k0, a0, vp, vg: como en ww
+    tiempos: arreglo de tiempos
+    tamano_bloque: tiempos por bloque
+    corte: ver paquete_bloque
+    """
+    factores = preparar_paquete(x, k0, a0, vp, vg)
+    tiempos = np.asarray(tiempos, dtype=float)
+    memoria = np.empty((min(tamano_bloque, len(tiempos)), len(x)))
+    for inicio in range(0, len(tiempos), tamano_bloque):
+        t_bloque = tiempos[inicio:inicio + tamano_bloque]
+        yield t_bloque, paquete_bloque(factores, t_bloque, corte,
+                                       out=memoria[:len(t_bloque)])
+
 # PARÁMETROS FÍSICOS DEL SISTEMA
 wavelength = 1.0      # Longitud de onda inicial
 a0 = 1.0              # Ancho inicial del paquete gaussiano
@@ -48,55 +150,97 @@ rundistance = 0.6*vg*runtime     # Distancia total a graficar
 dt = period/6.0                  # Intervalo de tiempo entre frames
 tsteps = int(runtime/dt)         # Número total de frames
 
-# Información sobre la animación
-print('Frame time interval = {0:0.3g} ms'.format(1000*dt))
-print('Frame rate = {0:0.3g} frames/s'.format(1.0/dt))
-
-# CONFIGURACIÓN DE LA FIGURA
-fig, ax = plt.subplots(figsize=(12, 3))  # Crear figura con dimensiones 12x3 pulgadas
-
-# Ajustar márgenes: bottom=0.2 deja espacio para la etiqueta del eje x
-fig.subplots_adjust(bottom=0.2)
-
 # Crear malla espacial para calcular la onda
 # Desde -5*a0 hasta rundistance, con paso de wavelength/20
 x = np.arange(-5*a0, rundistance, wavelength/20.0)
 
-# Crear línea inicial vacía para la animación
-# np.ma.array(x, mask=True) crea un array con todos los elementos enmascarados (invisibles)
-line, = ax.plot(x, np.ma.array(x, mask=True), color='r')
-
-# CONFIGURACIÓN DE LOS EJES
-ax.set_xlabel(r'$x$')                    # Etiqueta del eje x en formato LaTeX
-ax.set_ylabel(r'$y(x,t)$')               # Etiqueta del eje y en formato LaTeX
-ax.set_xlim(-5*a0, rundistance)          # Límites del eje x
-ax.set_ylim(-1.05, 1.05)                 # Límites del eje y (-1.05 a 1.05)
+# Frames calculados juntos por bloque (más rápido, más memoria)
+tamano_bloque = 16
 
-# FUNCIÓN DE ANIMACIÓN - se ejecuta para cada frame
-def animate(i):
+# CONFIGURACIÓN DE LA FIGURA
+def dibujar_paquete(fig):
     """
-    Función que actualiza la animación en cada frame
+    Configura los ejes y la línea del paquete en fig
     
-    Parámetro:
-    i: número del frame actual
+    Retorna la función que actualiza la animación en cada frame
     """
-    # Calcular el tiempo actual
-    t = float(i) * dt
+    ax = fig.subplots()
+    
+    # Ajustar márgenes: bottom=0.2 deja espacio para la etiqueta del eje x
+    fig.subplots_adjust(bottom=0.2)
+    
+    # Crear línea inicial vacía para la animación
+    # np.ma.array(x, mask=True) crea un array con todos los elementos enmascarados (invisibles)
+    line, = ax.plot(x, np.ma.array(x, mask=True), color='r')
     
-    # Actualizar los datos y (amplitud de la onda) usando la función ww
-    line.set_ydata(ww(x, t, k0, a0, vp, vg))
+    # CONFIGURACIÓN DE LOS EJES
+    ax.set_xlabel(r'$x$')                    # Etiqueta del eje x en formato LaTeX
+    ax.set_ylabel(r'$y(x,t)$')               # Etiqueta del eje y en formato LaTeX
+    ax.set_xlim(-5*a0, rundistance)          # Límites del eje x
+    ax.set_ylim(-1.05, 1.05)                 # Límites del eje y (-1.05 a 1.05)
     
-    # Retornar los artistas que deben ser actualizados
-    return line,
+    # Los frames se calculan por bloques de tiempos consecutivos con los
+    # factores precalculados; se guarda sólo el bloque actual
+    factores = preparar_paquete(x, k0, a0, vp, vg)
+    bloque_actual = {}
+    
+    # FUNCIÓN DE ANIMACIÓN - se ejecuta para cada frame
+    def animate(i):
+        """
+        Función que actualiza la animación en cada frame
+        
+        Parámetro:
+        i: número del frame actual
+        """
+        b, j = divmod(i, tamano_bloque)
+        if b not in bloque_actual:
+            # Calcular los tiempos del bloque que contiene al frame i
+            t = np.arange(b*tamano_bloque, min((b + 1)*tamano_bloque, tsteps)) * dt
+            bloque_actual.clear()
+            bloque_actual[b] = paquete_bloque(factores, t)
+        
+        # Actualizar los datos y (amplitud de la onda) del frame i
+        line.set_ydata(bloque_actual[b][j])
+        
+        # Retornar los artistas que deben ser actualizados
+        return line,
+    
+    return animate
 
-# CREAR LA ANIMACIÓN
-ani = anim.FuncAnimation(
-    fig,                    # Figura donde se dibuja la animación
-    func=animate,           # Función que actualiza cada frame
-    frames=range(tsteps),   # Secuencia de frames (0, 1, 2, ..., tsteps-1)
-    interval=1000*dt,       # Intervalo entre frames en milisegundos
-    blit=True               # Optimización: solo redibuja lo que cambia
-)
+def figura_paquete_agg():
+    """
+    Figura fuera de pantalla (lienzo Agg) para exportar la animación
+    """
+    fig = figura_agg((12, 3))
+    return fig, dibujar_paquete(fig)
 
-# Mostrar la animación
-fig.show()
+if __name__ == "__main__":
+    # Información sobre la animación
+    print('Frame time interval = {0:0.3g} ms'.format(1000*dt))
+    print('Frame rate = {0:0.3g} frames/s'.format(1.0/dt))
+    
+    if len(sys.argv) > 1:
+        # EXPORTACIÓN SIN VENTANA: python Actividad7b.py paquete.gif [duración en s]
+        # Se toman fps*duración frames repartidos en toda la simulación
+        archivo = sys.argv[1]
+        duracion = float(sys.argv[2]) if len(sys.argv) > 2 else None
+        cuadros = indices_decimados(tsteps, fps=30, duracion=duracion)
+        print(f'Exportando {len(cuadros)} de {tsteps} frames a {archivo}')
+        exportar_animacion(figura_paquete_agg, cuadros, archivo, fps=30,
+                           procesos=os.cpu_count())
+    else:
+        # Crear figura con dimensiones 12x3 pulgadas
+        fig = plt.figure(figsize=(12, 3))
+        animate = dibujar_paquete(fig)
+        
+        # CREAR LA ANIMACIÓN
+        ani = anim.FuncAnimation(
+            fig,                    # Figura donde se dibuja la animación
+            func=animate,           # Función que actualiza cada frame
+            frames=range(tsteps),   # Secuencia de frames (0, 1, 2, ..., tsteps-1)
+            interval=1000*dt,       # Intervalo entre frames en milisegundos
+            blit=True               # Optimización: solo redibuja lo que cambia
+        )
+        
+        # Mostrar la animación
+        fig.show()
@@ -6,32 +6,226 @@ Created on Mon Oct 20 21:40:36 2025
 @author: isaias-gl
 """
 
+import os
+import sys
+from functools import lru_cache
+from itertools import islice
+
 import numpy as np
 import matplotlib.pyplot as plt
 from mpl_toolkits.mplot3d import Axes3D
+from scipy.fft import rfft2, irfft2, fftfreq, rfftfreq, dstn, idstn
+import scipy.sparse as sp
+import scipy.sparse.linalg as spla
+
+# Operadores diferenciales compartidos (Tareas/operadores.py)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from operadores import laplaciano
 
-def resolver_poisson_gauss_seidel(N=100, tol=1e-8, max_iter=10000):
+def crear_malla(N):
     """
-    Resuelve la ecuación de Poisson con condiciones periódicas usando Gauss-Seidel
+    Crea la malla del dominio [0, 2pi] x [0, 2pi]
     
-    Parámetros:
-    N: número de puntos en cada dirección
-    tol: tolerancia para convergencia
-    max_iter: máximo número de iteraciones
+    Retorna X, Y (indexing='ij') y los espaciamientos dx, dy
     """
-    
-    # Dominio [0, 2pi] x [0, 2pi]
     L = 2 * np.pi
     x = np.linspace(0, L, N)
     y = np.linspace(0, L, N)
     dx = x[1] - x[0]
     dy = y[1] - y[0]
     
-    # Crear mallas
     X, Y = np.meshgrid(x, y, indexing='ij')
     
-    # Término fuente f(x,y)
-    F = np.cos(3*X + 4*Y) - np.cos(5*X - 2*Y)
+    return X, Y, dx, dy
+
+def fuente(X, Y, a=3, b=4, c=5, d=2):
+    """
+    Término fuente f(x,y) = cos(ax + by) - cos(cx - dy)
+    
+    Los valores por defecto dan el problema original cos(3x + 4y) - cos(5x - 2y)
+    """
+    return np.cos(a*X + b*Y) - np.cos(c*X - d*Y)
+
+def fuentes_parametricas(X, Y, parametros):
+    """
+    Generador de términos fuente de la familia cos(ax + by) - cos(cx - dy)
+    
+    Parámetros:
+    X, Y: malla (se construye una sola vez para todo el barrido)
+    parametros: iterable de tuplas (a, b, c, d)
+    """
+    for a, b, c, d in parametros:
+        yield fuente(X, Y, a, b, c, d)
+
+def simbolo_laplaciano(nx, ny, dx, dy, simbolo='discreto'):
+    """
+    Símbolo de Fourier del Laplaciano periódico para transformadas reales (rfft2)
+    
+    Parámetros:
+    nx, ny: número de puntos en cada dirección
+    dx, dy: espaciamiento de la malla
+    simbolo: 'discreto' (estencil de 5 puntos) o 'continuo' (-(kx² + ky²))
+    
+    Retorna un arreglo de forma (nx, ny//2 + 1)
+    """
+    kx = 2 * np.pi * fftfreq(nx, d=dx)
+    ky = 2 * np.pi * rfftfreq(ny, d=dy)
+    
+    if simbolo == 'discreto':
+        lx = (2*np.cos(kx*dx) - 2) / dx**2
+        ly = (2*np.cos(ky*dy) - 2) / dy**2
+    elif simbolo == 'continuo':
+        lx = -kx**2
+        ly = -ky**2
+    else:
+        raise ValueError(f"Símbolo desconocido: {simbolo}")
+    
+    return lx[:, np.newaxis] + ly[np.newaxis, :]
+
+def poisson_fft(F, dx, dy, simbolo='discreto'):
+    """
+    Resuelve ∇²φ = f en una malla periódica con transformadas rápidas de Fourier
+    
+    Se aplica la condición de compatibilidad: la media de f se elimina (el modo
+    k = 0 no tiene solución si f tiene media distinta de cero) y se elige la
+    solución de media cero. Opera sobre los dos últimos ejes de F.
+    
+    Parámetros:
+    F: término fuente
+    dx, dy: espaciamiento de la malla
+    simbolo: 'discreto' (coincide con verificar_solucion a precisión de máquina)
+             o 'continuo' (precisión espectral para fuentes suaves)
+    """
+    nx, ny = F.shape[-2:]
+    lam = simbolo_laplaciano(nx, ny, dx, dy, simbolo)
+    
+    # Evitar la división entre cero del modo constante
+    lam[0, 0] = 1.0
+    F_hat = rfft2(F, axes=(-2, -1), workers=-1)
+    F_hat /= lam
+    F_hat[..., 0, 0] = 0.0
+    
+    return irfft2(F_hat, s=(nx, ny), axes=(-2, -1), workers=-1)
+
+def resolver_poisson_espectral(N=100, simbolo='discreto'):
+    """
+    Resuelve la ecuación de Poisson con condiciones periódicas usando FFT
+    
+    Método directo de costo O(N² log N), sin iteraciones.
+    
+    Parámetros:
+    N: número de puntos en cada dirección
+    simbolo: 'discreto' o 'continuo' (ver poisson_fft)
+    """
+    X, Y, dx, dy = crear_malla(N)
+    F = fuente(X, Y)
+    
+    print("Resolviendo ecuación de Poisson con FFT...")
+    print(f"Grid: {N}x{N}, Símbolo: {simbolo}")
+    
+    media = F.mean()
+    if abs(media) > 1e-12 * np.max(np.abs(F)):
+        print(f"Advertencia: se eliminó la media de f ({media:.2e}) por compatibilidad")
+    
+    phi = poisson_fft(F, dx, dy, simbolo)
+    
+    return X, Y, phi, F
+
+def omega_optimo(nx, ny, dx, dy, periodico=True):
+    """
+    Factor de sobre-relajación óptimo para SOR con el Laplaciano de 5 puntos
+    
+    Parámetros:
+    nx, ny: número de incógnitas en cada dirección
+    dx, dy: espaciamiento de la malla
+    periodico: True para condiciones periódicas, False para Dirichlet
+    """
+    cx, cy = 1/dx**2, 1/dy**2
+    
+    # Radio espectral de Jacobi (sin contar el modo constante en el caso periódico)
+    if periodico:
+        rho = max((cx*np.cos(2*np.pi/nx) + cy) / (cx + cy),
+                  (cx + cy*np.cos(2*np.pi/ny)) / (cx + cy))
+    else:
+        rho = (cx*np.cos(np.pi/(nx + 1)) + cy*np.cos(np.pi/(ny + 1))) / (cx + cy)
+    
+    return 2.0 / (1.0 + np.sqrt(1.0 - rho**2))
+
+def _llenar_fantasmas(P):
+    """
+    Copia en las celdas fantasma de P los valores del lado opuesto (periodicidad)
+    """
+    P[0, 1:-1] = P[-2, 1:-1]
+    P[-1, 1:-1] = P[1, 1:-1]
+    P[1:-1, 0] = P[1:-1, -2]
+    P[1:-1, -1] = P[1:-1, 1]
+
+def _barrido_rojo_negro(P, F, dx, dy, omega=1.0, periodico=True, medir=False):
+    """
+    Realiza un barrido SOR rojo-negro (tablero de ajedrez) sobre P
+    
+    P tiene una capa de celdas fantasma: el interior P[1:-1, 1:-1] contiene las
+    incógnitas y tiene la forma de F. Con periodico=True las celdas fantasma se
+    rellenan antes de cada color; con periodico=False se mantienen fijas
+    (condiciones de Dirichlet). Cada color se actualiza con cuatro vistas
+    estriadas de P, sin ciclos de Python sobre los puntos.
+    
+    Retorna la máxima corrección aplicada si medir=True, o 0.0 en otro caso.
+    """
+    nx, ny = F.shape
+    cx, cy = 1/dx**2, 1/dy**2
+    factor = 1.0 / (2*cx + 2*cy)
+    max_corr = 0.0
+    
+    for color in (0, 1):
+        if periodico:
+            _llenar_fantasmas(P)
+        
+        # Puntos con (i + j) % 2 == color: filas de paridad a, columnas de paridad b
+        for a in (0, 1):
+            b = (color + a) % 2
+            centro = P[1+a:nx+1:2, 1+b:ny+1:2]
+            if centro.size == 0:
+                continue
+            
+            corr = (P[a:nx:2, 1+b:ny+1:2] + P[2+a:nx+2:2, 1+b:ny+1:2]) * cx
+            corr += (P[1+a:nx+1:2, b:ny:2] + P[1+a:nx+1:2, 2+b:ny+2:2]) * cy
+            corr -= F[a::2, b::2]
+            corr *= factor
+            corr -= centro
+            corr *= omega
+            centro += corr
+            
+            if medir:
+                max_corr = max(max_corr, np.max(np.abs(corr)))
+    
+    return max_corr
+
+def resolver_poisson_gauss_seidel(N=100, tol=1e-8, max_iter=10000, metodo='punto',
+                                  omega=None, intervalo_chequeo=10, salida=None):
+    """
+    Resuelve la ecuación de Poisson con condiciones periódicas usando Gauss-Seidel
+    
+    Parámetros:
+    N: número de puntos en cada dirección
+    tol: tolerancia para convergencia
+    max_iter: máximo número de iteraciones
+    metodo: 'punto' (barrido lexicográfico punto por punto) o 'rojo_negro'
+            (SOR rojo-negro vectorizado con NumPy)
+    omega: factor de sobre-relajación para 'rojo_negro' (None = óptimo teórico)
+    intervalo_chequeo: cada cuántos barridos se revisa la convergencia en 'rojo_negro'
+    salida: destino en disco de los iterados de 'rojo_negro' (almacenamiento.EscritorSerie),
+            que recibe phi en cada chequeo con el número de iteración como tiempo
+    """
+    
+    X, Y, dx, dy = crear_malla(N)
+    F = fuente(X, Y)
+    
+    if metodo == 'rojo_negro':
+        return X, Y, _resolver_rojo_negro(F, dx, dy, tol, max_iter, omega,
+                                          intervalo_chequeo, salida), F
+    elif metodo != 'punto':
+        raise ValueError(f"Método desconocido: {metodo}")
     
     # Solución inicial (cero)
     phi = np.zeros((N, N))
@@ -80,6 +274,606 @@ def resolver_poisson_gauss_seidel(N=100, tol=1e-8, max_iter=10000):
     
     return X, Y, phi, F
 
+def _resolver_rojo_negro(F, dx, dy, tol, max_iter, omega, intervalo_chequeo,
+                         salida=None):
+    """
+    Itera SOR rojo-negro periódico hasta que la corrección máxima sea menor que tol
+    
+    La convergencia se revisa sólo cada intervalo_chequeo barridos, midiendo
+    la corrección dentro del propio barrido (sin copiar phi).
+    """
+    N = F.shape[0]
+    if omega is None:
+        omega = omega_optimo(N, N, dx, dy)
+    
+    print(f"Resolviendo ecuación de Poisson con SOR rojo-negro (ω = {omega:.4f})...")
+    print(f"Grid: {N}x{N}, Tolerancia: {tol}")
+    
+    # Solución inicial (cero) con una capa de celdas fantasma
+    P = np.zeros((N + 2, N + 2))
+    max_error = np.inf
+    
+    for iteracion in range(1, max_iter + 1):
+        medir = iteracion % intervalo_chequeo == 0 or iteracion == max_iter
+        error = _barrido_rojo_negro(P, F, dx, dy, omega, medir=medir)
+        
+        if not medir:
+            continue
+        max_error = error
+        if salida is not None:
+            salida.agregar(iteracion, P[1:-1, 1:-1])
+        
+        if iteracion % 1000 < intervalo_chequeo:
+            print(f"Iteración {iteracion}: Error máximo = {max_error:.2e}")
+        
+        if max_error < tol:
+            print(f"Convergencia alcanzada en {iteracion} iteraciones")
+            print(f"Error final: {max_error:.2e}")
+            break
+    else:
+        print(f"Advertencia: Máximo de iteraciones alcanzado")
+        print(f"Error final: {max_error:.2e}")
+    
+    # La solución periódica está definida salvo una constante: se fija media cero
+    phi = P[1:-1, 1:-1].copy()
+    phi -= phi.mean()
+    
+    return phi
+
+def poisson_dst(F, dx, dy):
+    """
+    Resuelve ∇²φ = f con φ = 0 en la frontera usando la transformada seno (DST-I)
+    
+    F contiene sólo los puntos interiores; el resultado tiene su misma forma
+    y satisface exactamente el estencil de 5 puntos.
+    """
+    nx, ny = F.shape
+    lx = (2*np.cos(np.pi*np.arange(1, nx + 1)/(nx + 1)) - 2) / dx**2
+    ly = (2*np.cos(np.pi*np.arange(1, ny + 1)/(ny + 1)) - 2) / dy**2
+    
+    F_hat = dstn(F, type=1, workers=-1)
+    F_hat /= lx[:, np.newaxis] + ly[np.newaxis, :]
+    
+    return idstn(F_hat, type=1, workers=-1)
+
+def _residuo(P, F, dx, dy, periodico=True):
+    """
+    Calcula r = f - ∇²φ en el interior de P (arreglo con celdas fantasma)
+    """
+    if periodico:
+        _llenar_fantasmas(P)
+    c = P[1:-1, 1:-1]
+    
+    r = (P[:-2, 1:-1] + P[2:, 1:-1] - 2*c) * (-1/dx**2)
+    r -= (P[1:-1, :-2] + P[1:-1, 2:] - 2*c) / dy**2
+    r += F
+    
+    return r
+
+def _barrido_jacobi(P, F, dx, dy, omega=0.8, periodico=True):
+    """
+    Realiza un barrido de Jacobi ponderado sobre P (arreglo con celdas fantasma)
+    """
+    if periodico:
+        _llenar_fantasmas(P)
+    cx, cy = 1/dx**2, 1/dy**2
+    factor = 1.0 / (2*cx + 2*cy)
+    
+    corr = (P[:-2, 1:-1] + P[2:, 1:-1]) * cx + (P[1:-1, :-2] + P[1:-1, 2:]) * cy
+    corr -= F
+    corr *= factor
+    corr -= P[1:-1, 1:-1]
+    P[1:-1, 1:-1] += omega * corr
+
+def _suavizar(P, F, dx, dy, periodico, suavizador, omega, barridos):
+    """
+    Aplica el suavizador elegido el número de barridos indicado
+    """
+    for _ in range(barridos):
+        if suavizador == 'jacobi':
+            _barrido_jacobi(P, F, dx, dy, omega, periodico)
+        else:
+            _barrido_rojo_negro(P, F, dx, dy, omega, periodico)
+
+def _rellenar(e, periodico=True):
+    """
+    Agrega una capa de celdas fantasma (periódica o cero) a un arreglo interior
+    """
+    return np.pad(e, 1, mode='wrap' if periodico else 'constant')
+
+def _restringir_1d(R, nc, periodico=True):
+    """
+    Ponderación completa [1/4, 1/2, 1/4] a lo largo del eje 0 de un arreglo con fantasmas
+    """
+    s = 0 if periodico else 1
+    return (0.25 * R[s:s+2*nc:2] + 0.5 * R[1+s:1+s+2*nc:2] +
+            0.25 * R[2+s:2+s+2*nc:2])
+
+def _restringir(r, nc, periodico=True):
+    """
+    Restringe el interior r a la malla gruesa de nc x nc puntos (ponderación completa)
+    """
+    R = _restringir_1d(_rellenar(r, periodico), nc, periodico)
+    return _restringir_1d(R.T, nc, periodico).T
+
+def _prolongar_1d(E, n, periodico=True):
+    """
+    Interpolación lineal a lo largo del eje 0 de un arreglo con fantasmas hacia n puntos
+    """
+    nc = E.shape[0] - 2
+    out = np.empty((n,) + E.shape[1:])
+    if periodico:
+        out[0::2] = E[1:nc+1]
+        out[1::2] = 0.5 * (E[1:nc+1] + E[2:nc+2])
+    else:
+        out[1::2] = E[1:nc+1]
+        out[0::2] = 0.5 * (E[0:nc+1] + E[1:nc+2])
+    return out
+
+def _prolongar(E, n, periodico=True):
+    """
+    Interpolación bilineal del arreglo grueso con fantasmas E a la malla fina de n x n
+    """
+    if periodico:
+        E = _rellenar(E[1:-1, 1:-1])
+    return _prolongar_1d(_prolongar_1d(E, n, periodico).T, n, periodico).T
+
+def niveles_multigrid(n, dx, dy, periodico=True, n_min=3):
+    """
+    Lista de niveles (n, dx, dy) desde la malla fina hasta la más gruesa
+    
+    n es el número de incógnitas por dirección: en el caso periódico se engrosa
+    mientras n sea par; en el de Dirichlet mientras n sea impar (n = 2^k - 1).
+    """
+    niveles = [(n, dx, dy)]
+    while True:
+        n, dx, dy = niveles[-1]
+        if periodico and n % 2 == 0 and n // 2 >= n_min:
+            niveles.append((n // 2, 2*dx, 2*dy))
+        elif not periodico and n % 2 == 1 and (n - 1) // 2 >= n_min:
+            niveles.append(((n - 1) // 2, 2*dx, 2*dy))
+        else:
+            return niveles
+
+def _resolver_grueso(P, F, dx, dy, periodico=True):
+    """
+    Resuelve exactamente el problema de la malla más gruesa con FFT o DST
+    """
+    if periodico:
+        P[1:-1, 1:-1] = poisson_fft(F, dx, dy)
+        return
+    
+    # Mover los valores de frontera (Dirichlet) al lado derecho
+    G = F.copy()
+    G[0, :] -= P[0, 1:-1] / dx**2
+    G[-1, :] -= P[-1, 1:-1] / dx**2
+    G[:, 0] -= P[1:-1, 0] / dy**2
+    G[:, -1] -= P[1:-1, -1] / dy**2
+    P[1:-1, 1:-1] = poisson_dst(G, dx, dy)
+
+def _ciclo_multigrid(niveles, l, P, F, periodico, ciclo, nu1, nu2, suavizador, omega):
+    """
+    Aplica un ciclo V o W desde el nivel l sobre P (arreglo con celdas fantasma)
+    """
+    n, dx, dy = niveles[l]
+    if l == len(niveles) - 1:
+        _resolver_grueso(P, F, dx, dy, periodico)
+        return
+    
+    _suavizar(P, F, dx, dy, periodico, suavizador, omega, nu1)
+    
+    # Ecuación del error en la malla gruesa: ∇²e = r
+    nc = niveles[l + 1][0]
+    rc = _restringir(_residuo(P, F, dx, dy, periodico), nc, periodico)
+    E = np.zeros((nc + 2, nc + 2))
+    for _ in range(2 if ciclo == 'W' else 1):
+        _ciclo_multigrid(niveles, l + 1, E, rc, periodico, ciclo, nu1, nu2,
+                         suavizador, omega)
+    
+    P[1:-1, 1:-1] += _prolongar(E, n, periodico)
+    
+    _suavizar(P, F, dx, dy, periodico, suavizador, omega, nu2)
+
+def _multigrid_completo(niveles, P, F, periodico, ciclo, nu1, nu2, suavizador, omega):
+    """
+    Multigrid completo (FMG): resuelve en la malla gruesa e interpola hacia arriba,
+    aplicando un ciclo en cada nivel
+    """
+    # Lado derecho en cada nivel
+    Fs = [F]
+    for n, _, _ in niveles[1:]:
+        Fs.append(_restringir(Fs[-1], n, periodico))
+    
+    # Arreglos de cada nivel; en Dirichlet se inyectan los valores de frontera
+    Ps = []
+    for l, (n, _, _) in enumerate(niveles):
+        if periodico:
+            Ps.append(np.zeros((n + 2, n + 2)))
+        else:
+            Pl = P[::2**l, ::2**l].copy()
+            Pl[1:-1, 1:-1] = 0.0
+            Ps.append(Pl)
+    
+    ultimo = len(niveles) - 1
+    _resolver_grueso(Ps[ultimo], Fs[ultimo], *niveles[ultimo][1:], periodico)
+    for l in range(ultimo - 1, -1, -1):
+        Ps[l][1:-1, 1:-1] = _prolongar(Ps[l + 1], niveles[l][0], periodico)
+        _ciclo_multigrid(niveles, l, Ps[l], Fs[l], periodico, ciclo, nu1, nu2,
+                         suavizador, omega)
+    
+    P[1:-1, 1:-1] = Ps[0][1:-1, 1:-1]
+
+def multigrid_poisson(F, dx, dy, periodico=True, phi0=None, ciclo='V', fmg=False,
+                      nu1=2, nu2=2, suavizador='gauss_seidel', omega=None,
+                      tol=1e-10, max_ciclos=50):
+    """
+    Resuelve ∇²φ = f con multigrid geométrico (ciclos V/W y multigrid completo)
+    
+    Parámetros:
+    F: término fuente en toda la malla (N x N)
+    dx, dy: espaciamiento de la malla
+    periodico: True para condiciones periódicas; False para Dirichlet, en cuyo
+               caso los valores de frontera se toman del borde de phi0
+               (N = 2^k + 1 permite usar todos los niveles)
+    phi0: aproximación inicial (None = cero)
+    ciclo: 'V' o 'W'
+    fmg: si es True, la aproximación inicial se obtiene con multigrid completo
+    nu1, nu2: barridos de suavizado antes y después de la corrección gruesa
+    suavizador: 'gauss_seidel' (rojo-negro), 'sor' (rojo-negro con omega) o 'jacobi'
+    omega: factor de relajación del suavizador (None = 1.0, 1.15 o 0.8 según el caso)
+    tol: tolerancia para la norma relativa del residual
+    max_ciclos: máximo número de ciclos
+    
+    Retorna phi y la historia de la norma relativa del residual (una entrada
+    inicial y una por ciclo).
+    """
+    if suavizador not in ('gauss_seidel', 'sor', 'jacobi'):
+        raise ValueError(f"Suavizador desconocido: {suavizador}")
+    if omega is None:
+        omega = {'gauss_seidel': 1.0, 'sor': 1.15, 'jacobi': 0.8}[suavizador]
+    
+    if periodico:
+        # Condición de compatibilidad: f debe tener media cero
+        F_int = F - F.mean()
+        P = np.zeros((F.shape[0] + 2, F.shape[1] + 2))
+        if phi0 is not None:
+            P[1:-1, 1:-1] = phi0
+    else:
+        F_int = F[1:-1, 1:-1]
+        P = np.zeros(F.shape) if phi0 is None else np.array(phi0, dtype=float)
+    
+    niveles = niveles_multigrid(F_int.shape[0], dx, dy, periodico)
+    norma_f = np.linalg.norm(F_int)
+    if norma_f == 0:
+        norma_f = 1.0
+    
+    if fmg:
+        _multigrid_completo(niveles, P, F_int, periodico, ciclo, nu1, nu2,
+                            suavizador, omega)
+    
+    historial = [np.linalg.norm(_residuo(P, F_int, dx, dy, periodico)) / norma_f]
+    for _ in range(max_ciclos):
+        if historial[-1] < tol:
+            break
+        _ciclo_multigrid(niveles, 0, P, F_int, periodico, ciclo, nu1, nu2,
+                         suavizador, omega)
+        historial.append(np.linalg.norm(_residuo(P, F_int, dx, dy, periodico)) / norma_f)
+    
+    if periodico:
+        phi = P[1:-1, 1:-1].copy()
+        phi -= phi.mean()
+    else:
+        phi = P
+    
+    return phi, historial
+
+def resolver_poisson_multigrid(N=100, tol=1e-10, ciclo='V', fmg=False, **opciones):
+    """
+    Resuelve la ecuación de Poisson con condiciones periódicas usando multigrid
+    
+    Parámetros:
+    N: número de puntos en cada dirección
+    tol: tolerancia para la norma relativa del residual
+    ciclo: 'V' o 'W'
+    fmg: usar multigrid completo para la aproximación inicial
+    opciones: argumentos adicionales de multigrid_poisson (nu1, nu2, suavizador, ...)
+    """
+    X, Y, dx, dy = crear_malla(N)
+    F = fuente(X, Y)
+    
+    print(f"Resolviendo ecuación de Poisson con multigrid (ciclo {ciclo}"
+          f"{', FMG' if fmg else ''})...")
+    print(f"Grid: {N}x{N}, Tolerancia: {tol}")
+    
+    phi, historial = multigrid_poisson(F, dx, dy, ciclo=ciclo, fmg=fmg, tol=tol,
+                                       **opciones)
+    
+    print(f"Ciclos: {len(historial) - 1}, residual relativo final: {historial[-1]:.2e}")
+    
+    return X, Y, phi, F
+
+def laplaciano_disperso(nx, ny, dx, dy, periodico=True):
+    """
+    Ensambla el Laplaciano de 5 puntos como matriz dispersa CSR de (nx*ny) x (nx*ny)
+    
+    Las incógnitas se ordenan como phi.ravel() (indexing='ij'). Con
+    periodico=False se usan condiciones de Dirichlet homogéneas.
+    """
+    def segunda_diferencia(n, h):
+        D = sp.diags([np.ones(n - 1), -2*np.ones(n), np.ones(n - 1)], [-1, 0, 1],
+                     format='lil')
+        if periodico:
+            D[0, n - 1] = 1.0
+            D[n - 1, 0] = 1.0
+        return D.tocsr() / h**2
+    
+    Dx = segunda_diferencia(nx, dx)
+    Dy = segunda_diferencia(ny, dy)
+    
+    return (sp.kron(Dx, sp.identity(ny)) + sp.kron(sp.identity(nx), Dy)).tocsr()
+
+def laplaciano_operador(nx, ny, dx, dy):
+    """
+    Laplaciano periódico de 5 puntos como LinearOperator (sin almacenar la matriz)
+    """
+    lap = np.empty((nx, ny))
+    
+    def matvec(v):
+        return laplaciano(v.reshape(nx, ny), (dx, dy), out=lap).ravel().copy()
+    
+    return spla.LinearOperator((nx*ny, nx*ny), matvec=matvec, rmatvec=matvec,
+                               dtype=float)
+
+@lru_cache(maxsize=8)
+def factorizacion_splu(nx, ny, dx, dy):
+    """
+    Factorización LU dispersa del Laplaciano periódico, guardada por tamaño de malla
+    
+    El sistema periódico es singular (las constantes están en el núcleo), así que
+    la primera ecuación se reemplaza por phi[0, 0] = 0; para f de media cero las
+    ecuaciones restantes determinan la solución, que luego se lleva a media cero.
+    """
+    A = laplaciano_disperso(nx, ny, dx, dy).tolil()
+    A[0, :] = 0.0
+    A[0, 0] = 1.0
+    return spla.splu(A.tocsc())
+
+def poisson_splu(F, dx, dy):
+    """
+    Resuelve ∇²φ = f periódico reutilizando la factorización LU en caché
+    
+    F puede ser una sola fuente (nx, ny) o una pila (K, nx, ny); en el segundo
+    caso todas se resuelven con una sola llamada a la factorización.
+    """
+    nx, ny = F.shape[-2:]
+    B = F.reshape(-1, nx*ny)
+    B = B - B.mean(axis=1, keepdims=True)
+    B[:, 0] = 0.0
+    
+    phi = factorizacion_splu(nx, ny, dx, dy).solve(B.T).T
+    phi -= phi.mean(axis=1, keepdims=True)
+    
+    return phi.reshape(F.shape)
+
+def _bloques(fuentes, tamano_bloque):
+    """
+    Agrupa una pila (K, nx, ny) o un iterable de fuentes en bloques de tamano_bloque
+    """
+    if isinstance(fuentes, np.ndarray):
+        for i in range(0, fuentes.shape[0], tamano_bloque):
+            yield fuentes[i:i + tamano_bloque]
+        return
+    
+    iterador = iter(fuentes)
+    while True:
+        bloque = list(islice(iterador, tamano_bloque))
+        if not bloque:
+            return
+        yield np.stack(bloque)
+
+def poisson_lote(fuentes, dx, dy, metodo='fft', simbolo='discreto', tamano_bloque=32):
+    """
+    Resuelve ∇²φ = f periódico para muchas fuentes, bloque por bloque
+    
+    Generador: produce arreglos (k, nx, ny) con k <= tamano_bloque, de modo que
+    la memoria usada queda acotada por el tamaño del bloque.
+    
+    Parámetros:
+    fuentes: pila (K, nx, ny) o iterable/generador de arreglos (nx, ny)
+    dx, dy: espaciamiento de la malla
+    metodo: 'fft' (transformada por lotes) o 'splu' (factorización en caché)
+    simbolo: símbolo del Laplaciano para 'fft'
+    tamano_bloque: número de fuentes resueltas en cada paso
+    """
+    if metodo not in ('fft', 'splu'):
+        raise ValueError(f"Método desconocido: {metodo}")
+    
+    for bloque in _bloques(fuentes, tamano_bloque):
+        if metodo == 'fft':
+            yield poisson_fft(bloque, dx, dy, simbolo)
+        else:
+            yield poisson_splu(bloque, dx, dy)
+
+def resolver_poisson_lote(fuentes, dx, dy, metodo='fft', simbolo='discreto',
+                          tamano_bloque=32, salida=None):
+    """
+    Resuelve ∇²φ = f periódico para una pila o un generador de fuentes
+    
+    Parámetros:
+    fuentes, dx, dy, metodo, simbolo, tamano_bloque: ver poisson_lote
+    salida: arreglo (K, nx, ny) donde escribir las soluciones, por ejemplo un
+            np.memmap para resultados que no caben en memoria (None = nuevo arreglo)
+    
+    Retorna la pila de soluciones (K, nx, ny).
+    """
+    if salida is None and isinstance(fuentes, np.ndarray):
+        salida = np.empty(fuentes.shape)
+    
+    lote = poisson_lote(fuentes, dx, dy, metodo, simbolo, tamano_bloque)
+    if salida is None:
+        return np.concatenate(list(lote))
+    
+    inicio = 0
+    for bloque in lote:
+        salida[inicio:inicio + bloque.shape[0]] = bloque
+        inicio += bloque.shape[0]
+    
+    return salida
+
+def precondicionador_poisson(nx, ny, dx, dy, tipo='jacobi'):
+    """
+    Construye un precondicionador para -∇² periódico como LinearOperator
+    
+    Parámetros:
+    tipo: 'jacobi' (diagonal), 'ilu' (factorización incompleta simetrizada, con
+          un pequeño corrimiento para evitar la singularidad) o 'multigrid'
+          (un ciclo V simétrico con suavizador de Jacobi)
+    """
+    n = nx * ny
+    diag = 2/dx**2 + 2/dy**2
+    
+    if tipo == 'jacobi':
+        def aplicar(r):
+            return r / diag
+    elif tipo == 'ilu':
+        A = -laplaciano_disperso(nx, ny, dx, dy) + 1e-2 * diag * sp.identity(n)
+        ilu = spla.spilu(A.tocsc(), drop_tol=1e-4, fill_factor=10,
+                         permc_spec='NATURAL', diag_pivot_thresh=0.0)
+        # CG y MINRES requieren un precondicionador simétrico
+        def aplicar(r):
+            return 0.5 * (ilu.solve(r) + ilu.solve(r, 'T'))
+    elif tipo == 'multigrid':
+        niveles = niveles_multigrid(nx, dx, dy)
+        def aplicar(r):
+            P = np.zeros((nx + 2, ny + 2))
+            _ciclo_multigrid(niveles, 0, P, -r.reshape(nx, ny), True, 'V', 2, 2,
+                             'jacobi', 0.8)
+            return P[1:-1, 1:-1].ravel()
+    else:
+        raise ValueError(f"Precondicionador desconocido: {tipo}")
+    
+    # Proyectar fuera del núcleo (constantes) para mantener la consistencia
+    def matvec(r):
+        z = aplicar(r - r.mean())
+        return z - z.mean()
+    
+    return spla.LinearOperator((n, n), matvec=matvec, rmatvec=matvec, dtype=float)
+
+def poisson_krylov(F, dx, dy, metodo='cg', precondicionador=None, tol=1e-10,
+                   max_iter=None, matriz_libre=False):
+    """
+    Resuelve ∇²φ = f periódico con gradiente conjugado o MINRES
+    
+    Se resuelve el sistema semidefinido positivo -∇²φ = -f proyectando el lado
+    derecho y cada iteración fuera del núcleo (las constantes).
+    
+    Parámetros:
+    metodo: 'cg' o 'minres'
+    precondicionador: None, 'jacobi', 'ilu' o 'multigrid'
+    tol: tolerancia relativa del residual
+    max_iter: máximo número de iteraciones
+    matriz_libre: usar laplaciano_operador en lugar de la matriz CSR
+    
+    Retorna phi y el número de iteraciones.
+    """
+    nx, ny = F.shape
+    if matriz_libre:
+        L = laplaciano_operador(nx, ny, dx, dy)
+    else:
+        L = laplaciano_disperso(nx, ny, dx, dy)
+    
+    def matvec(v):
+        w = -(L @ (v - v.mean()))
+        return w - w.mean()
+    
+    A = spla.LinearOperator((nx*ny, nx*ny), matvec=matvec, rmatvec=matvec, dtype=float)
+    b = -(F - F.mean()).ravel()
+    M = None if precondicionador is None else precondicionador_poisson(
+        nx, ny, dx, dy, precondicionador)
+    
+    iteraciones = [0]
+    def contar(xk):
+        iteraciones[0] += 1
+    
+    if metodo == 'cg':
+        phi, info = spla.cg(A, b, rtol=tol, maxiter=max_iter, M=M, callback=contar)
+    elif metodo == 'minres':
+        phi, info = spla.minres(A, b, rtol=tol, maxiter=max_iter, M=M, callback=contar)
+    else:
+        raise ValueError(f"Método desconocido: {metodo}")
+    
+    if info > 0:
+        print(f"Advertencia: {metodo} no convergió en {info} iteraciones")
+    
+    phi = phi.reshape(nx, ny)
+    return phi - phi.mean(), iteraciones[0]
+
+def resolver_poisson_disperso(N=100, metodo='cg', precondicionador='multigrid',
+                              tol=1e-10):
+    """
+    Resuelve la ecuación de Poisson con condiciones periódicas con matrices dispersas
+    
+    Parámetros:
+    N: número de puntos en cada dirección
+    metodo: 'splu' (factorización directa en caché), 'cg' o 'minres'
+    precondicionador: None, 'jacobi', 'ilu' o 'multigrid' (sólo para 'cg'/'minres')
+    tol: tolerancia relativa del residual
+    """
+    X, Y, dx, dy = crear_malla(N)
+    F = fuente(X, Y)
+    
+    print(f"Resolviendo ecuación de Poisson con matrices dispersas ({metodo})...")
+    print(f"Grid: {N}x{N}")
+    
+    if metodo == 'splu':
+        phi = poisson_splu(F, dx, dy)
+    else:
+        phi, iteraciones = poisson_krylov(F, dx, dy, metodo, precondicionador, tol)
+        print(f"Iteraciones: {iteraciones} (precondicionador: {precondicionador})")
+    
+    return X, Y, phi, F
+
+def reporte_multigrid(tamanos=(32, 64, 128, 256), tol=1e-10, max_iter=10000,
+                      comparar_gauss_seidel=True, **opciones):
+    """
+    Compara la historia del residual de multigrid con la de Gauss-Seidel
+    
+    Para cada tamaño de malla imprime el número de ciclos de multigrid, su
+    factor de reducción promedio por ciclo y, opcionalmente, el residual que
+    alcanza Gauss-Seidel (rojo-negro, ω = 1) tras max_iter barridos.
+    
+    Retorna un diccionario {N: {'multigrid': historial, 'gauss_seidel': historial}}
+    """
+    print("\n=== REPORTE: MULTIGRID VS GAUSS-SEIDEL ===")
+    print(f"{'N':>6} {'ciclos':>7} {'factor/ciclo':>13} {'GS barridos':>12} {'GS residual':>12}")
+    
+    resultados = {}
+    for N in tamanos:
+        X, Y, dx, dy = crear_malla(N)
+        F = fuente(X, Y)
+        _, hist_mg = multigrid_poisson(F, dx, dy, tol=tol, **opciones)
+        ciclos = len(hist_mg) - 1
+        factor = (hist_mg[-1] / hist_mg[0])**(1 / max(ciclos, 1))
+        resultados[N] = {'multigrid': hist_mg}
+        
+        linea = f"{N:>6} {ciclos:>7} {factor:>13.3f}"
+        if comparar_gauss_seidel:
+            P = np.zeros((N + 2, N + 2))
+            F0 = F - F.mean()
+            norma_f = np.linalg.norm(F0)
+            hist_gs = [1.0]
+            for iteracion in range(1, max_iter + 1):
+                _barrido_rojo_negro(P, F0, dx, dy)
+                if iteracion % 100 == 0 or iteracion == max_iter:
+                    hist_gs.append(np.linalg.norm(_residuo(P, F0, dx, dy)) / norma_f)
+                    if hist_gs[-1] < tol:
+                        break
+            resultados[N]['gauss_seidel'] = hist_gs
+            linea += f" {iteracion:>12} {hist_gs[-1]:>12.2e}"
+        print(linea)
+    
+    return resultados
+
 def visualizar_solucion(X, Y, phi, F):
     """
     Visualiza la solución de la ecuación de Poisson
@@ -121,25 +915,11 @@ def verificar_solucion(X, Y, phi, F, dx):
     """
     Verifica que la solución satisfaga la ecuación de Poisson
     """
-    N = phi.shape[0]
-    
-    # Calcular Laplaciano numérico de la solución
-    laplaciano = np.zeros_like(phi)
-    
-    for i in range(N):
-        for j in range(N):
-            ip1 = (i + 1) % N
-            im1 = (i - 1) % N
-            jp1 = (j + 1) % N
-            jm1 = (j - 1) % N
-            
-            d2phidx2 = (phi[ip1, j] - 2*phi[i, j] + phi[im1, j]) / dx**2
-            d2phidy2 = (phi[i, jp1] - 2*phi[i, j] + phi[i, jm1]) / dx**2
-            
-            laplaciano[i, j] = d2phidx2 + d2phidy2
+    # Calcular Laplaciano numérico de la solución (estencil periódico de 5 puntos)
+    residual = laplaciano(phi, dx, frontera='periodica')
     
     # Calcular residual
-    residual = laplaciano - F
+    residual -= F
     error_max = np.max(np.abs(residual))
     error_rms = np.sqrt(np.mean(residual**2))
     
@@ -151,13 +931,41 @@ def verificar_solucion(X, Y, phi, F, dx):
 
 # Resolver la ecuación de Poisson
 print("=== ECUACIÓN DE POISSON CON CONDICIONES PERIÓDICAS ===")
-X, Y, phi, F = resolver_poisson_gauss_seidel(N=100, tol=1e-8)
+X, Y, phi, F = resolver_poisson_gauss_seidel(N=100, tol=1e-8, metodo='rojo_negro')
 
 # Visualizar resultados
 visualizar_solucion(X, Y, phi, F)
 
 # Verificar la solución
-residual = verificar_solucion(X, Y, phi, F, dx=2*np.pi/100)
+dx = X[1, 0] - X[0, 0]
+residual = verificar_solucion(X, Y, phi, F, dx=dx)
+
+# Solución directa con FFT (símbolo discreto: mismo sistema que Gauss-Seidel)
+print("\n=== SOLUCIÓN ESPECTRAL ===")
+_, _, phi_fft, _ = resolver_poisson_espectral(N=100, simbolo='discreto')
+verificar_solucion(X, Y, phi_fft, F, dx=dx)
+print(f"Diferencia máxima SOR vs FFT: {np.max(np.abs(phi - phi_fft)):.2e}")
+
+# Multigrid: número de ciclos independiente del tamaño de la malla
+print("\n=== SOLUCIÓN CON MULTIGRID ===")
+_, _, phi_mg, _ = resolver_poisson_multigrid(N=100, ciclo='V', fmg=True)
+print(f"Diferencia máxima multigrid vs FFT: {np.max(np.abs(phi_mg - phi_fft)):.2e}")
+reporte_multigrid(tamanos=(32, 64, 128, 256), max_iter=10000)
+
+# Matrices dispersas: CG precondicionado con multigrid y factorización LU en caché
+print("\n=== SOLUCIÓN CON MATRICES DISPERSAS ===")
+_, _, phi_cg, _ = resolver_poisson_disperso(N=100, metodo='cg', precondicionador='multigrid')
+print(f"Diferencia máxima CG vs FFT: {np.max(np.abs(phi_cg - phi_fft)):.2e}")
+_, _, phi_lu, _ = resolver_poisson_disperso(N=100, metodo='splu')
+print(f"Diferencia máxima LU vs FFT: {np.max(np.abs(phi_lu - phi_fft)):.2e}")
+
+# Barrido de parámetros: muchas fuentes sobre la misma malla, resueltas por lotes
+print("\n=== BARRIDO DE FUENTES POR LOTES ===")
+parametros = [(a, b, a + 2, b - 2) for a in range(1, 11) for b in range(3, 23)]
+phis = resolver_poisson_lote(fuentes_parametricas(X, Y, parametros), dx, dx)
+print(f"Fuentes resueltas: {phis.shape[0]}, malla: {phis.shape[1]}x{phis.shape[2]}")
+phi_lote = resolver_poisson_lote(fuente(X, Y)[np.newaxis], dx, dx, metodo='splu')[0]
+print(f"Diferencia máxima lote (LU) vs FFT: {np.max(np.abs(phi_lote - phi_fft)):.2e}")
 
 # Gráfica adicional del residual
 plt.figure(figsize=(10, 4))
@@ -14,9 +14,19 @@ Created on Mon Oct 20 20:48:22 2025
 @author: isaias-gl
 """
 
+import os
+import sys
+import tempfile
+
 import numpy as np
 import matplotlib.pyplot as plt
 from mpl_toolkits.mplot3d import Axes3D
+from scipy.linalg import lapack
+
+# Operadores diferenciales compartidos (Tareas/operadores.py)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from operadores import laplaciano
+from almacenamiento import EscritorSerie, LectorSerie
 
 def solucion_analitica(x, t, L=1.0, T0=100.0, alpha=8.418e-5, n_terms=50):
     """
@@ -28,6 +38,50 @@ def solucion_analitica(x, t, L=1.0, T0=100.0, alpha=8.418e-5, n_terms=50):
         T_analitica += Bn * np.sin(n * np.pi * x / L) * np.exp(-alpha * (n * np.pi / L)**2 * t)
     return T_analitica
 
+def solucion_analitica_campo(x, t, L=1.0, T0=100.0, alpha=8.418e-5, n_terms=50,
+                             tol=None, tamano_bloque=256):
+    """
+    Solución analítica de la ecuación de calor 1D en toda la malla (x, t)
+    
+    Evalúa T[i, j] = sum_n Bn sin(nπx_i/L) exp(-alpha (nπ/L)² t_j) como un
+    producto matricial modo-punto por modo-tiempo. Sólo se usan los modos
+    impares (Bn = 0 para n par) y la tabla de senos se calcula una vez.
+    
+    Parámetros:
+    x, t: arreglos de posiciones y tiempos
+    L, T0, alpha: longitud, temperatura inicial y difusividad
+    n_terms: máximo n de la serie (como en solucion_analitica)
+    tol: si se da, en cada bloque de tiempos se descartan los modos con
+         |Bn| exp(-alpha (nπ/L)² t) < tol
+    tamano_bloque: número de tiempos evaluados a la vez
+    
+    Retorna un arreglo de forma (len(x), len(t))
+    """
+    x = np.asarray(x, dtype=float)
+    t = np.asarray(t, dtype=float)
+    
+    n = np.arange(1, n_terms + 1, 2)
+    Bn = 4 * T0 / (n * np.pi)
+    kn2 = (n * np.pi / L)**2
+    
+    # Tabla de senos (modo, punto) con la amplitud incluida
+    S = Bn[:, np.newaxis] * np.sin(np.outer(n * np.pi / L, x))
+    
+    T_an = np.empty((x.size, t.size))
+    for inicio in range(0, t.size, tamano_bloque):
+        tb = t[inicio:inicio + tamano_bloque]
+        
+        # Los modos decaen más rápido cuanto mayor es n: basta con revisar el
+        # tiempo más pequeño del bloque
+        m = n.size
+        if tol is not None and tb.size > 0:
+            m = max(int(np.sum(Bn * np.exp(-alpha * kn2 * tb.min()) >= tol)), 1)
+        
+        E = np.exp(-alpha * np.outer(kn2[:m], tb))
+        T_an[:, inicio:inicio + tamano_bloque] = S[:m].T @ E
+    
+    return T_an
+
 def resolver_calor_numerico(dx=0.02, dt=0.4, total_time=500.0):
     """
     Solución numérica por diferencias finitas
@@ -49,107 +103,357 @@ def resolver_calor_numerico(dx=0.02, dt=0.4, total_time=500.0):
     T_num[0, :] = 0.0
     T_num[-1, :] = 0.0
     
+    # Paso explícito: T^{j+1} = T^j + alpha*dt*∇²T^j (los extremos quedan fijos)
+    lap = np.empty(Nx)
     for j in range(0, Nt-1):
-        for i in range(1, Nx-1):
-            T_num[i, j+1] = T_num[i, j] + r * (T_num[i+1, j] - 2*T_num[i, j] + T_num[i-1, j])
+        laplaciano(T_num[:, j], dx, frontera='dirichlet', out=lap)
+        lap *= alpha * dt
+        np.add(T_num[:, j], lap, out=T_num[:, j+1])
     
     return x, t, T_num, r
 
-# Parámetros de simulación
-dx, dt = 0.02, 0.4
-total_time = 300.0
-x, t, T_num, r = resolver_calor_numerico(dx, dt, total_time)
-
-# Crear mallas para solución analítica
-X, T_mesh = np.meshgrid(x, t, indexing='ij')
-
-# Calcular solución analítica
-T_an = np.zeros_like(T_num)
-for j in range(len(t)):
-    T_an[:, j] = solucion_analitica(x, t[j])
-
-# Calcular error
-error = np.abs(T_num - T_an)
-
-# Crear visualizaciones
-fig = plt.figure(figsize=(20, 10))
-
-# Gráfica 1: Solución numérica 3D (ESTABLE)
-ax1 = fig.add_subplot(2, 3, 1, projection='3d')
-surf1 = ax1.plot_surface(X, T_mesh, T_num, cmap='hot', alpha=0.8)
-ax1.contour(X, T_mesh, T_num, levels=10, offset=0, colors='black', linewidths=0.5)
-ax1.set_xlabel('Posición (m)')
-ax1.set_ylabel('Tiempo (s)')
-ax1.set_zlabel('Temperatura (°C)')
-ax1.set_title('SOLUCIÓN NUMÉRICA (ESTABLE)\nr = 0.42 < 0.5')
-ax1.view_init(30, -45)
-
-# Gráfica 2: Solución analítica 3D
-ax2 = fig.add_subplot(2, 3, 2, projection='3d')
-surf2 = ax2.plot_surface(X, T_mesh, T_an, cmap='hot', alpha=0.8)
-ax2.contour(X, T_mesh, T_an, levels=10, offset=0, colors='black', linewidths=0.5)
-ax2.set_xlabel('Posición (m)')
-ax2.set_ylabel('Tiempo (s)')
-ax2.set_zlabel('Temperatura (°C)')
-ax2.set_title('SOLUCIÓN ANALÍTICA 3D')
-ax2.view_init(30, -45)
-
-# Gráfica 3: Error y comparación 2D
-ax3 = fig.add_subplot(2, 3, 3)
-
-# Perfiles en tiempos específicos
-times_to_plot = [0, 50, 100, 200]
-colors = ['red', 'blue', 'green', 'orange']
-
-for i, time_idx in enumerate(times_to_plot):
-    if time_idx < len(t):
-        ax3.plot(x, T_num[:, time_idx], color=colors[i], 
-                linestyle='-', linewidth=2, label=f'Num t={t[time_idx]:.0f}s')
-        ax3.plot(x, T_an[:, time_idx], color=colors[i], 
-                linestyle='--', linewidth=1.5, alpha=0.7, label=f'An t={t[time_idx]:.0f}s')
-
-ax3.set_xlabel('Posición (m)')
-ax3.set_ylabel('Temperatura (°C)')
-ax3.set_title('Comparación Numérica vs Analítica')
-ax3.legend()
-ax3.grid(True)
-
-# NUEVAS GRÁFICAS: Solución estable e inestable en 2D
-
-# Gráfica 4: Solución estable en diferentes tiempos
-ax4 = fig.add_subplot(2, 3, 4)
-
-for i, time_idx in enumerate(times_to_plot):
-    if time_idx < len(t):
-        ax4.plot(x, T_num[:, time_idx], color=colors[i], 
-                linewidth=2, label=f't = {t[time_idx]:.0f}s')
-
-ax4.set_xlabel('Posición (m)')
-ax4.set_ylabel('Temperatura (°C)')
-ax4.set_title('SOLUCIÓN ESTABLE\nEvolución Temporal')
-ax4.legend()
-ax4.grid(True)
-
-# Gráfica 5: Solución inestable
-ax5 = fig.add_subplot(2, 3, 5)
-
-# Calcular solución inestable
-dx_inestable, dt_inestable = 0.02, 4.0
-x_inest, t_inest, T_inest, r_inest = resolver_calor_numerico(dx_inestable, dt_inestable, total_time)
-
-# Seleccionar tiempos para graficar (menos puntos para evitar sobrecarga)
-time_indices_inest = [0, min(10, len(t_inest)-1), min(20, len(t_inest)-1), min(30, len(t_inest)-1)]
-
-for i, time_idx in enumerate(time_indices_inest):
-    ax5.plot(x_inest, T_inest[:, time_idx], color=colors[i], 
-             linewidth=2, label=f't = {t_inest[time_idx]:.0f}s')
-
-ax5.set_xlabel('Posición (m)')
-ax5.set_ylabel('Temperatura (°C)')
-ax5.set_title(f'SOLUCIÓN INESTABLE\nr = {r_inest:.3f} > 0.5')
-ax5.legend()
-ax5.grid(True)
-
-
-plt.tight_layout()
-plt.show()
+def pasos_de_salida(Nt, dt, cada=1, tiempos_salida=None):
+    """
+    Índices de los pasos de tiempo en los que se guarda una instantánea
+    
+    Parámetros:
+    Nt: número total de niveles de tiempo (incluido t = 0)
+    dt: paso de tiempo
+    cada: guardar uno de cada 'cada' pasos (el último siempre se guarda)
+    tiempos_salida: tiempos pedidos; si se dan, se usan los pasos más cercanos
+                    en lugar de 'cada'
+    """
+    if tiempos_salida is not None:
+        pasos = np.rint(np.asarray(tiempos_salida, dtype=float) / dt).astype(int)
+        return np.unique(np.clip(pasos, 0, Nt - 1))
+    
+    pasos = np.arange(0, Nt, cada)
+    if pasos[-1] != Nt - 1:
+        pasos = np.append(pasos, Nt - 1)
+    return pasos
+
+def _avanzar_en_tiempo(T, paso, Nt, dt, cada=1, tiempos_salida=None,
+                       tol_estacionario=None, salida=None):
+    """
+    Avanza el perfil T con dos niveles de tiempo y guarda instantáneas
+    
+    paso(T, T_nuevo) debe escribir en T_nuevo el siguiente nivel de tiempo. Los
+    demás parámetros son los de resolver_calor_explicito.
+    
+    Retorna los tiempos de las instantáneas y un arreglo de forma T.shape + (n,);
+    si se da salida (por ejemplo almacenamiento.EscritorSerie), las instantáneas
+    se envían a salida.agregar(t, T) y en su lugar se retorna None
+    """
+    pasos = pasos_de_salida(Nt, dt, cada, tiempos_salida)
+    t_snap = np.empty(len(pasos) + 1)
+    T_snap = None if salida is not None else np.empty(T.shape + (len(pasos) + 1,))
+    
+    def guardar(k, t, T):
+        t_snap[k] = t
+        if salida is not None:
+            salida.agregar(t, T)
+        else:
+            T_snap[..., k] = T
+    
+    T = T.copy()
+    T_nuevo = T.copy()
+    
+    k = 0
+    if pasos[0] == 0:
+        guardar(0, 0.0, T)
+        k = 1
+    
+    for n in range(1, Nt):
+        paso(T, T_nuevo)
+        T, T_nuevo = T_nuevo, T
+        
+        guardado = k < len(pasos) and pasos[k] == n
+        if guardado:
+            guardar(k, n * dt, T)
+            k += 1
+        
+        if (tol_estacionario is not None and
+                np.max(np.abs(T - T_nuevo)) < tol_estacionario * dt):
+            print(f"Estado estacionario alcanzado en t = {n*dt:.1f} s")
+            if not guardado:
+                guardar(k, n * dt, T)
+                k += 1
+            break
+    
+    if salida is not None:
+        return t_snap[:k], None
+    return t_snap[:k], T_snap[..., :k]
+
+def resolver_calor_explicito(dx=0.02, dt=0.4, total_time=500.0, cada=1,
+                             tiempos_salida=None, tol_estacionario=None,
+                             L=1.0, T0=100.0, alpha=8.418e-5, salida=None):
+    """
+    Solución numérica explícita (FTCS) con dos niveles de tiempo en memoria
+    
+    En lugar de guardar la historia completa (Nx, Nt) se alternan dos perfiles
+    y sólo se copian las instantáneas pedidas.
+    
+    Parámetros:
+    dx, dt, total_time: discretización, como en resolver_calor_numerico
+    cada: guardar una instantánea cada 'cada' pasos
+    tiempos_salida: tiempos en los que guardar instantáneas (reemplaza a 'cada')
+    tol_estacionario: si se da, se detiene cuando max|∂T/∂t| < tol_estacionario
+                      (°C/s) y se guarda el último perfil
+    L, T0, alpha: longitud, temperatura inicial y difusividad
+    salida: destino de las instantáneas en disco (almacenamiento.EscritorSerie);
+            si se da, se retorna None en lugar de las instantáneas
+    
+    Retorna x, los tiempos de las instantáneas, las instantáneas (Nx, n) y r
+    """
+    Nx = int(L / dx) + 1
+    Nt = int(total_time / dt) + 1
+    x = np.linspace(0, L, Nx)
+    
+    r = alpha * dt / (dx**2)
+    
+    # Condición inicial; los extremos quedan fijos en cero
+    T = np.zeros(Nx)
+    T[1:-1] = T0
+    lap = np.empty(Nx)
+    
+    def paso(T, T_nuevo):
+        laplaciano(T, dx, frontera='dirichlet', out=lap)
+        np.multiply(lap, alpha * dt, out=lap)
+        np.add(T, lap, out=T_nuevo)
+    
+    t_snap, T_snap = _avanzar_en_tiempo(T, paso, Nt, dt, cada, tiempos_salida,
+                                        tol_estacionario, salida)
+    
+    return x, t_snap, T_snap, r
+
+def factorizar_tridiagonal(inferior, diagonal, superior):
+    """
+    Factoriza una vez (LAPACK gttrf) una matriz tridiagonal para reutilizarla
+    
+    Parámetros:
+    inferior, diagonal, superior: diagonales de la matriz (n-1, n y n-1 valores)
+    """
+    dl, d, du, du2, ipiv, info = lapack.dgttrf(inferior, diagonal, superior)
+    if info != 0:
+        raise np.linalg.LinAlgError("Matriz tridiagonal singular")
+    return dl, d, du, du2, ipiv
+
+def resolver_tridiagonal(factores, b):
+    """
+    Resuelve A x = b con la factorización de factorizar_tridiagonal (LAPACK gttrs)
+    
+    b puede ser un vector (n,) o varios lados derechos en columnas (n, k).
+    """
+    x, info = lapack.dgttrs(*factores, b)
+    return x
+
+def resolver_calor_implicito(dx=0.02, dt=4.0, total_time=500.0,
+                             metodo='crank_nicolson', pasos_euler=2, cada=1,
+                             tiempos_salida=None, tol_estacionario=None,
+                             L=1.0, T0=100.0, alpha=8.418e-5, salida=None):
+    """
+    Solución implícita (Crank-Nicolson o Euler hacia atrás), estable para todo r
+    
+    Cada paso resuelve (I - θ r D) T^{n+1} = (I + (1-θ) r D) T^n, donde D es
+    la segunda diferencia en los puntos interiores; la matriz tridiagonal se
+    factoriza una sola vez y se reutiliza en todos los pasos.
+    
+    Parámetros:
+    dx, dt, total_time: discretización (dt puede dar r = alpha*dt/dx² > 0.5)
+    metodo: 'crank_nicolson' (θ = 1/2) o 'euler_implicito' (θ = 1)
+    pasos_euler: pasos iniciales de Euler hacia atrás en Crank-Nicolson, que
+                 amortiguan las oscilaciones producidas por la condición inicial
+                 discontinua (arranque de Rannacher)
+    cada, tiempos_salida, tol_estacionario, L, T0, alpha, salida: ver
+        resolver_calor_explicito
+    
+    Retorna x, t, T, r como resolver_calor_numerico (con cada=1 T es la
+    historia completa)
+    """
+    if metodo == 'crank_nicolson':
+        theta = 0.5
+    elif metodo == 'euler_implicito':
+        theta = 1.0
+        pasos_euler = 0
+    else:
+        raise ValueError(f"Método desconocido: {metodo}")
+    
+    Nx = int(L / dx) + 1
+    Nt = int(total_time / dt) + 1
+    x = np.linspace(0, L, Nx)
+    
+    r = alpha * dt / (dx**2)
+    m = Nx - 2
+    
+    def factorizar(theta):
+        return factorizar_tridiagonal(-theta*r*np.ones(m - 1),
+                                      (1 + 2*theta*r)*np.ones(m),
+                                      -theta*r*np.ones(m - 1))
+    
+    factores = factorizar(theta)
+    factores_euler = factorizar(1.0) if pasos_euler > 0 else None
+    
+    T = np.zeros(Nx)
+    T[1:-1] = T0
+    lap = np.empty(Nx)
+    contador = [0]
+    
+    def paso(T, T_nuevo):
+        th, fac = theta, factores
+        if contador[0] < pasos_euler:
+            th, fac = 1.0, factores_euler
+        contador[0] += 1
+        
+        # Lado derecho: parte explícita más los valores de frontera (fijos)
+        laplaciano(T, dx, frontera='dirichlet', out=lap)
+        rhs = T[1:-1] + (1 - th) * alpha * dt * lap[1:-1]
+        rhs[0] += th * r * T[0]
+        rhs[-1] += th * r * T[-1]
+        
+        T_nuevo[1:-1] = resolver_tridiagonal(fac, rhs)
+        T_nuevo[0], T_nuevo[-1] = T[0], T[-1]
+    
+    t_snap, T_snap = _avanzar_en_tiempo(T, paso, Nt, dt, cada, tiempos_salida,
+                                        tol_estacionario, salida)
+    
+    return x, t_snap, T_snap, r
+
+if __name__ == "__main__":
+    # Parámetros de simulación
+    dx, dt = 0.02, 0.4
+    total_time = 300.0
+    x, t, T_num, r = resolver_calor_numerico(dx, dt, total_time)
+
+    # Crear mallas para solución analítica
+    X, T_mesh = np.meshgrid(x, t, indexing='ij')
+
+    # Calcular solución analítica (toda la malla (x, t) de una vez)
+    T_an = solucion_analitica_campo(x, t)
+
+    # Calcular error
+    error = np.abs(T_num - T_an)
+
+    # Versión con dos niveles de tiempo: sólo se guardan las instantáneas necesarias
+    x_snap, t_snap, T_snap, _ = resolver_calor_explicito(dx, dt, total_time,
+                                                         tiempos_salida=[0, 20, 40, 80])
+    print(f"Instantáneas guardadas: {T_snap.shape[1]} de {len(t)} pasos")
+    print(f"Diferencia máxima con la historia completa: "
+          f"{np.max(np.abs(T_snap - T_num[:, np.rint(t_snap/dt).astype(int)])):.2e}")
+
+    # Esquemas implícitos: en una malla fina el explícito necesita r <= 0.5, los
+    # implícitos admiten pasos mucho mayores
+    print("\n=== ESQUEMAS IMPLÍCITOS (dx = 0.005 m, t = 300 s) ===")
+    T_ref = solucion_analitica_campo(np.linspace(0, 1.0, 201), [total_time], n_terms=2001,
+                                     tol=1e-12)[:, 0]
+    casos = [('explicito', 0.1), ('crank_nicolson', 1.0), ('crank_nicolson', 10.0),
+             ('euler_implicito', 1.0)]
+    for metodo, dt_caso in casos:
+        if metodo == 'explicito':
+            _, _, T_caso, r_caso = resolver_calor_explicito(0.005, dt_caso, total_time,
+                                                             tiempos_salida=[total_time])
+        else:
+            _, _, T_caso, r_caso = resolver_calor_implicito(0.005, dt_caso, total_time,
+                                                             metodo=metodo,
+                                                             tiempos_salida=[total_time])
+        print(f"{metodo:15s} dt = {dt_caso:5.1f} s, r = {r_caso:7.3f}: error máximo = "
+              f"{np.max(np.abs(T_caso[:, -1] - T_ref)):.2e}")
+
+    # Historia larga en disco: bloques comprimidos en float32, sólo un bloque en
+    # memoria durante la simulación; la lectura posterior es por ventanas
+    print("\n=== HISTORIA EN DISCO (dx = 0.005 m, t = 300 s, todos los pasos) ===")
+    with tempfile.TemporaryDirectory() as ruta:
+        with EscritorSerie(ruta, (201,), formato='npz', compresion=True,
+                           float32=True, tamano_bloque=512) as salida:
+            resolver_calor_explicito(0.005, 0.1, total_time, salida=salida)
+        tamano = sum(os.path.getsize(os.path.join(ruta, f)) for f in os.listdir(ruta))
+        with LectorSerie(ruta) as serie:
+            t_ventana, T_ventana = serie.ventana(100.0, 200.0, cada=100)
+        print(f"{len(serie)} instantáneas, {tamano/1e6:.2f} MB en disco "
+              f"({len(serie)*201*8/1e6:.2f} MB en float64 sin comprimir)")
+        error_ventana = np.max(np.abs(T_ventana - solucion_analitica_campo(
+            np.linspace(0, 1.0, 201), t_ventana, n_terms=2001, tol=1e-12)))
+        print(f"Ventana 100-200 s: {len(t_ventana)} perfiles, "
+              f"error máximo = {error_ventana:.2e}")
+
+    # Crear visualizaciones
+    fig = plt.figure(figsize=(20, 10))
+
+    # Gráfica 1: Solución numérica 3D (ESTABLE)
+    ax1 = fig.add_subplot(2, 3, 1, projection='3d')
+    surf1 = ax1.plot_surface(X, T_mesh, T_num, cmap='hot', alpha=0.8)
+    ax1.contour(X, T_mesh, T_num, levels=10, offset=0, colors='black', linewidths=0.5)
+    ax1.set_xlabel('Posición (m)')
+    ax1.set_ylabel('Tiempo (s)')
+    ax1.set_zlabel('Temperatura (°C)')
+    ax1.set_title('SOLUCIÓN NUMÉRICA (ESTABLE)\nr = 0.42 < 0.5')
+    ax1.view_init(30, -45)
+
+    # Gráfica 2: Solución analítica 3D
+    ax2 = fig.add_subplot(2, 3, 2, projection='3d')
+    surf2 = ax2.plot_surface(X, T_mesh, T_an, cmap='hot', alpha=0.8)
+    ax2.contour(X, T_mesh, T_an, levels=10, offset=0, colors='black', linewidths=0.5)
+    ax2.set_xlabel('Posición (m)')
+    ax2.set_ylabel('Tiempo (s)')
+    ax2.set_zlabel('Temperatura (°C)')
+    ax2.set_title('SOLUCIÓN ANALÍTICA 3D')
+    ax2.view_init(30, -45)
+
+    # Gráfica 3: Error y comparación 2D
+    ax3 = fig.add_subplot(2, 3, 3)
+
+    # Perfiles en tiempos específicos
+    times_to_plot = [0, 50, 100, 200]
+    colors = ['red', 'blue', 'green', 'orange']
+
+    for i, time_idx in enumerate(times_to_plot):
+        if time_idx < len(t):
+            ax3.plot(x, T_num[:, time_idx], color=colors[i], 
+                    linestyle='-', linewidth=2, label=f'Num t={t[time_idx]:.0f}s')
+            ax3.plot(x, T_an[:, time_idx], color=colors[i], 
+                    linestyle='--', linewidth=1.5, alpha=0.7, label=f'An t={t[time_idx]:.0f}s')
+
+    ax3.set_xlabel('Posición (m)')
+    ax3.set_ylabel('Temperatura (°C)')
+    ax3.set_title('Comparación Numérica vs Analítica')
+    ax3.legend()
+    ax3.grid(True)
+
+    # NUEVAS GRÁFICAS: Solución estable e inestable en 2D
+
+    # Gráfica 4: Solución estable en diferentes tiempos
+    ax4 = fig.add_subplot(2, 3, 4)
+
+    for i, time_idx in enumerate(times_to_plot):
+        if time_idx < len(t):
+            ax4.plot(x, T_num[:, time_idx], color=colors[i], 
+                    linewidth=2, label=f't = {t[time_idx]:.0f}s')
+
+    ax4.set_xlabel('Posición (m)')
+    ax4.set_ylabel('Temperatura (°C)')
+    ax4.set_title('SOLUCIÓN ESTABLE\nEvolución Temporal')
+    ax4.legend()
+    ax4.grid(True)
+
+    # Gráfica 5: Solución inestable
+    ax5 = fig.add_subplot(2, 3, 5)
+
+    # Calcular solución inestable
+    dx_inestable, dt_inestable = 0.02, 4.0
+    x_inest, t_inest, T_inest, r_inest = resolver_calor_numerico(dx_inestable, dt_inestable, total_time)
+
+    # Seleccionar tiempos para graficar (menos puntos para evitar sobrecarga)
+    time_indices_inest = [0, min(10, len(t_inest)-1), min(20, len(t_inest)-1), min(30, len(t_inest)-1)]
+
+    for i, time_idx in enumerate(time_indices_inest):
+        ax5.plot(x_inest, T_inest[:, time_idx], color=colors[i], 
+                 linewidth=2, label=f't = {t_inest[time_idx]:.0f}s')
+
+    ax5.set_xlabel('Posición (m)')
+    ax5.set_ylabel('Temperatura (°C)')
+    ax5.set_title(f'SOLUCIÓN INESTABLE\nr = {r_inest:.3f} > 0.5')
+    ax5.legend()
+    ax5.grid(True)
+
+
+    plt.tight_layout()
+    plt.show()
@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Ecuación de calor en placas (2D) y bloques (3D) con direcciones alternadas (ADI)
+
+Cada paso se reduce a lotes de sistemas tridiagonales independientes a lo
+largo de cada eje, resueltos con las factorizaciones de calor.py.
+
+@author: isaias-gl
+"""
+
+import os
+import sys
+
+import numpy as np
+import matplotlib.pyplot as plt
+
+from calor import (_avanzar_en_tiempo, factorizar_tridiagonal,
+                   resolver_tridiagonal)
+
+# Operadores diferenciales compartidos (Tareas/operadores.py)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from operadores import derivada, laplaciano
+
+
+def _factorizar_eje(n, c, frontera):
+    """
+    Factoriza I - c*D, con D la segunda diferencia sin escalar [1, -2, 1] de n puntos
+
+    En Dirichlet las filas de los extremos son de identidad (valores fijos); en
+    Neumann se usa la reflexión u[-1] = u[1], como en operadores.laplaciano.
+    """
+    inferior = -c * np.ones(n - 1)
+    diagonal = (1 + 2*c) * np.ones(n)
+    superior = -c * np.ones(n - 1)
+
+    if frontera == 'dirichlet':
+        diagonal[0] = diagonal[-1] = 1.0
+        superior[0] = inferior[-1] = 0.0
+    elif frontera == 'neumann':
+        superior[0] = inferior[-1] = -2*c
+    else:
+        raise ValueError(f"Frontera no soportada por ADI: {frontera}")
+
+    return factorizar_tridiagonal(inferior, diagonal, superior)
+
+
+def _resolver_eje(factores, w, eje):
+    """
+    Resuelve en sitio el sistema tridiagonal a lo largo de eje para todas las líneas de w
+    """
+    w_eje = np.moveaxis(w, eje, 0)
+    sol = resolver_tridiagonal(factores, w_eje.reshape(w_eje.shape[0], -1))
+    w_eje[...] = sol.reshape(w_eje.shape)
+
+
+def _anular_dirichlet(w, fronteras):
+    """
+    Anula w en las caras con condición de Dirichlet (valores fijos)
+    """
+    for eje, frontera in enumerate(fronteras):
+        if frontera == 'dirichlet':
+            np.moveaxis(w, eje, 0)[[0, -1]] = 0.0
+
+
+def solucion_separable(mallas, t, L, alpha=8.418e-5, fronteras='dirichlet'):
+    """
+    Solución analítica de un modo separable de la ecuación de calor
+
+    u = prod_k f_k(x_k) exp(-alpha π² sum_k 1/L_k² t), con f_k = sin(πx/L_k) en
+    ejes de Dirichlet y f_k = cos(πx/L_k) en ejes de Neumann.
+
+    Parámetros:
+    mallas: coordenadas 1D de cada eje
+    t: tiempo
+    L: longitud de cada eje
+    """
+    fronteras = (fronteras,) * len(mallas) if isinstance(fronteras, str) else fronteras
+    u = np.ones(tuple(len(x) for x in mallas))
+    decaimiento = 0.0
+    for eje, (x, Lk, frontera) in enumerate(zip(mallas, L, fronteras)):
+        f = np.sin(np.pi*x/Lk) if frontera == 'dirichlet' else np.cos(np.pi*x/Lk)
+        forma = [1] * len(mallas)
+        forma[eje] = len(x)
+        u = u * f.reshape(forma)
+        decaimiento += (np.pi / Lk)**2
+    return u * np.exp(-alpha * decaimiento * t)
+
+
+def resolver_calor_adi(N=(41, 41), L=(1.0, 1.0), dt=10.0, total_time=500.0,
+                       alpha=8.418e-5, u0=None, fronteras='dirichlet',
+                       metodo='douglas', cada=1, tiempos_salida=None,
+                       tol_estacionario=None, salida=None):
+    """
+    Resuelve u_t = alpha ∇²u en 2D o 3D con direcciones alternadas implícitas
+
+    Parámetros:
+    N: número de puntos por eje (2 o 3 valores)
+    L: longitud de cada eje
+    dt, total_time: paso y tiempo total (estable para cualquier dt)
+    alpha: difusividad
+    u0: condición inicial (arreglo de forma N o función de las mallas 1D
+        con indexing='ij'); None = modo separable de solucion_separable
+    fronteras: 'dirichlet' o 'neumann' (o una por eje); en Dirichlet se
+               conservan los valores de frontera de u0
+    metodo: 'douglas' (Douglas-Gunn, 2D y 3D) o 'peaceman_rachford' (sólo 2D)
+    cada, tiempos_salida, tol_estacionario, salida: instantáneas, parada y
+        escritura en disco, como en calor.resolver_calor_explicito
+
+    Retorna las mallas 1D, los tiempos de las instantáneas, las instantáneas
+    (forma N + (n,)) y r = alpha*dt/h² de cada eje
+    """
+    N = tuple(N)
+    L = tuple(L)
+    d = len(N)
+    if d not in (2, 3) or len(L) != d:
+        raise ValueError("N y L deben tener 2 o 3 valores")
+    if metodo == 'peaceman_rachford' and d != 2:
+        raise ValueError("Peaceman-Rachford sólo está definido en 2D")
+    if metodo not in ('douglas', 'peaceman_rachford'):
+        raise ValueError(f"Método desconocido: {metodo}")
+
+    fronteras = (fronteras,) * d if isinstance(fronteras, str) else tuple(fronteras)
+    mallas = [np.linspace(0, Lk, n) for n, Lk in zip(N, L)]
+    h = tuple(x[1] - x[0] for x in mallas)
+    r = tuple(alpha * dt / hk**2 for hk in h)
+    Nt = int(total_time / dt) + 1
+
+    if u0 is None:
+        u0 = solucion_separable(mallas, 0.0, L, alpha, fronteras)
+    elif callable(u0):
+        u0 = u0(*np.meshgrid(*mallas, indexing='ij'))
+    u0 = np.array(u0, dtype=float)
+
+    # Una factorización por eje: I - (alpha*dt/2) D_k
+    factores = [_factorizar_eje(n, rk / 2, frontera)
+                for n, rk, frontera in zip(N, r, fronteras)]
+
+    w = np.empty(N)
+    aux = np.empty(N)
+    trabajo = np.empty(N)
+
+    def paso_douglas(u, u_nuevo):
+        # Forma delta: w = alpha*dt*∇²u, luego (I - alpha*dt/2 D_k) w_k = w_{k-1}
+        laplaciano(u, h, frontera=fronteras, out=w)
+        np.multiply(w, alpha * dt, out=w)
+        for eje in range(d):
+            _resolver_eje(factores[eje], w, eje)
+        np.add(u, w, out=u_nuevo)
+
+    def media_derivada(u, eje, out):
+        # (alpha*dt/2) ∂²u/∂x_k², nula en las caras de Dirichlet
+        derivada(u, h[eje], eje, 2, 2, fronteras[eje], out=out, trabajo=trabajo)
+        out *= alpha * dt / 2
+        _anular_dirichlet(out, fronteras)
+
+    def paso_peaceman_rachford(u, u_nuevo):
+        # (I - a/2 D_x) u* = (I + a/2 D_y) u^n
+        media_derivada(u, 1, aux)
+        np.add(aux, u, out=aux)
+        _resolver_eje(factores[0], aux, 0)
+        # (I - a/2 D_y) u^{n+1} = (I + a/2 D_x) u*
+        media_derivada(aux, 0, u_nuevo)
+        u_nuevo += aux
+        _resolver_eje(factores[1], u_nuevo, 1)
+
+    paso = paso_douglas if metodo == 'douglas' else paso_peaceman_rachford
+    t_snap, u_snap = _avanzar_en_tiempo(u0, paso, Nt, dt, cada, tiempos_salida,
+                                        tol_estacionario, salida)
+
+    return mallas, t_snap, u_snap, r
+
+
+if __name__ == "__main__":
+    print("=== ECUACIÓN DE CALOR 2D/3D CON ADI ===")
+    alpha = 8.418e-5
+    total_time = 500.0
+
+    # Validación con el modo separable en placas y bloques
+    casos = [
+        ((41, 41), (1.0, 1.0), 'dirichlet', 'douglas'),
+        ((41, 41), (1.0, 1.0), 'dirichlet', 'peaceman_rachford'),
+        ((41, 61), (1.0, 1.5), ('dirichlet', 'neumann'), 'douglas'),
+        ((21, 21, 21), (1.0, 1.0, 1.0), 'dirichlet', 'douglas'),
+        ((21, 21, 21), (1.0, 1.0, 1.0), 'neumann', 'douglas'),
+    ]
+    for N, L, fronteras, metodo in casos:
+        mallas, t_snap, u_snap, r = resolver_calor_adi(
+            N, L, dt=10.0, total_time=total_time, alpha=alpha, fronteras=fronteras,
+            metodo=metodo, tiempos_salida=[total_time])
+        exacta = solucion_separable(mallas, t_snap[-1], L, alpha, fronteras)
+        error = np.max(np.abs(u_snap[..., -1] - exacta))
+        print(f"{len(N)}D {metodo:18s} {str(fronteras):25s} r = {max(r):6.2f}: "
+              f"error máximo = {error:.2e}")
+
+    # Placa caliente con bordes a 0 °C (análogo 2D de calor.py)
+    T0 = 100.0
+    placa = np.full((51, 51), T0)
+    placa[[0, -1], :] = 0.0
+    placa[:, [0, -1]] = 0.0
+    mallas, t_snap, T_snap, r = resolver_calor_adi(
+        (51, 51), (1.0, 1.0), dt=20.0, total_time=2000.0, alpha=alpha, u0=placa,
+        tiempos_salida=[0, 200, 800, 2000])
+
+    fig, axes = plt.subplots(1, len(t_snap), figsize=(16, 4))
+    for k, ax in enumerate(axes):
+        im = ax.imshow(T_snap[..., k].T, origin='lower', extent=(0, 1, 0, 1),
+                       cmap='hot', vmin=0, vmax=T0)
+        ax.set_title(f't = {t_snap[k]:.0f} s')
+        ax.set_xlabel('x (m)')
+        ax.set_ylabel('y (m)')
+    fig.colorbar(im, ax=axes, shrink=0.8, label='Temperatura (°C)')
+    plt.show()
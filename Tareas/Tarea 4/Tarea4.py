@@ -1,5 +1,14 @@
+import hashlib
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
 import numpy as np
+from scipy import ndimage
 from scipy.integrate import solve_ivp
+from scipy.optimize import brentq
 import matplotlib.pyplot as plt
 
 def martillo(t, state, g, rho, A, CD, m):
@@ -34,96 +43,604 @@ CD_casos = {
     'inestable': 0.75
 }
 
-def encontrar_velocidad_record(CD, v0_guess=30, tol=0.1):
-    """Encuentra la velocidad inicial que da la distancia del record"""
-    v0 = v0_guess
+def impacto_suelo(t, state, *args):
+    """Evento: el martillo cruza y = 0 bajando"""
+    return state[1]
+
+impacto_suelo.terminal = True
+impacto_suelo.direction = -1
+
+def distancia_vuelo(v0, CD, phi=phi, h0=2.0, rtol=1e-10, atol=1e-10, metodo='DOP853',
+                    t_max=60.0):
+    """
+    Integra un lanzamiento hasta el impacto con el suelo (evento terminal)
     
-    for _ in range(50):  # máximo 50 iteraciones
-        # Condiciones iniciales
-        state0 = [0, 2, v0 * np.cos(phi), v0 * np.sin(phi)]
-        
-        # Tiempo de integración
-        t_span = (0, 15)
-        t_eval = np.linspace(0, 15, 1000)
+    El punto de impacto lo localiza solve_ivp sobre la salida densa, sin
+    muestrear la trayectoria con t_eval.
+    
+    Parámetros:
+    v0: velocidad inicial (m/s)
+    CD: coeficiente de arrastre
+    phi: ángulo de lanzamiento (rad)
+    h0: altura de lanzamiento (m)
+    rtol, atol: tolerancias del integrador
+    metodo: método de solve_ivp
+    t_max: tiempo máximo de integración (s)
+    
+    Retorna la distancia horizontal al impacto y la solución (con sol.sol)
+    """
+    state0 = [0, h0, v0 * np.cos(phi), v0 * np.sin(phi)]
+    sol = solve_ivp(martillo, (0, t_max), state0, args=(g, rho, A, CD, m),
+                    method=metodo, events=impacto_suelo, dense_output=True,
+                    rtol=rtol, atol=atol)
+    if len(sol.t_events[0]) == 0:
+        raise RuntimeError(f"El martillo no llegó al suelo en {t_max} s")
+    return sol.y_events[0][0][0], sol
+
+def velocidad_sin_friccion(distancia, phi=phi, h0=2.0):
+    """
+    v0 que da la distancia pedida sin arrastre (cota inferior con arrastre)
+    
+    De y(R) = 0: v0² = g R² / (2 cos²φ (h0 + R tan φ))
+    """
+    return np.sqrt(g * distancia**2 / (2 * np.cos(phi)**2 * (h0 + distancia*np.tan(phi))))
+
+def encontrar_velocidad_record(CD, v0_guess=None, tol=1e-8, distancia_record=86.74,
+                               phi=phi, h0=2.0):
+    """
+    Encuentra la velocidad inicial que da la distancia del record
+    
+    La distancia crece con v0, así que se acota la raíz de D(v0) - record y
+    se refina con el método de Brent. La cota inferior es la velocidad sin
+    arrastre (exacta si CD = 0); la superior se busca escalando v0.
+    
+    Parámetros:
+    CD: coeficiente de arrastre
+    v0_guess: velocidad inicial para la cota inferior (None = sin fricción)
+    tol: tolerancia en la distancia (m)
+    distancia_record: distancia objetivo (m)
+    phi, h0: ángulo y altura de lanzamiento
+    
+    Retorna v0, la solución, la distancia y un diccionario con el número de
+    integraciones y de evaluaciones del lado derecho (martillo)
+    """
+    soluciones = {}
+    
+    def error(v0):
+        if v0 not in soluciones:
+            soluciones[v0] = distancia_vuelo(v0, CD, phi, h0)
+        return soluciones[v0][0] - distancia_record
+    
+    v_bajo = velocidad_sin_friccion(distancia_record, phi, h0) if v0_guess is None else v0_guess
+    
+    if abs(error(v_bajo)) < tol:
+        v0 = v_bajo
+    else:
+        # Escalar v0 (D ~ v0²) hasta que la distancia pase del record
+        v_alto = v_bajo
+        while error(v_alto) < 0:
+            v_bajo = v_alto
+            v_alto = v_alto * np.sqrt(distancia_record / (error(v_alto) + distancia_record)) * 1.02
+        while error(v_bajo) > 0:
+            v_alto, v_bajo = v_bajo, v_bajo * 0.9
         
-        # Resolver EDOs
-        sol = solve_ivp(martillo, t_span, state0, args=(g, rho, A, CD, m), 
-                       t_eval=t_eval, method='RK45')
+        # Tolerancia en v0 a partir de dD/dv0 ≈ 2D/v0
+        v0 = brentq(error, v_bajo, v_alto, xtol=tol * v_bajo / (2*distancia_record),
+                    rtol=4*np.finfo(float).eps)
+    
+    distancia, sol = soluciones[v0] if v0 in soluciones else distancia_vuelo(v0, CD, phi, h0)
+    estadisticas = {
+        'integraciones': len(soluciones),
+        'evaluaciones': sum(s.nfev for _, s in soluciones.values()),
+    }
+    return v0, sol, distancia, estadisticas
+
+def martillo_lote(estado, k, g=g, out=None):
+    """
+    Ecuaciones de movimiento para un lote de martillos, estado de forma (M, 4)
+    
+    Con k = rho*A*CD/(2m), la aceleración de arrastre es -k*v*(vx, vy); no hay
+    división entre v, así que v = 0 no necesita un caso aparte.
+    """
+    vx, vy = estado[:, 2], estado[:, 3]
+    if out is None:
+        out = np.empty_like(estado)
+    out[:, 0] = vx
+    out[:, 1] = vy
+    kv = np.hypot(vx, vy)
+    kv *= k
+    np.multiply(kv, vx, out=out[:, 2])
+    np.negative(out[:, 2], out=out[:, 2])
+    np.multiply(kv, vy, out=out[:, 3])
+    out[:, 3] += g
+    np.negative(out[:, 3], out=out[:, 3])
+    return out
+
+def _impacto_hermite(anterior, nuevo, d_anterior, d_nuevo, dt, iteraciones=4):
+    """
+    Fracción s del paso en que y = 0 y x en ese instante, por interpolación cúbica de Hermite
+    
+    Usa posiciones y velocidades al inicio y al final del paso (error O(dt⁴),
+    el mismo orden que RK4); la raíz se refina con Newton desde la lineal.
+    """
+    y0, y1 = anterior[:, 1], nuevo[:, 1]
+    s = y0 / (y0 - y1)
+    for _ in range(iteraciones):
+        h00, h10 = 2*s**3 - 3*s**2 + 1, s**3 - 2*s**2 + s
+        h01, h11 = -2*s**3 + 3*s**2, s**3 - s**2
+        p = h00*y0 + h10*dt*d_anterior[:, 1] + h01*y1 + h11*dt*d_nuevo[:, 1]
+        dp = ((6*s**2 - 6*s)*y0 + (3*s**2 - 4*s + 1)*dt*d_anterior[:, 1] +
+              (-6*s**2 + 6*s)*y1 + (3*s**2 - 2*s)*dt*d_nuevo[:, 1])
+        s = np.clip(s - p/dp, 0.0, 1.0)
+    
+    h00, h10 = 2*s**3 - 3*s**2 + 1, s**3 - 2*s**2 + s
+    h01, h11 = -2*s**3 + 3*s**2, s**3 - s**2
+    x = (h00*anterior[:, 0] + h10*dt*d_anterior[:, 0] +
+         h01*nuevo[:, 0] + h11*dt*d_nuevo[:, 0])
+    return s, x
+
+def alcance_lote(v0, phi=phi, CD=0.0, h0=2.0, dt=0.02, t_max=60.0):
+    """
+    Distancia y tiempo de vuelo de muchos lanzamientos a la vez (RK4 de paso fijo)
+    
+    Todas las trayectorias avanzan juntas como un arreglo (M, 4) (en orden de
+    Fortran, para que cada componente sea contigua). Cuando una cruza y = 0 se
+    interpola su punto de impacto dentro del paso y sale del lote; el lote se
+    compacta cuando queda menos de la mitad activa.
+    
+    Parámetros:
+    v0, phi, CD, h0: velocidad (m/s), ángulo (rad), coeficiente de arrastre y
+                     altura inicial (m); arreglos que se combinan por difusión
+    dt: paso de tiempo de RK4 (s)
+    t_max: tiempo máximo de integración (s)
+    
+    Retorna la distancia y el tiempo de vuelo, con la forma de la difusión de
+    las entradas (nan si no llegó al suelo antes de t_max)
+    """
+    v0, phi, CD, h0 = np.broadcast_arrays(*(np.asarray(a, dtype=float)
+                                            for a in (v0, phi, CD, h0)))
+    forma = v0.shape
+    M = v0.size
+    
+    estado = np.empty((M, 4), order='F')
+    estado[:, 0] = 0.0
+    estado[:, 1] = h0.ravel()
+    estado[:, 2] = (v0 * np.cos(phi)).ravel()
+    estado[:, 3] = (v0 * np.sin(phi)).ravel()
+    k = (rho * np.pi * R**2 * CD / (2*m)).ravel()
+    
+    distancia = np.full(M, np.nan)
+    t_vuelo = np.full(M, np.nan)
+    casos = np.arange(M)                 # índice original de cada fila
+    vivos = np.ones(M, dtype=bool)       # filas que siguen en el aire
+    
+    # Etapas y auxiliares reutilizados en cada paso
+    etapas = [np.empty_like(estado) for _ in range(5)]
+    aux = np.empty_like(estado)
+    nuevo = np.empty_like(estado)
+    
+    derivadas = martillo_lote(estado, k, g, out=etapas[0])
+    for n in range(int(np.ceil(t_max / dt))):
+        k1, k2, k3, k4, derivadas_nuevas = etapas
+        np.multiply(k1, 0.5*dt, out=aux)
+        aux += estado
+        martillo_lote(aux, k, g, out=k2)
+        np.multiply(k2, 0.5*dt, out=aux)
+        aux += estado
+        martillo_lote(aux, k, g, out=k3)
+        np.multiply(k3, dt, out=aux)
+        aux += estado
+        martillo_lote(aux, k, g, out=k4)
         
-        # Encontrar cuando y = 0 (martillo toca tierra)
-        y_values = sol.y[1]
-        x_values = sol.y[0]
+        # nuevo = estado + dt/6 (k1 + 2k2 + 2k3 + k4)
+        np.add(k2, k3, out=aux)
+        aux *= 2
+        aux += k1
+        aux += k4
+        aux *= dt/6
+        np.add(estado, aux, out=nuevo)
+        martillo_lote(nuevo, k, g, out=derivadas_nuevas)
         
-        # Encontrar el índice donde y cruza por cero
-        ground_index = np.where(y_values < 0)[0]
-        if len(ground_index) > 0:
-            ground_index = ground_index[0]
-            distancia = x_values[ground_index]
-        else:
-            distancia = x_values[-1]
+        aterrizan = vivos & (nuevo[:, 1] < 0)
+        if np.any(aterrizan):
+            s, x = _impacto_hermite(estado[aterrizan], nuevo[aterrizan],
+                                    derivadas[aterrizan], derivadas_nuevas[aterrizan], dt)
+            distancia[casos[aterrizan]] = x
+            t_vuelo[casos[aterrizan]] = (n + s) * dt
+            vivos &= ~aterrizan
         
-        # Ajustar velocidad
-        error = distancia - 86.74
-        if abs(error) < tol:
+        # Intercambio de memoria: el nuevo estado y sus derivadas pasan a ser los actuales
+        estado, nuevo = nuevo, estado
+        etapas = [derivadas_nuevas, k2, k3, k4, k1]
+        derivadas = derivadas_nuevas
+        if not np.any(vivos):
             break
-            
-        v0 = v0 - error * 0.1  # ajuste proporcional
-    
-    return v0, sol, distancia
-
-# Encontrar velocidades para cada caso
-resultados = {}
-for nombre, CD in CD_casos.items():
-    v0, sol, distancia = encontrar_velocidad_record(CD)
-    resultados[nombre] = {
-        'v0': v0,
-        'solucion': sol,
-        'distancia': distancia
+        if np.count_nonzero(vivos) < len(vivos) // 2:
+            estado = np.asfortranarray(estado[vivos])
+            etapas = [np.asfortranarray(e[vivos]) for e in etapas]
+            derivadas = etapas[0]
+            aux, nuevo = np.empty_like(estado), np.empty_like(estado)
+            k, casos = k[vivos], casos[vivos]
+            vivos = np.ones(len(casos), dtype=bool)
+    
+    return distancia.reshape(forma), t_vuelo.reshape(forma)
+
+# Tablas de alcance guardadas junto a este archivo
+DIRECTORIO_TABLAS = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'tablas_alcance')
+_MARGEN = 4   # celdas de relleno de la tabla para el spline cúbico
+_tablas = {}
+
+def tabla_alcance(v0=(15.0, 40.0, 101), phi_grados=(10.0, 70.0, 61), CD=(0.0, 1.0, 21),
+                  h0=2.0, directorio=None, reconstruir=False):
+    """
+    Tabla de distancias D(v0, phi, CD) calculada con alcance_lote y guardada en .npz
+    
+    El archivo se identifica con las constantes físicas (g, m, R, rho, h0) y
+    la malla; si alguna cambia se usa otro archivo y la tabla se recalcula
+    sola. Dentro del mismo proceso la tabla se reutiliza sin leer el disco.
+    
+    Parámetros:
+    v0: (mínimo, máximo, puntos) de la velocidad (m/s)
+    phi_grados: (mínimo, máximo, puntos) del ángulo (grados)
+    CD: (mínimo, máximo, puntos) del coeficiente de arrastre
+    h0: altura de lanzamiento (m)
+    directorio: carpeta de las tablas (None = DIRECTORIO_TABLAS)
+    reconstruir: recalcular aunque exista el archivo
+    
+    Retorna un diccionario con los ejes, las distancias y los coeficientes del
+    spline cúbico (con un relleno de _MARGEN celdas por lado)
+    """
+    constantes = {'g': g, 'm': m, 'R': R, 'rho': rho, 'h0': h0}
+    malla = {'v0': list(v0), 'phi_grados': list(phi_grados), 'CD': list(CD)}
+    clave = hashlib.sha1(json.dumps([constantes, malla], sort_keys=True).encode()).hexdigest()[:12]
+    
+    if not reconstruir and clave in _tablas:
+        return _tablas[clave]
+    
+    archivo = os.path.join(directorio or DIRECTORIO_TABLAS, f'alcance_{clave}.npz')
+    tabla = None
+    if not reconstruir and os.path.exists(archivo):
+        with np.load(archivo) as datos:
+            if all(np.isclose(datos[nombre], valor) for nombre, valor in constantes.items()):
+                tabla = {nombre: datos[nombre] for nombre in datos.files}
+    
+    if tabla is None:
+        ejes = [np.linspace(*v0), np.radians(np.linspace(*phi_grados)), np.linspace(*CD)]
+        D, _ = alcance_lote(*np.meshgrid(*ejes, indexing='ij'), h0=h0)
+        # Relleno por reflexión impar (conserva la pendiente en los bordes)
+        relleno = np.pad(D, _MARGEN, mode='reflect', reflect_type='odd')
+        coeficientes = ndimage.spline_filter(relleno, order=3, mode='mirror')
+        tabla = dict(v0=ejes[0], phi=ejes[1], CD=ejes[2], D=D, coeficientes=coeficientes,
+                     **constantes)
+        os.makedirs(os.path.dirname(archivo), exist_ok=True)
+        np.savez(archivo, **tabla)
+    
+    _tablas[clave] = tabla
+    return tabla
+
+def distancia_tabla(tabla, v0, phi=phi, CD=0.0):
+    """
+    Distancia interpolada (spline cúbico) en la tabla; nan fuera de su rango
+    
+    v0, phi (rad) y CD se combinan por difusión.
+    """
+    consultas = np.broadcast_arrays(*(np.asarray(q, dtype=float) for q in (v0, phi, CD)))
+    forma = consultas[0].shape
+    
+    indices = np.empty((3, consultas[0].size))
+    fuera = np.zeros(consultas[0].size, dtype=bool)
+    for k, (q, eje) in enumerate(zip(consultas, (tabla['v0'], tabla['phi'], tabla['CD']))):
+        indices[k] = (q.ravel() - eje[0]) / (eje[1] - eje[0])
+        fuera |= (indices[k] < -1e-9) | (indices[k] > len(eje) - 1 + 1e-9)
+    
+    D = ndimage.map_coordinates(tabla['coeficientes'], indices + _MARGEN, order=3,
+                                mode='mirror', prefilter=False)
+    D[fuera] = np.nan
+    return D.reshape(forma)
+
+def velocidad_para_distancia(tabla, distancia, phi=phi, CD=0.0, iteraciones=40):
+    """
+    v0 que da la distancia pedida con la tabla (inversa monótona en v0)
+    
+    D crece con v0: la raíz se acota entre dos nodos de la tabla y se refina
+    por bisección sobre el spline. nan si la distancia queda fuera de la tabla.
+    """
+    distancia, phi, CD = np.broadcast_arrays(*(np.asarray(q, dtype=float)
+                                               for q in (distancia, phi, CD)))
+    forma = distancia.shape
+    distancia, phi, CD = distancia.ravel(), phi.ravel(), CD.ravel()
+    nodos = tabla['v0']
+    
+    # Distancias en los nodos de v0 para cada consulta, forma (Q, Nv)
+    columnas = distancia_tabla(tabla, nodos[np.newaxis, :], phi[:, np.newaxis],
+                               CD[:, np.newaxis])
+    i = np.sum(columnas < distancia[:, np.newaxis], axis=1)
+    fuera = (i == 0) & (columnas[:, 0] != distancia) | (i == len(nodos)) | np.isnan(columnas[:, 0])
+    i = np.clip(i, 1, len(nodos) - 1)
+    
+    bajo, alto = nodos[i - 1], nodos[i]
+    for _ in range(iteraciones):
+        medio = 0.5*(bajo + alto)
+        corto = distancia_tabla(tabla, medio, phi, CD) < distancia
+        bajo = np.where(corto, medio, bajo)
+        alto = np.where(corto, alto, medio)
+    
+    v0 = 0.5*(bajo + alto)
+    v0[fuera] = np.nan
+    return v0.reshape(forma)
+
+def angulo_optimo(tabla, v0, CD=0.0, iteraciones=40):
+    """
+    Ángulo de máximo alcance para v0 y CD dados, con la tabla
+    
+    Se toma el mejor nodo de phi y se refina por sección áurea entre sus
+    vecinos. Retorna el ángulo (rad) y la distancia máxima.
+    """
+    v0, CD = np.broadcast_arrays(*(np.asarray(q, dtype=float) for q in (v0, CD)))
+    forma = v0.shape
+    v0, CD = v0.ravel(), CD.ravel()
+    nodos = tabla['phi']
+    
+    filas = distancia_tabla(tabla, v0[:, np.newaxis], nodos[np.newaxis, :], CD[:, np.newaxis])
+    j = np.nanargmax(np.where(np.isnan(filas), -np.inf, filas), axis=1)
+    a = nodos[np.clip(j - 1, 0, len(nodos) - 1)]
+    b = nodos[np.clip(j + 1, 0, len(nodos) - 1)]
+    
+    razon = (np.sqrt(5) - 1) / 2
+    c, d = b - razon*(b - a), a + razon*(b - a)
+    Dc, Dd = distancia_tabla(tabla, v0, c, CD), distancia_tabla(tabla, v0, d, CD)
+    for _ in range(iteraciones):
+        izquierda = Dc > Dd
+        b = np.where(izquierda, d, b)
+        a = np.where(izquierda, a, c)
+        c, d = b - razon*(b - a), a + razon*(b - a)
+        Dc, Dd = distancia_tabla(tabla, v0, c, CD), distancia_tabla(tabla, v0, d, CD)
+    
+    phi_opt = 0.5*(a + b)
+    return phi_opt.reshape(forma), distancia_tabla(tabla, v0, phi_opt, CD).reshape(forma)
+
+# Incertidumbres de medición por defecto: variable -> (método de np.random.Generator,
+# parámetros); un número en lugar de la tupla fija la variable
+INCERTIDUMBRES = {
+    'v0': ('normal', 29.3, 0.3),
+    'phi': ('normal', phi, np.radians(1.0)),
+    'h0': ('uniform', 1.9, 2.1),
+    'CD': ('normal', 0.5, 0.05),
+}
+
+# Pasos de las diferencias centradas para las sensibilidades dD/dX
+PASOS_SENSIBILIDAD = {'v0': 0.01, 'phi': np.radians(0.05), 'h0': 0.005, 'CD': 0.005}
+
+def muestrear_lanzamientos(rng, n, distribuciones):
+    """
+    Muestras de v0, phi, h0 y CD según las distribuciones (ver INCERTIDUMBRES)
+    
+    Parámetros:
+    rng: np.random.Generator
+    n: número de muestras
+    distribuciones: dict variable -> (método, parámetros...) o valor fijo
+    """
+    muestras = {}
+    for nombre in INCERTIDUMBRES:
+        distribucion = distribuciones[nombre]
+        if isinstance(distribucion, tuple):
+            metodo, *parametros = distribucion
+            muestras[nombre] = getattr(rng, metodo)(*parametros, size=n)
+        else:
+            muestras[nombre] = np.full(n, float(distribucion))
+    return muestras
+
+def _lote_monte_carlo(semilla, n, distribuciones, pasos, dt):
+    """
+    Integra un lote de n lanzamientos junto con sus perturbaciones ±paso
+    
+    Las perturbaciones usan las mismas muestras que los lanzamientos
+    (números aleatorios comunes). Retorna las distancias y, por variable, la
+    suma y la suma de cuadrados de las derivadas dD/dX de las muestras.
+    """
+    muestras = muestrear_lanzamientos(np.random.default_rng(semilla), n, distribuciones)
+    
+    # Columna 0: muestra original; columnas 2j+1 y 2j+2: variable j con +paso y -paso
+    entradas = {nombre: np.repeat(valores[:, np.newaxis], 1 + 2*len(pasos), axis=1)
+                for nombre, valores in muestras.items()}
+    for j, (nombre, paso) in enumerate(pasos.items()):
+        entradas[nombre][:, 2*j + 1] += paso
+        entradas[nombre][:, 2*j + 2] -= paso
+    D, _ = alcance_lote(entradas['v0'], entradas['phi'], entradas['CD'], entradas['h0'], dt=dt)
+    
+    sumas = {}
+    for j, (nombre, paso) in enumerate(pasos.items()):
+        derivada = (D[:, 2*j + 1] - D[:, 2*j + 2]) / (2*paso)
+        sumas[nombre] = (np.sum(derivada), np.sum(derivada**2))
+    return D[:, 0], sumas
+
+def propagar_incertidumbre(n_muestras, distribuciones=None, tamano_lote=10000, procesos=None,
+                           semilla=0, pasos=None, cuantiles=(0.05, 0.25, 0.5, 0.75, 0.95),
+                           dt=0.02):
+    """
+    Propagación Monte Carlo de las incertidumbres de v0, phi, h0 y CD a la distancia
+    
+    Las muestras se integran con alcance_lote en lotes de tamano_lote, así que
+    la memoria de trabajo no crece con n_muestras (sólo se guardan las
+    distancias, 8 bytes por muestra). Los lotes se reparten entre procesos;
+    cada uno tiene su propia semilla derivada de semilla, de modo que el
+    resultado no depende del número de procesos.
+    
+    Las sensibilidades dD/dX se estiman con diferencias centradas sobre las
+    mismas muestras (números aleatorios comunes): el ruido de muestreo se
+    cancela en la diferencia, por lo que bastan pasos pequeños.
+    
+    Parámetros:
+    n_muestras: número de lanzamientos
+    distribuciones: dict como INCERTIDUMBRES (las variables que falten se toman de ahí)
+    tamano_lote: muestras por lote
+    procesos: número de procesos (None o 1 = en serie)
+    semilla: semilla de np.random.SeedSequence
+    pasos: dict variable -> paso de la diferencia centrada (None = PASOS_SENSIBILIDAD,
+           {} = sin sensibilidades)
+    cuantiles: probabilidades de los cuantiles de la distancia
+    dt: paso de RK4 de alcance_lote
+    
+    Retorna un diccionario con las distancias, su media, desviación estándar y
+    cuantiles, y por variable la media y el error estándar de dD/dX
+    """
+    distribuciones = {**INCERTIDUMBRES, **(distribuciones or {})}
+    pasos = PASOS_SENSIBILIDAD if pasos is None else pasos
+    
+    tamanos = [min(tamano_lote, n_muestras - i) for i in range(0, n_muestras, tamano_lote)]
+    semillas = np.random.SeedSequence(semilla).spawn(len(tamanos))
+    tarea = partial(_lote_monte_carlo, distribuciones=distribuciones, pasos=pasos, dt=dt)
+    
+    if procesos is None or procesos <= 1:
+        lotes = map(tarea, semillas, tamanos)
+    else:
+        ejecutor = ProcessPoolExecutor(max_workers=procesos)
+        lotes = ejecutor.map(tarea, semillas, tamanos)
+    
+    distancias = np.empty(n_muestras)
+    sumas = {nombre: np.zeros(2) for nombre in pasos}
+    inicio = 0
+    try:
+        for (D, sumas_lote), n in zip(lotes, tamanos):
+            distancias[inicio:inicio + n] = D
+            inicio += n
+            for nombre, (suma, suma_cuadrados) in sumas_lote.items():
+                sumas[nombre] += (suma, suma_cuadrados)
+    finally:
+        if procesos is not None and procesos > 1:
+            ejecutor.shutdown()
+    
+    sensibilidades = {}
+    for nombre, (suma, suma_cuadrados) in sumas.items():
+        media = suma / n_muestras
+        varianza = max(suma_cuadrados / n_muestras - media**2, 0.0)
+        sensibilidades[nombre] = {'media': media,
+                                  'error': np.sqrt(varianza / n_muestras)}
+    
+    return {
+        'distancias': distancias,
+        'media': np.mean(distancias),
+        'desviacion': np.std(distancias, ddof=1),
+        'cuantiles': dict(zip(cuantiles, np.quantile(distancias, cuantiles))),
+        'sensibilidades': sensibilidades,
     }
-    print(f"{nombre:15}: v0 = {v0:.2f} m/s, distancia = {distancia:.2f} m")
-
-# Graficar trayectorias
-plt.figure(figsize=(12, 4))
-
-# Trayectoria y vs x
-plt.subplot(1, 2, 1)
-for nombre, resultado in resultados.items():
-    sol = resultado['solucion']
-    x = sol.y[0]
-    y = sol.y[1]
-    plt.plot(x, y, label=nombre, linewidth=2)
-
-plt.xlabel('Distancia (m)')
-plt.ylabel('Altura (m)')
-plt.title('Trayectorias del martillo')
-plt.legend()
-plt.grid(True)
-
-# Altura vs tiempo
-plt.subplot(1, 2, 2)
-for nombre, resultado in resultados.items():
-    sol = resultado['solucion']
-    t = sol.t
-    y = sol.y[1]
-    plt.plot(t, y, label=nombre, linewidth=2)
-
-plt.xlabel('Tiempo (s)')
-plt.ylabel('Altura (m)')
-plt.title('Altura vs tiempo')
-plt.legend()
-plt.grid(True)
-
-plt.tight_layout()
-plt.show()
-
-# Calcular influencia de la fricción
-v0_sin = resultados['sin_friccion']['v0']
-v0_laminar = resultados['laminar']['v0']
-v0_inestable = resultados['inestable']['v0']
-
-print(f"\nInfluencia de la fricción:")
-print(f"Diferencia velocidad laminar vs sin fricción: {v0_laminar - v0_sin:.2f} m/s")
-print(f"Diferencia velocidad inestable vs sin fricción: {v0_inestable - v0_sin:.2f} m/s")#!/usr/bin/env python3
+
+if __name__ == "__main__":
+    # Encontrar velocidades para cada caso
+    resultados = {}
+    for nombre, CD in CD_casos.items():
+        v0, sol, distancia, estadisticas = encontrar_velocidad_record(CD)
+        resultados[nombre] = {
+            'v0': v0,
+            'solucion': sol,
+            'distancia': distancia
+        }
+        print(f"{nombre:15}: v0 = {v0:.6f} m/s, distancia = {distancia:.8f} m "
+              f"({estadisticas['integraciones']} integraciones, "
+              f"{estadisticas['evaluaciones']} evaluaciones de martillo)")
+
+    # Graficar trayectorias
+    plt.figure(figsize=(12, 4))
+
+    # Trayectoria y vs x
+    plt.subplot(1, 2, 1)
+    for nombre, resultado in resultados.items():
+        sol = resultado['solucion']
+        t = np.linspace(0, sol.t_events[0][0], 200)
+        x, y = sol.sol(t)[:2]
+        plt.plot(x, y, label=nombre, linewidth=2)
+
+    plt.xlabel('Distancia (m)')
+    plt.ylabel('Altura (m)')
+    plt.title('Trayectorias del martillo')
+    plt.legend()
+    plt.grid(True)
+
+    # Altura vs tiempo
+    plt.subplot(1, 2, 2)
+    for nombre, resultado in resultados.items():
+        sol = resultado['solucion']
+        t = np.linspace(0, sol.t_events[0][0], 200)
+        y = sol.sol(t)[1]
+        plt.plot(t, y, label=nombre, linewidth=2)
+
+    plt.xlabel('Tiempo (s)')
+    plt.ylabel('Altura (m)')
+    plt.title('Altura vs tiempo')
+    plt.legend()
+    plt.grid(True)
+
+    plt.tight_layout()
+    plt.show()
+
+    # Calcular influencia de la fricción
+    v0_sin = resultados['sin_friccion']['v0']
+    v0_laminar = resultados['laminar']['v0']
+    v0_inestable = resultados['inestable']['v0']
+
+    print(f"\nInfluencia de la fricción:")
+    print(f"Diferencia velocidad laminar vs sin fricción: {v0_laminar - v0_sin:.2f} m/s")
+    print(f"Diferencia velocidad inestable vs sin fricción: {v0_inestable - v0_sin:.2f} m/s")
+
+    # Integración por lotes: mismas condiciones que solve_ivp y una tabla de alcances
+    print(f"\nIntegración por lotes (RK4, dt = 0.02 s):")
+    v0_casos = np.array([resultados[nombre]['v0'] for nombre in CD_casos])
+    d_lote, _ = alcance_lote(v0_casos, phi, np.array(list(CD_casos.values())))
+    for nombre, d in zip(CD_casos, d_lote):
+        print(f"{nombre:15}: distancia = {d:.8f} m "
+              f"(solve_ivp: {resultados[nombre]['distancia']:.8f} m)")
+
+    V0, PHI, CD_malla = np.meshgrid(np.linspace(20, 35, 100), np.radians(np.linspace(20, 60, 100)),
+                                    np.linspace(0, 0.75, 10), indexing='ij')
+    inicio = time.perf_counter()
+    D_malla, _ = alcance_lote(V0, PHI, CD_malla)
+    print(f"Tabla de {D_malla.size} trayectorias en {time.perf_counter() - inicio:.2f} s")
+
+    plt.figure(figsize=(7, 5))
+    contornos = plt.contourf(V0[:, :, -1], np.degrees(PHI[:, :, -1]), D_malla[:, :, -1], levels=20)
+    plt.colorbar(contornos, label='Distancia (m)')
+    plt.contour(V0[:, :, -1], np.degrees(PHI[:, :, -1]), D_malla[:, :, -1], levels=[86.74],
+                colors='r')
+    plt.xlabel('v0 (m/s)')
+    plt.ylabel('Ángulo (°)')
+    plt.title(f'Alcance con CD = {CD_malla[0, 0, -1]:.2f} (rojo: record)')
+    plt.show()
+
+    # Tabla de alcances persistente: consultas directas e inversas sin integrar
+    print(f"\nTabla de alcances ({DIRECTORIO_TABLAS}):")
+    inicio = time.perf_counter()
+    tabla = tabla_alcance()
+    print(f"Tabla {tabla['D'].shape} lista en {time.perf_counter() - inicio:.2f} s")
+    inicio = time.perf_counter()
+    v0_tabla = velocidad_para_distancia(tabla, 86.74, phi, np.array(list(CD_casos.values())))
+    print(f"Consultas inversas en {1000*(time.perf_counter() - inicio):.1f} ms")
+    for (nombre, CD), v0_t in zip(CD_casos.items(), v0_tabla):
+        phi_opt, D_max = angulo_optimo(tabla, v0_t, CD)
+        print(f"{nombre:15}: v0 = {v0_t:.4f} m/s (Brent: {resultados[nombre]['v0']:.4f} m/s), "
+              f"ángulo óptimo = {np.degrees(phi_opt):.2f}° con {D_max:.2f} m")
+
+    # Propagación Monte Carlo de las incertidumbres de medición
+    print("\nPropagación Monte Carlo (v0, phi, h0 y CD con incertidumbre):")
+    inicio = time.perf_counter()
+    mc = propagar_incertidumbre(20000, procesos=os.cpu_count())
+    print(f"{len(mc['distancias'])} lanzamientos en {time.perf_counter() - inicio:.2f} s")
+    print(f"Distancia: {mc['media']:.2f} ± {mc['desviacion']:.2f} m")
+    for p, cuantil in mc['cuantiles'].items():
+        print(f"  cuantil {p:.2f}: {cuantil:.2f} m")
+    unidades = {'v0': 'm/(m/s)', 'phi': 'm/°', 'h0': 'm/m', 'CD': 'm'}
+    for nombre, s in mc['sensibilidades'].items():
+        escala = np.radians(1.0) if nombre == 'phi' else 1.0
+        print(f"  dD/d{nombre:3} = {escala*s['media']:8.3f} ± {escala*s['error']:.3f} "
+              f"{unidades[nombre]}")
+    
+    plt.figure(figsize=(7, 4))
+    plt.hist(mc['distancias'], bins=60, density=True)
+    plt.axvline(86.74, color='r', label='Record')
+    plt.xlabel('Distancia (m)')
+    plt.ylabel('Densidad')
+    plt.title('Distribución de la distancia (Monte Carlo)')
+    plt.legend()
+    plt.show()#!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 """
 Created on Sun Nov  2 13:08:47 2025
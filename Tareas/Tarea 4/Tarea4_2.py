@@ -6,8 +6,21 @@ Created on Mon Nov  3 14:52:25 2025
 @author: isaias-gl
 """
 
+import os
+import sys
+import time
+
 import numpy as np
 from scipy.integrate import solve_ivp
+from scipy.linalg import eig_banded, eigh_tridiagonal
+from scipy.optimize import OptimizeResult
+from scipy.sparse import diags
+from scipy.sparse.linalg import eigsh
+
+# Análisis espectral compartido (Tareas/espectro.py)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from espectro import (EspectroWelch, comparar_frecuencias, comparar_picos, energias_modales,
+                      picos_espectrales)
 import matplotlib.pyplot as plt
 from scipy.optimize import fsolve
 
@@ -37,11 +50,12 @@ def ecuaciones_no_lineales(t, y, k, m):
     """
     x1, x2, v1, v2 = y
     
-    # Fuerzas no lineales
+    # Fuerzas no lineales (el resorte central tira de cada masa hacia la otra,
+    # como k*(x2 - x1) en ecuaciones_lineales)
     F1_left = -k * (x1 + 0.1 * x1**3)
-    F1_center = -k * ((x2 - x1) + 0.1 * (x2 - x1)**3)
+    F1_center = k * ((x2 - x1) + 0.1 * (x2 - x1)**3)
     F2_right = -k * (x2 + 0.1 * x2**3)
-    F2_center = -k * ((x1 - x2) + 0.1 * (x1 - x2)**3)
+    F2_center = k * ((x1 - x2) + 0.1 * (x1 - x2)**3)
     
     a1 = (F1_left + F1_center) / m
     a2 = (F2_right + F2_center) / m
@@ -52,29 +66,145 @@ def ecuaciones_no_lineales(t, y, k, m):
 # INCISO (b): Frecuencias de modos normales
 # =============================================================================
 
-def calcular_modos_normales(k, m):
+def matriz_dinamica_cadena(masas, resortes):
     """
-    Calcula las frecuencias y modos normales del sistema
+    Matriz dinámica simétrica M^(-1/2) K M^(-1/2) de una cadena de masas entre dos paredes
+    
+    La matriz es tridiagonal; se retorna su diagonal (N) y su subdiagonal (N-1).
+    
+    Parámetros:
+    masas: N masas
+    resortes: N+1 constantes (pared-masa 1, masa 1-masa 2, ..., masa N-pared)
     """
-    # Matriz de ecuaciones
-    A = np.array([[2*k, -k], 
-                  [-k, 2*k]]) / m
+    masas = np.asarray(masas, dtype=float)
+    resortes = np.asarray(resortes, dtype=float)
+    if len(resortes) != len(masas) + 1:
+        raise ValueError("Se necesitan N+1 resortes para N masas")
     
-    # Valores propios y vectores propios
-    eigenvalues, eigenvectors = np.linalg.eig(A)
+    diagonal = (resortes[:-1] + resortes[1:]) / masas
+    subdiagonal = -resortes[1:-1] / np.sqrt(masas[:-1] * masas[1:])
+    return diagonal, subdiagonal
+
+def calcular_modos_normales(k, m, N=2, n_modos=None, metodo='tridiagonal', vectores=True):
+    """
+    Calcula las frecuencias y modos normales de una cadena de N masas entre dos paredes
     
-    # Frecuencias angulares (sqrt de valores propios)
-    frecuencias = np.sqrt(eigenvalues)
+    K v = ω² M v se resuelve en la forma simétrica M^(-1/2) K M^(-1/2) w = ω² w,
+    que es tridiagonal, sin formar matrices densas. Las frecuencias salen en
+    orden creciente y los modos en coordenadas de posición, normalizados con
+    la masa (v·M·v = 1) y con la primera componente positiva.
+    
+    Parámetros:
+    k: constante de los resortes (escalar o N+1 valores)
+    m: masa (escalar o N valores)
+    N: número de masas cuando k y m son escalares
+    n_modos: calcular sólo los n_modos de menor frecuencia (None = todos)
+    metodo: 'tridiagonal' (eigh_tridiagonal), 'banda' (eig_banded) o
+            'dispersa' (eigsh con desplazamiento-inversión en 0; requiere n_modos < N)
+    vectores: calcular también los modos
+    
+    En cadenas largas hay que pedir sólo los n_modos más bajos: todos los
+    modos de 10^5 masas ocupan N² valores (y 'banda' reserva esa matriz
+    aunque se pidan pocos modos).
+    """
+    if np.ndim(m) > 0:
+        N = len(m)
+    elif np.ndim(k) > 0:
+        N = len(k) - 1
+    masas = np.broadcast_to(np.asarray(m, dtype=float), (N,))
+    resortes = np.broadcast_to(np.asarray(k, dtype=float), (N + 1,))
+    diagonal, subdiagonal = matriz_dinamica_cadena(masas, resortes)
+    
+    seleccion = {} if n_modos is None else {'select': 'i', 'select_range': (0, n_modos - 1)}
+    if metodo == 'tridiagonal':
+        # Tolerancia mínima de bisección: precisión relativa en las ω² pequeñas
+        resultado = eigh_tridiagonal(diagonal, subdiagonal, eigvals_only=not vectores,
+                                     tol=2*np.finfo(float).tiny, **seleccion)
+    elif metodo == 'banda':
+        banda = np.zeros((2, N))
+        banda[0, 1:] = subdiagonal
+        banda[1] = diagonal
+        resultado = eig_banded(banda, eigvals_only=not vectores, **seleccion)
+    elif metodo == 'dispersa':
+        if n_modos is None or n_modos >= N:
+            raise ValueError("El método 'dispersa' requiere n_modos < N")
+        A = diags([subdiagonal, diagonal, subdiagonal], [-1, 0, 1], format='csc')
+        resultado = eigsh(A, k=n_modos, sigma=0, which='LM', return_eigenvectors=vectores)
+    else:
+        raise ValueError(f"Método desconocido: {metodo}")
+    
+    eigenvalues, eigenvectors = resultado if vectores else (resultado, None)
+    orden = np.argsort(eigenvalues)
     
+    # Frecuencias angulares (sqrt de valores propios)
     modos = {
-        'frecuencias': frecuencias,
-        'modos': eigenvectors.T,  # Transponer para tener modos en filas
-        'modo_simetrico': eigenvectors[:, 0],
-        'modo_antisimetrico': eigenvectors[:, 1]
+        'frecuencias': np.sqrt(eigenvalues[orden]),
+        'masas': np.array(masas),
+        'resortes': np.array(resortes),
     }
     
+    if vectores:
+        # De vuelta a posiciones (v = M^(-1/2) w), modos en filas
+        vectores_modos = eigenvectors[:, orden].T / np.sqrt(masas)
+        vectores_modos *= np.sign(vectores_modos[:, :1])
+        modos['modos'] = vectores_modos
+        if N == 2:
+            modos['modo_simetrico'] = vectores_modos[0]
+            modos['modo_antisimetrico'] = vectores_modos[1]
+    
     return modos
 
+# Modos completos ya calculados, por (k, m, N)
+_modos_cacheados = {}
+
+def modos_cacheados(k, m, N=2):
+    """
+    Todos los modos normales de la cadena, calculados una sola vez por (k, m, N)
+    
+    k y m pueden ser escalares o arreglos, como en calcular_modos_normales.
+    """
+    clave = (np.asarray(k, dtype=float).tobytes(), np.asarray(m, dtype=float).tobytes(), N)
+    if clave not in _modos_cacheados:
+        _modos_cacheados[clave] = calcular_modos_normales(k, m, N)
+    return _modos_cacheados[clave]
+
+def propagador_modal(condiciones_iniciales, t, k=1.0, m=1.0):
+    """
+    Solución exacta del sistema lineal como superposición de modos normales
+    
+    Las condiciones iniciales se proyectan en los modos (a = V M x0,
+    b = V M v0) y cada modo evoluciona como a cos(ωt) + (b/ω) sin(ωt); las
+    posiciones y velocidades en todos los tiempos salen de un solo producto
+    de matrices, sin integrar.
+    
+    Parámetros:
+    condiciones_iniciales: [x1, ..., xN, v1, ..., vN]
+    t: arreglo de tiempos (cualquier orden y espaciamiento)
+    k, m: constantes de los resortes y masas (escalares o arreglos)
+    
+    Retorna un resultado con t e y (forma (2N, len(t))) como el de solve_ivp
+    """
+    y0 = np.asarray(condiciones_iniciales, dtype=float)
+    t = np.asarray(t, dtype=float)
+    N = len(y0) // 2
+    modos = modos_cacheados(k, m, N)
+    V, omega = modos['modos'], modos['frecuencias']
+    
+    # Amplitudes modales (los modos están normalizados con la masa)
+    a = V @ (modos['masas'] * y0[:N])
+    b = V @ (modos['masas'] * y0[N:])
+    
+    fase = np.outer(omega, t)
+    coseno, seno = np.cos(fase), np.sin(fase)
+    # Coordenadas modales de posición y velocidad lado a lado: un solo producto
+    q = np.hstack([a[:, np.newaxis]*coseno + (b/omega)[:, np.newaxis]*seno,
+                   -(a*omega)[:, np.newaxis]*seno + b[:, np.newaxis]*coseno])
+    xv = V.T @ q
+    y = np.vstack([xv[:, :len(t)], xv[:, len(t):]])
+    
+    return OptimizeResult(t=t, y=y, success=True, status=0,
+                          message='Solución exacta por modos normales')
+
 # =============================================================================
 # INCISO (c): Simulaciones de diferentes condiciones iniciales
 # =============================================================================
@@ -124,6 +254,186 @@ def graficar_resultados(sol, titulo):
     plt.tight_layout()
     plt.show()
 
+# =============================================================================
+# Integradores simplécticos para la cadena no lineal
+# =============================================================================
+
+BETA = 0.1  # coeficiente cúbico de los resortes: F = -k(Δ + BETA Δ³)
+
+# Pesos de las composiciones simétricas de pasos de Verlet (Yoshida, 1990)
+_W1 = 1 / (2 - 2**(1/3))
+_YOSHIDA6 = (0.784513610477560, 0.235573213359357, -1.17767998417887)  # de fuera hacia el centro
+COMPOSICIONES = {
+    'verlet': (1.0,),                                          # orden 2
+    'forest_ruth': (_W1, 1 - 2*_W1, _W1),                      # orden 4
+    'yoshida6': _YOSHIDA6 + (1 - 2*sum(_YOSHIDA6),) + _YOSHIDA6[::-1],  # orden 6
+}
+
+def _por_resorte(valor, n, forma_lote):
+    """
+    Constantes por resorte (o masa) con ejes extra para difundir sobre los lotes
+    """
+    valor = np.broadcast_to(np.asarray(valor, dtype=float), (n,))
+    return valor.reshape((n,) + (1,) * len(forma_lote))
+
+def fuerzas_cadena(x, k=1.0, beta=BETA, out=None, trabajo=None):
+    """
+    Fuerzas sobre una cadena de N masas unidas por resortes cúbicos, con paredes fijas
+    
+    Parámetros:
+    x: posiciones, forma (N,) o (N, ...) con trayectorias independientes en
+       los ejes restantes
+    k: constante de los resortes (escalar o N+1 valores)
+    beta: coeficiente cúbico
+    out: arreglo de salida con la forma de x (opcional)
+    trabajo: dos arreglos auxiliares de forma (N+1,) + x.shape[1:] (opcional)
+    """
+    N = x.shape[0]
+    if out is None:
+        out = np.empty_like(x, dtype=float)
+    if trabajo is None:
+        trabajo = [np.empty((N + 1,) + x.shape[1:]) for _ in range(2)]
+    elongacion, tension = trabajo
+    
+    # Elongaciones de los N+1 resortes (las paredes están en x = 0)
+    elongacion[0] = x[0]
+    np.subtract(x[1:], x[:-1], out=elongacion[1:-1])
+    np.negative(x[-1:], out=elongacion[-1:])
+    
+    # Tensión k (Δ + beta Δ³) = k Δ (1 + beta Δ²)
+    np.multiply(elongacion, elongacion, out=tension)
+    tension *= beta
+    tension += 1
+    tension *= elongacion
+    tension *= k if np.ndim(k) == 0 else _por_resorte(k, N + 1, x.shape[1:])
+    
+    # Cada masa: resorte derecho menos resorte izquierdo
+    np.subtract(tension[1:], tension[:-1], out=out)
+    return out
+
+def energia_cadena(x, v, k=1.0, m=1.0, beta=BETA):
+    """
+    Energía total de la cadena (forma x.shape[1:])
+    """
+    N = x.shape[0]
+    forma_lote = x.shape[1:]
+    elongacion = np.concatenate([x[:1], np.diff(x, axis=0), -x[-1:]])
+    potencial = (elongacion**2 / 2 + beta * elongacion**4 / 4) * _por_resorte(k, N + 1, forma_lote)
+    cinetica = 0.5 * v**2 * _por_resorte(m, N, forma_lote)
+    return np.sum(cinetica, axis=0) + np.sum(potencial, axis=0)
+
+def ecuaciones_cadena(t, y, k=1.0, m=1.0, beta=BETA):
+    """
+    Ecuaciones de movimiento de la cadena no lineal de N masas, para solve_ivp
+    y = [x1, ..., xN, v1, ..., vN]
+    """
+    N = len(y) // 2
+    return np.concatenate([y[N:], fuerzas_cadena(y[:N], k, beta) / m])
+
+def integrar_simplectico(condiciones_iniciales, dt, n_pasos, k=1.0, m=1.0, beta=BETA,
+                         metodo='verlet', cada=1):
+    """
+    Integra la cadena no lineal con un método simpléctico de paso fijo
+    
+    Cada paso es una composición simétrica de pasos de Verlet de velocidad
+    con los pesos de COMPOSICIONES; la energía no deriva, sólo oscila con
+    amplitud O(dt^orden). Todos los arreglos se reservan antes del ciclo.
+    
+    Parámetros:
+    condiciones_iniciales: [x1, ..., xN, v1, ..., vN], con ejes extra opcionales
+                           para integrar varias trayectorias a la vez
+    dt: paso de tiempo
+    n_pasos: número de pasos
+    k, m: constantes de los resortes (N+1) y masas (N), escalares o arreglos
+    beta: coeficiente cúbico
+    metodo: 'verlet', 'forest_ruth' o 'yoshida6'
+    cada: guardar una de cada 'cada' instantáneas (para corridas largas)
+    
+    Retorna los tiempos guardados, y (forma (2N, ..., n)) y la energía en esos tiempos
+    """
+    if metodo not in COMPOSICIONES:
+        raise ValueError(f"Método desconocido: {metodo}")
+    y0 = np.asarray(condiciones_iniciales, dtype=float)
+    N = y0.shape[0] // 2
+    x, v = y0[:N].copy(), y0[N:].copy()
+    forma_lote = x.shape[1:]
+    inv_m = 1.0 / _por_resorte(m, N, forma_lote)
+    
+    aceleracion = np.empty_like(x)
+    impulso = np.empty_like(x)
+    trabajo = [np.empty((N + 1,) + forma_lote) for _ in range(2)]
+    
+    def actualizar_aceleracion():
+        fuerzas_cadena(x, k, beta, out=aceleracion, trabajo=trabajo)
+        np.multiply(aceleracion, inv_m, out=aceleracion)
+    
+    n_guardados = n_pasos // cada + 1
+    t = np.arange(n_guardados) * cada * dt
+    y = np.empty((2*N,) + forma_lote + (n_guardados,))
+    y[:N, ..., 0], y[N:, ..., 0] = x, v
+    
+    pasos = [(0.5*w*dt, w*dt) for w in COMPOSICIONES[metodo]]
+    actualizar_aceleracion()
+    for n in range(1, n_pasos + 1):
+        for medio, completo in pasos:
+            np.multiply(aceleracion, medio, out=impulso)
+            v += impulso
+            np.multiply(v, completo, out=impulso)
+            x += impulso
+            actualizar_aceleracion()
+            np.multiply(aceleracion, medio, out=impulso)
+            v += impulso
+        if n % cada == 0:
+            y[:N, ..., n // cada], y[N:, ..., n // cada] = x, v
+    
+    energia = energia_cadena(y[:N], y[N:], k, m, beta)
+    return t, y, energia
+
+def diagnostico_energia(condiciones_iniciales, periodos=200, pasos_por_periodo=50, k=1.0,
+                        m=1.0, beta=BETA, metodos=('verlet', 'forest_ruth', 'yoshida6'),
+                        metodos_ivp=('RK45', 'DOP853')):
+    """
+    Deriva de energía y costo por periodo de los integradores simplécticos y de solve_ivp
+    
+    El periodo es el del modo lineal más lento, 2π/ω1. Los métodos
+    simplécticos usan dt = periodo / pasos_por_periodo; solve_ivp usa sus
+    tolerancias por defecto.
+    
+    Retorna un diccionario método -> {'deriva': max |E - E0|/E0,
+    'evaluaciones': evaluaciones de fuerza por periodo, 'segundos': tiempo
+    de cómputo por periodo, 't', 'energia'}
+    """
+    y0 = np.asarray(condiciones_iniciales, dtype=float)
+    N = len(y0) // 2
+    periodo = 2*np.pi / modos_cacheados(k, m, N)['frecuencias'][0]
+    n_pasos = periodos * pasos_por_periodo
+    dt = periodo / pasos_por_periodo
+    
+    resultados = {}
+    for metodo in metodos:
+        inicio = time.perf_counter()
+        t, _, energia = integrar_simplectico(y0, dt, n_pasos, k, m, beta, metodo,
+                                             cada=pasos_por_periodo)
+        duracion = time.perf_counter() - inicio
+        resultados[metodo] = {'t': t, 'energia': energia,
+                              'evaluaciones': pasos_por_periodo * len(COMPOSICIONES[metodo]),
+                              'segundos': duracion / periodos}
+    
+    t_eval = np.arange(periodos + 1) * periodo
+    for metodo in metodos_ivp:
+        inicio = time.perf_counter()
+        sol = solve_ivp(ecuaciones_cadena, (0, t_eval[-1]), y0, args=(k, m, beta),
+                        t_eval=t_eval, method=metodo)
+        duracion = time.perf_counter() - inicio
+        resultados[metodo] = {'t': sol.t, 'energia': energia_cadena(sol.y[:N], sol.y[N:], k, m, beta),
+                              'evaluaciones': sol.nfev / periodos,
+                              'segundos': duracion / periodos}
+    
+    for resultado in resultados.values():
+        E = resultado['energia']
+        resultado['deriva'] = np.max(np.abs(E - E[0])) / abs(E[0])
+    return resultados
+
 # Parámetros del sistema
 k = 1.0  # constante del resorte
 m = 1.0  # masa
@@ -140,6 +450,27 @@ print(f"Frecuencias angulares: {modos['frecuencias']}")
 print(f"Modo simétrico (baja frecuencia): {modos['modo_simetrico']}")
 print(f"Modo antisimétrico (alta frecuencia): {modos['modo_antisimetrico']}")
 
+# Cadena de N masas y resortes distintos: sólo los modos más bajos
+N_cadena = 100000
+n_modos = 10
+rng = np.random.default_rng(0)
+masas_cadena = rng.uniform(0.5, 1.5, N_cadena)
+resortes_cadena = rng.uniform(0.5, 1.5, N_cadena + 1)
+print(f"\nCadena de {N_cadena} masas, {n_modos} modos más bajos:")
+for metodo in ('tridiagonal', 'dispersa'):
+    inicio = time.perf_counter()
+    modos_cadena = calcular_modos_normales(resortes_cadena, masas_cadena, n_modos=n_modos,
+                                           metodo=metodo)
+    print(f"{metodo:12}: {time.perf_counter() - inicio:.2f} s, "
+          f"ω1 = {modos_cadena['frecuencias'][0]:.6e}, ω{n_modos} = {modos_cadena['frecuencias'][-1]:.6e}")
+
+# Cadena uniforme: ω_j = 2 sqrt(k/m) sin(jπ / (2(N+1)))
+modos_uniforme = calcular_modos_normales(k, m, N=N_cadena, n_modos=n_modos)
+j = np.arange(1, n_modos + 1)
+exactas = 2*np.sqrt(k/m) * np.sin(j*np.pi / (2*(N_cadena + 1)))
+print(f"Cadena uniforme: error relativo máximo = "
+      f"{np.max(np.abs(modos_uniforme['frecuencias']/exactas - 1)):.1e}")
+
 # =============================================================================
 # INCISO (c): Simulaciones con diferentes condiciones iniciales
 # =============================================================================
@@ -163,6 +494,26 @@ cond_iii = [0.0, 0.5, 0, 0]
 sol_iii = simular_sistema(cond_iii, k, m)
 graficar_resultados(sol_iii, "Caso iii - Una masa desplazada")
 
+# Propagador exacto por modos normales frente a solve_ivp
+print("\nPropagador modal vs solve_ivp (RK45 por defecto y rtol = atol = 1e-10):")
+for nombre, cond, sol in (('i', cond_i, sol_i), ('ii', cond_ii, sol_ii), ('iii', cond_iii, sol_iii)):
+    exacta = propagador_modal(cond, sol.t, k, m)
+    precisa = solve_ivp(ecuaciones_lineales, (0, sol.t[-1]), cond, args=(k, m),
+                        t_eval=sol.t, method='RK45', rtol=1e-10, atol=1e-10)
+    print(f"Caso {nombre:3}: diferencia máxima {np.max(np.abs(sol.y - exacta.y)):.1e} "
+          f"(RK45), {np.max(np.abs(precisa.y - exacta.y)):.1e} (rtol = 1e-10)")
+
+t_largo = np.linspace(0, 1e3, 10**4)
+inicio = time.perf_counter()
+sol_largo = solve_ivp(ecuaciones_lineales, (0, t_largo[-1]), cond_iii, args=(k, m),
+                      t_eval=t_largo, method='RK45', rtol=1e-10, atol=1e-10)
+t_ivp = time.perf_counter() - inicio
+inicio = time.perf_counter()
+exacta_larga = propagador_modal(cond_iii, t_largo, k, m)
+t_modal = time.perf_counter() - inicio
+print(f"Horizonte t = {t_largo[-1]:.0e}: solve_ivp {t_ivp:.2f} s, propagador {t_modal*1000:.1f} ms "
+      f"({t_ivp/t_modal:.0f}x), diferencia {np.max(np.abs(sol_largo.y - exacta_larga.y)):.1e}")
+
 # =============================================================================
 # INCISO (d): Comparación lineal vs no lineal
 # =============================================================================
@@ -193,8 +544,68 @@ plt.grid(True)
 plt.tight_layout()
 plt.show()
 
-# Análisis de diferencias
+# Energía a largo plazo: integradores simplécticos frente a solve_ivp
+print("\nDeriva de energía del caso iii no lineal en 200 periodos:")
+diagnostico = diagnostico_energia(cond_iii, periodos=200, pasos_por_periodo=50, k=k, m=m)
+print(f"{'método':>12} {'max |ΔE|/E0':>12} {'fuerzas/periodo':>16} {'ms/periodo':>11}")
+for metodo, resultado in diagnostico.items():
+    print(f"{metodo:>12} {resultado['deriva']:>12.1e} {resultado['evaluaciones']:>16.0f} "
+          f"{1000*resultado['segundos']:>11.2f}")
+
+plt.figure(figsize=(8, 4))
+for metodo, resultado in diagnostico.items():
+    E = resultado['energia']
+    plt.semilogy(resultado['t'][1:], np.abs(E[1:] - E[0]) / abs(E[0]) + 1e-17, label=metodo)
+plt.xlabel('Tiempo')
+plt.ylabel('|E - E0| / E0')
+plt.title('Error de energía (sistema no lineal, caso iii)')
+plt.legend()
+plt.grid(True)
+plt.show()
+
+# Análisis de diferencias: picos del espectro de las posiciones (Tareas/espectro.py)
 print("\nAnálisis de diferencias:")
-frec_lineal = 1/(sol_iii_lineal.t[1] - sol_iii_lineal.t[0]) * 0.1  # Estimación frecuencia
-print(f"Frecuencia aproximada sistema lineal: {frec_lineal:.3f} Hz")
+comparacion = comparar_frecuencias(sol_iii_lineal, sol_iii_no_lineal, componentes=[0, 1])
+for f_lin, f_nl, relativo in zip(comparacion['referencia'], comparacion['otra'],
+                                 comparacion['relativo']):
+    print(f"Lineal: f = {f_lin:.4f} (ω = {2*np.pi*f_lin:.4f}), "
+          f"no lineal: f = {f_nl:.4f} (ω = {2*np.pi*f_nl:.4f}), desplazamiento {100*relativo:+.2f} %")
+print(f"Modos normales: ω = {modos['frecuencias']}")
+
+# Corrida larga por bloques: el espectro de Welch se acumula sin guardar la trayectoria
+dt_largo = 0.05
+pasos_bloque = 10000
+welch_lineal = EspectroWelch(dt_largo, n_segmento=8192)
+welch_no_lineal = EspectroWelch(dt_largo, n_segmento=8192)
+estado = np.array(cond_iii, dtype=float)
+for bloque in range(10):
+    t_bloque, y_bloque, _ = integrar_simplectico(estado, dt_largo, pasos_bloque, k, m,
+                                                 metodo='forest_ruth')
+    t_bloque += bloque * pasos_bloque * dt_largo
+    welch_no_lineal.agregar(y_bloque[:2, :-1])
+    welch_lineal.agregar(propagador_modal(cond_iii, t_bloque[:-1], k, m).y[:2])
+    estado = y_bloque[:, -1]
+    if bloque == 0:
+        energias_no_lineal = energias_modales(y_bloque, modos)
+        t_energias = t_bloque
 
+picos = []
+for acumulado in (welch_lineal, welch_no_lineal):
+    f, P = acumulado.espectro()
+    picos.append(picos_espectrales(f, P.sum(axis=0), n_picos=2)[0])
+comparacion_welch = comparar_picos(*picos)
+print(f"Welch ({welch_no_lineal.segmentos} segmentos, t = {10*pasos_bloque*dt_largo:.0f}):")
+for f_lin, f_nl, relativo in zip(comparacion_welch['referencia'], comparacion_welch['otra'],
+                                 comparacion_welch['relativo']):
+    print(f"  f lineal = {f_lin:.5f}, f no lineal = {f_nl:.5f} ({100*relativo:+.2f} %)")
+
+# Intercambio de energía entre modos en el sistema no lineal
+plt.figure(figsize=(10, 4))
+for j, energia in enumerate(energias_no_lineal):
+    plt.plot(t_energias, energia, label=f'Modo {j + 1} (ω = {modos["frecuencias"][j]:.3f})')
+plt.xlabel('Tiempo')
+plt.ylabel('Energía modal')
+plt.title('Energías modales del sistema no lineal (caso iii)')
+plt.legend()
+plt.grid(True)
+plt.show()
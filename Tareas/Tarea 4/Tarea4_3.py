@@ -6,9 +6,21 @@ Created on Mon Nov  3 19:56:13 2025
 @author: isaias-gl
 """
 
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
 import numpy as np
 import matplotlib.pyplot as plt
 import matplotlib.animation as anim
+from scipy.fft import dst
+
+# Operadores diferenciales y exportación de animaciones compartidos (Tareas/)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from operadores import derivada, laplaciano
+from animacion import exportar_animacion, figura_agg, indices_decimados
 
 # =============================================================================
 # PARÁMETROS FÍSICOS
@@ -18,21 +30,47 @@ T = 100.0         # Tensión (N)
 rho = 1.0         # Densidad lineal (kg/m)
 c = np.sqrt(T/rho) # Velocidad de la onda (m/s)
 
-print("=== PROBLEMA 3: VIBRACIÓN DE CUERDA ===")
-print(f"Velocidad de la onda: c = {c:.2f} m/s")
-
 # =============================================================================
 # INCISO (d)-(f): MÉTODO DE DIFERENCIAS FINITAS
 # =============================================================================
-def resolver_cuerda_simple(dx, dt, tiempo_total, c, L):
+def pulso_triangular(x, L, x0=None, altura=1.0):
     """
-    Resuelve la ecuación de onda por diferencias finitas
+    Desplazamiento inicial de una cuerda pulsada en x0 (por defecto en L/2)
+    
+    Parámetros:
+    x: posiciones (arreglo)
+    L: longitud de la cuerda
+    x0: punto donde se pulsa la cuerda
+    altura: desplazamiento máximo, alcanzado en x0
+    """
+    x0 = L/2 if x0 is None else x0
+    return altura * np.where(x < x0, x/x0, (L - x)/(L - x0))
+
+def resolver_cuerda_leapfrog(dx, dt, tiempo_total, c, L, y0=None, v0=None,
+                             cada=1, sondas=None, cada_sonda=1, salida=None):
+    """
+    Ecuación de onda con el esquema de salto de rana y sólo tres niveles de tiempo
+    
+    Los niveles j-1, j, j+1 viven en un búfer circular de forma (3, Nx); en
+    lugar de la historia completa (Nx, Nt) se guardan instantáneas cada 'cada'
+    pasos y trazas en puntos de sondeo cada 'cada_sonda' pasos.
+    
+    Parámetros:
+    dx, dt, tiempo_total, c, L: discretización, velocidad de onda y longitud
+    y0: desplazamiento inicial (arreglo de Nx valores o función de x);
+        None = pulso_triangular
+    v0: velocidad inicial (arreglo o función de x); None = cuerda en reposo
+    cada: guardar una instantánea cada 'cada' pasos (None = ninguna)
+    sondas: posiciones x donde registrar y(t) (se usa el nodo más cercano)
+    cada_sonda: registrar las sondas cada 'cada_sonda' pasos
+    salida: destino de las instantáneas en disco (almacenamiento.EscritorSerie);
+            si se da, las instantáneas no se guardan en memoria
+    
+    Retorna x, los tiempos y las instantáneas (Nx, n), y los tiempos y las
+    trazas de las sondas (len(sondas), m); los que no se piden valen None
     """
     Nx = int(L/dx) + 1
     Nt = int(tiempo_total/dt) + 1
-    
-    # Matriz solución
-    y = np.zeros((Nx, Nt))
     x = np.linspace(0, L, Nx)
     
     # Condición de Courant
@@ -42,31 +80,187 @@ def resolver_cuerda_simple(dx, dt, tiempo_total, c, L):
     if r > 1:
         print("¡ADVERTENCIA: La simulación puede ser inestable!")
     
-    # Condición inicial: pulso triangular
-    for i in range(Nx):
-        if x[i] < L/2:
-            y[i, 0] = 2*x[i]/L
-        else:
-            y[i, 0] = 2*(1 - x[i]/L)
+    # Condiciones iniciales a partir de expresiones de arreglos
+    if y0 is None:
+        y0 = pulso_triangular(x, L)
+    elif callable(y0):
+        y0 = y0(x)
+    if v0 is None:
+        v0 = 0.0
+    elif callable(v0):
+        v0 = v0(x)
     
-    # Primera derivada temporal (velocidad inicial cero)
-    y[:, 1] = y[:, 0]
+    niveles = np.empty((3, Nx))
+    niveles[0] = y0
+    niveles[1] = niveles[0] + dt * v0
+    niveles[1, [0, -1]] = niveles[0, [0, -1]]
+    
+    # Instantáneas y sondas
+    pasos = np.arange(0, Nt, cada) if cada is not None else np.array([], dtype=int)
+    t_snap = pasos * dt
+    y_snap = None
+    if salida is None and cada is not None:
+        y_snap = np.empty((Nx, len(pasos)))
+    
+    t_sonda = trazas = None
+    if sondas is not None:
+        indices = np.clip(np.rint(np.atleast_1d(sondas) / dx).astype(int), 0, Nx - 1)
+        t_sonda = np.arange(0, Nt, cada_sonda) * dt
+        trazas = np.empty((len(indices), len(t_sonda)))
+    
+    def registrar(j, y):
+        if cada is not None and j % cada == 0:
+            if salida is not None:
+                salida.agregar(j * dt, y)
+            else:
+                y_snap[:, j // cada] = y
+        if sondas is not None and j % cada_sonda == 0:
+            trazas[:, j // cada_sonda] = y[indices]
     
-    # Iteración temporal
+    registrar(0, niveles[0])
+    if Nt > 1:
+        registrar(1, niveles[1])
+    
+    # y^{j+1} = 2y^j - y^{j-1} + (c*dt)²∇²y^j (extremos fijos)
+    lap = np.empty(Nx)
     for j in range(1, Nt-1):
-        for i in range(1, Nx-1):
-            y[i, j+1] = 2*y[i, j] - y[i, j-1] + r*(y[i+1, j] + y[i-1, j] - 2*y[i, j])
+        y_ant, y_act, y_sig = niveles[(j-1) % 3], niveles[j % 3], niveles[(j+1) % 3]
+        laplaciano(y_act, dx, frontera='dirichlet', out=lap)
+        lap *= (c * dt)**2
+        np.subtract(y_act, y_ant, out=y_sig)
+        y_sig += y_act
+        y_sig += lap
+        registrar(j + 1, y_sig)
+    
+    return x, t_snap, y_snap, t_sonda, trazas
+
+def resolver_cuerda_simple(dx, dt, tiempo_total, c, L, y0=None, v0=None):
+    """
+    Resuelve la ecuación de onda por diferencias finitas
     
-    return x, np.linspace(0, tiempo_total, Nt), y
+    Guarda la historia completa (Nx, Nt); para corridas largas conviene
+    resolver_cuerda_leapfrog con instantáneas espaciadas o sondas.
+    """
+    x, t, y, _, _ = resolver_cuerda_leapfrog(dx, dt, tiempo_total, c, L, y0, v0)
+    return x, t, y
+
+# =============================================================================
+# SOLUCIÓN EXACTA: SERIE DE SENOS Y D'ALEMBERT
+# =============================================================================
+def preparar_solucion_exacta(y0=None, v0=None, c=10.0, L=1.0, n_muestras=2049):
+    """
+    Precalcula la solución exacta de la cuerda fija en ambos extremos
+    
+    Se guardan las muestras del desplazamiento inicial y de la primitiva de la
+    velocidad inicial (para d'Alembert) y sus coeficientes de la serie de senos
+    (DST-I de los puntos interiores, para la solución modal). Después la
+    solución se evalúa en cualquier (x, t) sin avanzar en el tiempo.
+    
+    Parámetros:
+    y0: desplazamiento inicial (arreglo de muestras en una malla uniforme de
+        [0, L], o función de x); None = pulso_triangular
+    v0: velocidad inicial (arreglo o función de x); None = cuerda en reposo
+    c, L: velocidad de onda y longitud de la cuerda
+    n_muestras: puntos de muestreo cuando y0 o v0 son funciones
+    """
+    if y0 is not None and not callable(y0):
+        n_muestras = len(y0)
+    elif v0 is not None and not callable(v0):
+        n_muestras = len(v0)
+    x = np.linspace(0, L, n_muestras)
+    M = n_muestras - 1
+    
+    if y0 is None:
+        y0 = pulso_triangular(x, L)
+    elif callable(y0):
+        y0 = y0(x)
+    if v0 is None:
+        v0 = np.zeros(n_muestras)
+    elif callable(v0):
+        v0 = v0(x)
+    y0 = np.asarray(y0, dtype=float)
+    v0 = np.asarray(v0, dtype=float)
+    
+    # Primitiva de v0 por trapecios (G(0) = 0)
+    G = np.concatenate([[0.0], np.cumsum(0.5*(v0[1:] + v0[:-1]) * (L/M))])
+    
+    # b_k = (2/L) ∫ f sin(kπx/L) dx ≈ DST-I / M, k = 1..M-1
+    k = np.arange(1, M)
+    omega = k * np.pi * c / L
+    b = dst(y0[1:-1], type=1) / M
+    d = dst(v0[1:-1], type=1) / M / omega
+    
+    return {'x': x, 'y0': y0, 'G': G, 'k': k, 'omega': omega, 'b': b, 'd': d,
+            'c': c, 'L': L}
+
+def _extension_impar(sol, s):
+    """
+    Extensión impar y 2L-periódica de y0 y extensión par de su primitiva G
+    """
+    L = sol['L']
+    s = np.mod(s, 2*L)
+    reflejado = s > L
+    s = np.where(reflejado, 2*L - s, s)
+    F = np.interp(s, sol['x'], sol['y0'])
+    G = np.interp(s, sol['x'], sol['G'])
+    return np.where(reflejado, -F, F), G
+
+def evaluar_dalembert(sol, x, t):
+    """
+    y(x, t) = [F(x - ct) + F(x + ct)]/2 + [G(x + ct) - G(x - ct)]/(2c)
+    
+    F y G son las extensiones impar y par (periodo 2L) de y0 y de la primitiva
+    de v0, interpoladas linealmente entre las muestras (exacto en los nodos
+    para perfiles lineales por tramos como el pulso triangular).
+    
+    Parámetros:
+    sol: resultado de preparar_solucion_exacta
+    x, t: arreglos que se combinan por difusión (broadcasting); por ejemplo
+          x[:, None] y t[None, :] dan la malla (Nx, Nt) de resolver_cuerda_simple
+    """
+    x = np.asarray(x, dtype=float)
+    ct = sol['c'] * np.asarray(t, dtype=float)
+    F_menos, G_menos = _extension_impar(sol, x - ct)
+    F_mas, G_mas = _extension_impar(sol, x + ct)
+    return 0.5*(F_menos + F_mas) + (G_mas - G_menos) / (2*sol['c'])
+
+def evaluar_modal(sol, x, t, n_modos=None, tamano_bloque=2**22):
+    """
+    y(x, t) = sum_k [b_k cos(ω_k t) + d_k sin(ω_k t)] sin(kπx/L)
+    
+    Parámetros:
+    sol: resultado de preparar_solucion_exacta
+    x, t: arreglos que se combinan por difusión (broadcasting)
+    n_modos: número de modos (None = todos los de la DST)
+    tamano_bloque: elementos intermedios máximos por bloque de modos
+    """
+    x = np.asarray(x, dtype=float)[..., np.newaxis]
+    t = np.asarray(t, dtype=float)[..., np.newaxis]
+    forma = np.broadcast_shapes(x.shape, t.shape)[:-1]
+    
+    n_modos = len(sol['k']) if n_modos is None else min(n_modos, len(sol['k']))
+    paso = max(1, tamano_bloque // max(1, int(np.prod(forma))))
+    
+    y = np.zeros(forma)
+    for inicio in range(0, n_modos, paso):
+        bloque = slice(inicio, min(inicio + paso, n_modos))
+        omega_t = sol['omega'][bloque] * t
+        temporal = sol['b'][bloque] * np.cos(omega_t)
+        if np.any(sol['d'][bloque]):
+            temporal = temporal + sol['d'][bloque] * np.sin(omega_t)
+        espacial = np.sin(sol['k'][bloque] * np.pi * x / sol['L'])
+        y += np.sum(espacial * temporal, axis=-1)
+    return y
 
 # =============================================================================
 # INCISO (i): ANIMACIÓN OPTIMIZADA (basada en el codigo de la actividad 7)
 # =============================================================================
-def crear_animacion_cuerda(x, t, y, titulo):
+def _dibujar_cuerda(fig, x, t, y):
     """
-    Crea animación de la cuerda vibrante usando el estilo de tu código
+    Dibuja la cuerda en fig y retorna la función que actualiza el cuadro i
     """
-    fig, ax = plt.subplots(figsize=(12, 3))
+    perfil = (lambda i: y(x, t[i])) if callable(y) else (lambda i: y[:, i])
+    ax = fig.subplots()
     fig.subplots_adjust(bottom=0.2)
     
     # Configurar ejes
@@ -77,7 +271,7 @@ def crear_animacion_cuerda(x, t, y, titulo):
     ax.grid(True, alpha=0.3)
     
     # Crear línea inicial
-    line, = ax.plot(x, y[:, 0], color='b', linewidth=2)
+    line, = ax.plot(x, perfil(0), color='b', linewidth=2)
     
     # Información de tiempo
     time_text = ax.text(0.02, 0.95, '', transform=ax.transAxes, 
@@ -85,10 +279,43 @@ def crear_animacion_cuerda(x, t, y, titulo):
     
     def animate_frame(i):
         """Actualiza cada frame de la animación"""
-        line.set_ydata(y[:, i])
+        line.set_ydata(perfil(i))
         time_text.set_text(f't = {t[i]:.3f} s')
         return line, time_text
     
+    return animate_frame
+
+def _figura_cuerda_agg(x, t, y):
+    """
+    Figura fuera de pantalla para exportar (se puede crear en otro proceso)
+    """
+    fig = figura_agg((12, 3))
+    return fig, _dibujar_cuerda(fig, x, t, y)
+
+def crear_animacion_cuerda(x, t, y, titulo, archivo=None, fps=20, duracion=None,
+                           procesos=None):
+    """
+    Crea animación de la cuerda vibrante usando el estilo de tu código
+    
+    y puede ser la historia (Nx, Nt) o una función y(x, t) que da el perfil de
+    cada cuadro (por ejemplo evaluar_dalembert), sin guardar la historia.
+    
+    Si se da archivo (.gif, .mp4, ...) la animación se exporta sin ventana con
+    el lienzo Agg, tomando round(fps*duracion) cuadros repartidos en t (todos
+    si duracion es None); procesos > 1 dibuja bloques de cuadros en paralelo
+    (y debe ser un arreglo o una función de módulo, no una lambda).
+    """
+    if archivo is not None:
+        indices = indices_decimados(len(t), fps, duracion)
+        y_cuadros = y if callable(y) else y[:, indices]
+        fabrica = partial(_figura_cuerda_agg, x, t[indices], y_cuadros)
+        print(f"Exportando {len(indices)} de {len(t)} cuadros a {archivo}")
+        return exportar_animacion(fabrica, range(len(indices)), archivo, fps,
+                                  procesos=procesos)
+    
+    fig = plt.figure(figsize=(12, 3))
+    animate_frame = _dibujar_cuerda(fig, x, t, y)
+    
     # Calcular parámetros de animación
     dt_anim = t[1] - t[0]
     interval = 50  # ms entre frames
@@ -106,133 +333,297 @@ def crear_animacion_cuerda(x, t, y, titulo):
     return animation
 
 # =============================================================================
-# SIMULACIÓN PRINCIPAL
+# INCISO (j): BARRIDO DE ESTABILIDAD
 # =============================================================================
+def factor_amplificacion(courant):
+    """
+    Factor de amplificación por paso del modo más oscilatorio en el salto de rana
+    
+    Con b = 1 - 2(c*Δt/Δx)², el modo de Nyquist tiene |λ| = 1 si |b| <= 1 y
+    |λ| = |b| + sqrt(b² - 1) si no (inestable para c*Δt/Δx > 1).
+    """
+    b = 1 - 2*np.asarray(courant, dtype=float)**2
+    return np.where(np.abs(b) <= 1, 1.0, np.abs(b) + np.sqrt(np.maximum(b**2 - 1, 0)))
 
-# CASO 1: CONDICIÓN DE COURANT SATISFECHA
-print("\n--- CASO 1: Condición de Courant SATISFECHA ---")
-dx1 = 0.01
-dt1 = 0.0008  # c*dt/dx = 10*0.0008/0.01 = 0.8 ≤ 1
-tiempo_total1 = 0.5
-
-x1, t1, y1 = resolver_cuerda_simple(dx1, dt1, tiempo_total1, c, L)
-anim1 = crear_animacion_cuerda(x1, t1, y1, "Cuerda - Condición Courant Satisfecha")
-
-# CASO 2: CONDICIÓN DE COURANT VIOLADA
-print("\n--- CASO 2: Condición de Courant VIOLADA ---")
-dx2 = 0.01
-dt2 = 0.002   # c*dt/dx = 10*0.002/0.01 = 2.0 > 1
-tiempo_total2 = 0.1  # Tiempo más corto para evitar divergencia
-
-x2, t2, y2 = resolver_cuerda_simple(dx2, dt2, tiempo_total2, c, L)
-anim2 = crear_animacion_cuerda(x2, t2, y2, "Cuerda - Condición Courant Violada")
-
-# =============================================================================
-# INCISO (j): ANÁLISIS DE ESTABILIDAD
-# =============================================================================
-print("\n--- ANÁLISIS DE ESTABILIDAD ---")
-
-# Probar diferentes condiciones de Courant
-condiciones = [
-    (0.02, 0.001, 0.5, "Muy estable"),
-    (0.01, 0.0005, 0.5, "Estable"),
-    (0.01, 0.001, 1.0, "Límite"),
-    (0.01, 0.002, 2.0, "Inestable"),
-    (0.005, 0.001, 2.0, "Muy inestable")
-]
-
-print("Resultados de estabilidad:")
-for dx, dt, courant, desc in condiciones:
-    # Simulación rápida para verificar estabilidad
-    try:
-        Nx_test = int(L/dx) + 1
-        Nt_test = min(100, int(0.1/dt) + 1)
-        
-        y_test = np.zeros((Nx_test, Nt_test))
-        x_test = np.linspace(0, L, Nx_test)
-        
-        # Condición inicial
-        for i in range(Nx_test):
-            if x_test[i] < L/2:
-                y_test[i, 0] = 2*x_test[i]/L
-            else:
-                y_test[i, 0] = 2*(1 - x_test[i]/L)
+def _barrido_resolucion(dx, courants, tiempo_total, c, L, umbral):
+    """
+    Avanza juntos todos los números de Courant de una resolución como un lote (K, Nx)
+    
+    Cada fila se retira del lote en cuanto su amplitud supera umbral veces la
+    inicial o llega a tiempo_total. Retorna la tasa de crecimiento (1/s) y el
+    tiempo de explosión (inf si no diverge) de cada caso.
+    """
+    courants = np.asarray(courants, dtype=float)
+    K = len(courants)
+    Nx = int(L/dx) + 1
+    x = np.linspace(0, L, Nx)
+    dts = courants * dx / c
+    Nts = (tiempo_total / dts).astype(int) + 1
+    
+    y0 = pulso_triangular(x, L)
+    A0 = np.max(np.abs(y0))
+    niveles = np.empty((3, K, Nx))
+    niveles[0] = y0
+    niveles[1] = y0
+    
+    # Envolvente de la amplitud max|y| de cada caso
+    envolvente = np.full((K, Nts.max()), A0)
+    paso_final = np.maximum(Nts - 1, 1)
+    explosion = np.full(K, np.inf)
+    
+    casos = np.arange(K)
+    sigma2 = courants[:, np.newaxis]**2
+    lap = np.empty((K, Nx))
+    trabajo = np.empty((K, Nx))
+    
+    for j in range(1, Nts.max() - 1):
+        y_ant, y_act, y_sig = niveles[(j-1) % 3], niveles[j % 3], niveles[(j+1) % 3]
+        # Segunda diferencia sin escalar a lo largo de x, (c*Δt/Δx)² por fila
+        derivada(y_act, 1.0, eje=1, n=2, frontera='dirichlet', out=lap, trabajo=trabajo)
+        lap *= sigma2
+        np.subtract(y_act, y_ant, out=y_sig)
+        y_sig += y_act
+        y_sig += lap
         
-        y_test[:, 1] = y_test[:, 0]
-        r_test = (c * dt / dx)**2
+        amplitud = np.max(np.abs(y_sig), axis=1)
+        envolvente[casos, j+1] = np.maximum(envolvente[casos, j], amplitud)
         
-        # Pocas iteraciones
-        for j in range(1, min(50, Nt_test-1)):
-            for i in range(1, Nx_test-1):
-                y_test[i, j+1] = 2*y_test[i, j] - y_test[i, j-1] + r_test*(y_test[i+1, j] + y_test[i-1, j] - 2*y_test[i, j])
+        divergidos = amplitud > umbral * A0
+        terminados = divergidos | (j + 1 >= Nts[casos] - 1)
+        if not np.any(terminados):
+            continue
         
-        max_val = np.max(np.abs(y_test))
-        estable = max_val < 10
+        explosion[casos[divergidos]] = (j + 1) * dts[casos[divergidos]]
+        paso_final[casos[terminados]] = j + 1
         
-        estado = "ESTABLE" if estable else "INESTABLE"
-        print(f"dx={dx:.3f}, dt={dt:.4f}, c*Δt/Δx={courant:.1f} - {estado}")
+        # Se compacta el lote (una copia por cada caso que termina)
+        seguir = ~terminados
+        casos = casos[seguir]
+        if len(casos) == 0:
+            break
+        niveles = niveles[:, seguir]
+        sigma2 = sigma2[seguir]
+        lap = lap[seguir]
+        trabajo = trabajo[seguir]
+    
+    # Tasa de crecimiento en la segunda mitad de cada corrida
+    mitad = paso_final // 2
+    crecimiento = np.log(envolvente[np.arange(K), paso_final] /
+                         envolvente[np.arange(K), mitad])
+    tasa = crecimiento / ((paso_final - mitad) * dts)
+    
+    return tasa, explosion
+
+def barrido_estabilidad(courants, dxs, tiempo_total=0.5, c=10.0, L=1.0, umbral=10.0,
+                        procesos=None):
+    """
+    Mapa de estabilidad del esquema de onda: número de Courant vs crecimiento
+    
+    Los casos con la misma resolución se avanzan como un solo lote vectorizado;
+    las resoluciones se reparten entre procesos si procesos > 1.
+    
+    Parámetros:
+    courants: números de Courant c*Δt/Δx a probar
+    dxs: resoluciones espaciales
+    tiempo_total: tiempo simulado por caso
+    c, L: velocidad de onda y longitud de la cuerda
+    umbral: un caso diverge cuando max|y| supera umbral veces la amplitud inicial
+    procesos: número de procesos (None o 1 = en serie)
+    
+    Retorna las tasas de crecimiento (1/s) y los tiempos de explosión (s), ambos
+    de forma (len(dxs), len(courants))
+    """
+    tarea = partial(_barrido_resolucion, courants=courants, tiempo_total=tiempo_total,
+                    c=c, L=L, umbral=umbral)
+    if procesos is None or procesos <= 1:
+        resultados = [tarea(dx) for dx in dxs]
+    else:
+        with ProcessPoolExecutor(max_workers=procesos) as ejecutor:
+            resultados = list(ejecutor.map(tarea, dxs))
+    
+    tasa = np.array([r[0] for r in resultados])
+    explosion = np.array([r[1] for r in resultados])
+    return tasa, explosion
+
+def graficar_mapa_estabilidad(courants, dxs, tasa, explosion, c=10.0):
+    """
+    Grafica la tasa de crecimiento y el tiempo de explosión contra el número de Courant
+    """
+    fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(14, 5))
+    
+    for k, dx in enumerate(dxs):
+        linea, = ax1.plot(courants, tasa[k], 'o-', label=f'Δx = {dx}')
+        # Predicción del análisis de von Neumann: ln|λ| / Δt
+        teorica = np.log(factor_amplificacion(courants)) * c / (np.asarray(courants) * dx)
+        ax1.plot(courants, teorica, '--', color=linea.get_color(), alpha=0.6)
         
-    except Exception as e:
-        print(f"dx={dx:.3f}, dt={dt:.4f} - ERROR: {e}")
+        finitos = np.isfinite(explosion[k])
+        ax2.semilogy(np.asarray(courants)[finitos], explosion[k][finitos], 'o-',
+                     label=f'Δx = {dx}')
+    
+    for ax in (ax1, ax2):
+        ax.axvline(1.0, color='k', linestyle=':', label='c*Δt/Δx = 1')
+        ax.set_xlabel('Número de Courant c*Δt/Δx')
+        ax.grid(True, alpha=0.3)
+        ax.legend()
+    ax1.set_ylabel('Tasa de crecimiento (1/s)')
+    ax1.set_title('Crecimiento de la amplitud (--: von Neumann)')
+    ax2.set_ylabel('Tiempo de explosión (s)')
+    ax2.set_title('Tiempo hasta superar el umbral')
+    
+    plt.tight_layout()
+    return fig
 
 # =============================================================================
-# GRÁFICO COMPARATIVO
+# SIMULACIÓN PRINCIPAL
 # =============================================================================
-plt.figure(figsize=(12, 8))
-
-# Evolución temporal en punto central
-punto_central1 = len(x1)//2
-punto_central2 = len(x2)//2
-
-plt.subplot(2, 2, 1)
-plt.plot(t1, y1[punto_central1, :], 'b-', linewidth=2)
-plt.title('Caso Estable - Evolución en x = L/2')
-plt.xlabel('Tiempo (s)')
-plt.ylabel('Desplazamiento (m)')
-plt.grid(True, alpha=0.3)
-
-plt.subplot(2, 2, 2)
-plt.plot(t2, y2[punto_central2, :], 'r-', linewidth=2)
-plt.title('Caso Inestable - Evolución en x = L/2')
-plt.xlabel('Tiempo (s)')
-plt.ylabel('Desplazamiento (m)')
-plt.grid(True, alpha=0.3)
-
-# Instantáneas
-plt.subplot(2, 2, 3)
-for i in range(0, len(t1), len(t1)//5):
-    plt.plot(x1, y1[:, i], alpha=0.7, label=f't={t1[i]:.2f}s')
-plt.title('Caso Estable - Instantáneas')
-plt.xlabel('Posición (m)')
-plt.ylabel('Desplazamiento (m)')
-plt.legend()
-plt.grid(True, alpha=0.3)
-
-plt.subplot(2, 2, 4)
-for i in range(0, min(len(t2), 5)):
-    plt.plot(x2, y2[:, i], alpha=0.7, label=f't={t2[i]:.2f}s')
-plt.title('Caso Inestable - Instantáneas')
-plt.xlabel('Posición (m)')
-plt.ylabel('Desplazamiento (m)')
-plt.legend()
-plt.grid(True, alpha=0.3)
-
-plt.tight_layout()
-plt.show()
+if __name__ == "__main__":
+    print("=== PROBLEMA 3: VIBRACIÓN DE CUERDA ===")
+    print(f"Velocidad de la onda: c = {c:.2f} m/s")
 
-# =============================================================================
-# VERIFICACIONES TEÓRICAS
-# =============================================================================
-print("\n--- VERIFICACIONES TEÓRICAS ---")
-print("(b) Condiciones para ecuación de onda estándar:")
-print("   - Tensión constante: dT/dx = 0")
-print("   - Densidad constante: ρ(x) = constante")
-print("   - Pequeñas oscilaciones: ∂y/∂x << 1")
+    # CASO 1: CONDICIÓN DE COURANT SATISFECHA
+    print("\n--- CASO 1: Condición de Courant SATISFECHA ---")
+    dx1 = 0.01
+    dt1 = 0.0008  # c*dt/dx = 10*0.0008/0.01 = 0.8 ≤ 1
+    tiempo_total1 = 0.5
+
+    x1, t1, y1 = resolver_cuerda_simple(dx1, dt1, tiempo_total1, c, L)
+    anim1 = crear_animacion_cuerda(x1, t1, y1, "Cuerda - Condición Courant Satisfecha")
+
+    # Exportación sin ventana: 5 s a 20 cuadros/s, dibujados en paralelo
+    inicio = time.perf_counter()
+    crear_animacion_cuerda(x1, t1, y1, "Cuerda - Condición Courant Satisfecha",
+                           archivo=os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                                'resultados_cuerda', 'animacion_estable.gif'),
+                           fps=20, duracion=5.0, procesos=4)
+    print(f"Exportación terminada en {time.perf_counter() - inicio:.1f} s")
+
+    # CASO 2: CONDICIÓN DE COURANT VIOLADA
+    print("\n--- CASO 2: Condición de Courant VIOLADA ---")
+    dx2 = 0.01
+    dt2 = 0.002   # c*dt/dx = 10*0.002/0.01 = 2.0 > 1
+    tiempo_total2 = 0.1  # Tiempo más corto para evitar divergencia
+
+    x2, t2, y2 = resolver_cuerda_simple(dx2, dt2, tiempo_total2, c, L)
+    anim2 = crear_animacion_cuerda(x2, t2, y2, "Cuerda - Condición Courant Violada")
+
+    # CASO 3: CORRIDA LARGA CON BÚFER CIRCULAR (sólo tres niveles en memoria)
+    print("\n--- CASO 3: Corrida larga con búfer circular ---")
+    tiempo_total3 = 20.0
+    x3, t3, y3, t_sonda, trazas = resolver_cuerda_leapfrog(
+        dx1, dt1, tiempo_total3, c, L, cada=500, sondas=[L/4, L/2])
+    n_pasos = len(t_sonda)
+    print(f"Pasos: {n_pasos}, instantáneas guardadas: {y3.shape[1]}")
+    print(f"Memoria: {(y3.nbytes + trazas.nbytes)/1e6:.2f} MB "
+          f"(historia completa: {len(x3)*n_pasos*8/1e6:.2f} MB)")
+    print(f"Diferencia con la historia completa en x = L/2 (t <= {tiempo_total1} s): "
+          f"{np.max(np.abs(trazas[1, :len(t1)] - y1[len(x1)//2, :])):.2e}")
+
+    # SOLUCIÓN EXACTA: referencia para el error y reproducción sin avanzar en el tiempo
+    print("\n--- SOLUCIÓN EXACTA (serie de senos y d'Alembert) ---")
+    sol = preparar_solucion_exacta(c=c, L=L)
+    y_exacta = evaluar_dalembert(sol, x1[:, np.newaxis], t1[np.newaxis, :])
+    print(f"Error del caso 1 respecto a d'Alembert: {np.max(np.abs(y1 - y_exacta)):.2e}")
+    print(f"Diferencia d'Alembert vs serie de senos: "
+          f"{np.max(np.abs(evaluar_modal(sol, x1[:, np.newaxis], t1[np.newaxis, :]) - y_exacta)):.2e}")
+    print(f"Error en x = L/2 de la corrida larga (t <= {tiempo_total3} s): "
+          f"{np.max(np.abs(trazas[1] - evaluar_dalembert(sol, L/2, t_sonda))):.2e}")
+    anim3 = crear_animacion_cuerda(x1, t1, lambda x, t: evaluar_dalembert(sol, x, t),
+                                   "Cuerda - Solución exacta")
+
+    # =============================================================================
+    # INCISO (j): ANÁLISIS DE ESTABILIDAD
+    # =============================================================================
+    print("\n--- ANÁLISIS DE ESTABILIDAD ---")
+
+    # Todas las combinaciones de un número de Courant y una resolución; los
+    # casos de una misma resolución se avanzan juntos y se detienen al diverger
+    courants = np.round(np.linspace(0.5, 2.0, 16), 2)
+    dxs = [0.02, 0.01, 0.005]
+    tasa, explosion = barrido_estabilidad(courants, dxs, tiempo_total=0.5, c=c, L=L,
+                                          procesos=len(dxs))
+
+    condiciones = [
+        (0.02, 0.001, 0.5, "Muy estable"),
+        (0.01, 0.0005, 0.5, "Estable"),
+        (0.01, 0.001, 1.0, "Límite"),
+        (0.01, 0.002, 2.0, "Inestable"),
+        (0.005, 0.001, 2.0, "Muy inestable")
+    ]
+
+    print("Resultados de estabilidad:")
+    for dx, dt, courant, desc in condiciones:
+        k, m = dxs.index(dx), int(np.argmin(np.abs(courants - courant)))
+        estado = "ESTABLE" if np.isinf(explosion[k, m]) else "INESTABLE"
+        detalle = (f"tasa = {tasa[k, m]:8.1f} 1/s" if np.isinf(explosion[k, m]) else
+                   f"tasa = {tasa[k, m]:8.1f} 1/s, explota en t = {explosion[k, m]:.4f} s")
+        print(f"dx={dx:.3f}, dt={dt:.4f}, c*Δt/Δx={courant:.1f} - {estado} ({detalle})")
+
+    for k, dx in enumerate(dxs):
+        estables = courants[np.isinf(explosion[k])]
+        print(f"dx={dx:.3f}: mayor número de Courant estable = {estables.max():.2f}")
+
+    graficar_mapa_estabilidad(courants, dxs, tasa, explosion, c=c)
+    plt.show()
+
+    # =============================================================================
+    # GRÁFICO COMPARATIVO
+    # =============================================================================
+    plt.figure(figsize=(12, 8))
+
+    # Evolución temporal en punto central
+    punto_central1 = len(x1)//2
+    punto_central2 = len(x2)//2
+
+    plt.subplot(2, 2, 1)
+    plt.plot(t1, y1[punto_central1, :], 'b-', linewidth=2)
+    plt.title('Caso Estable - Evolución en x = L/2')
+    plt.xlabel('Tiempo (s)')
+    plt.ylabel('Desplazamiento (m)')
+    plt.grid(True, alpha=0.3)
+
+    plt.subplot(2, 2, 2)
+    plt.plot(t2, y2[punto_central2, :], 'r-', linewidth=2)
+    plt.title('Caso Inestable - Evolución en x = L/2')
+    plt.xlabel('Tiempo (s)')
+    plt.ylabel('Desplazamiento (m)')
+    plt.grid(True, alpha=0.3)
+
+    # Instantáneas
+    plt.subplot(2, 2, 3)
+    for i in range(0, len(t1), len(t1)//5):
+        plt.plot(x1, y1[:, i], alpha=0.7, label=f't={t1[i]:.2f}s')
+    plt.title('Caso Estable - Instantáneas')
+    plt.xlabel('Posición (m)')
+    plt.ylabel('Desplazamiento (m)')
+    plt.legend()
+    plt.grid(True, alpha=0.3)
+
+    plt.subplot(2, 2, 4)
+    for i in range(0, min(len(t2), 5)):
+        plt.plot(x2, y2[:, i], alpha=0.7, label=f't={t2[i]:.2f}s')
+    plt.title('Caso Inestable - Instantáneas')
+    plt.xlabel('Posición (m)')
+    plt.ylabel('Desplazamiento (m)')
+    plt.legend()
+    plt.grid(True, alpha=0.3)
+
+    plt.tight_layout()
+    plt.show()
+
+    # =============================================================================
+    # VERIFICACIONES TEÓRICAS
+    # =============================================================================
+    print("\n--- VERIFICACIONES TEÓRICAS ---")
+    print("(b) Condiciones para ecuación de onda estándar:")
+    print("   - Tensión constante: dT/dx = 0")
+    print("   - Densidad constante: ρ(x) = constante")
+    print("   - Pequeñas oscilaciones: ∂y/∂x << 1")
 
-print("\n(c) Condiciones para solución única:")
-print("   - Condiciones de frontera: y(0,t) = 0, y(L,t) = 0")
-print("   - Condiciones iniciales: y(x,0) = f(x), ∂y/∂t(x,0) = g(x)")
+    print("\n(c) Condiciones para solución única:")
+    print("   - Condiciones de frontera: y(0,t) = 0, y(L,t) = 0")
+    print("   - Condiciones iniciales: y(x,0) = f(x), ∂y/∂t(x,0) = g(x)")
 
-print(f"\nFrecuencia fundamental teórica: f₁ = c/(2L) = {c/(2*L):.3f} Hz")
+    print(f"\nFrecuencia fundamental teórica: f₁ = c/(2L) = {c/(2*L):.3f} Hz")
 
-print("\n=== SIMULACIÓN COMPLETADA ===")
\ No newline at end of file
+    print("\n=== SIMULACIÓN COMPLETADA ===")
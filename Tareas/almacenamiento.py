@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Escritura por bloques en disco de series de tiempo de EDPs y lectura perezosa
+
+Los resolvedores envían cada instantánea a un EscritorSerie, que las agrupa
+en bloques y las escribe como archivos .npy, .npz (opcionalmente comprimidos)
+o en un archivo HDF5 por bloques (si h5py está instalado). Sólo un bloque
+vive en memoria a la vez, así que corridas largas no agotan la RAM.
+
+LectorSerie abre la serie sin cargarla: los bloques .npy se leen con
+np.memmap y sólo se tocan los bloques que cubren la ventana pedida.
+
+Estructura en disco (un directorio por corrida):
+- indice.json: forma, tipo de dato, formato y lista de bloques con sus tiempos
+- bloque_00000.npy / .npz, ... o serie.h5
+"""
+
+import json
+import os
+
+import numpy as np
+
+try:
+    import h5py
+except ImportError:
+    h5py = None
+
+FORMATOS = ('npy', 'npz', 'hdf5')
+
+
+class EscritorSerie:
+    """
+    Recibe instantáneas (t, datos) y las escribe en disco por bloques
+
+    Parámetros:
+    ruta: directorio de la serie (se crea si no existe)
+    forma: forma de cada instantánea
+    formato: 'npy' (lectura con memmap), 'npz' o 'hdf5'
+    compresion: compresión sin pérdida ('npz' con zlib, 'hdf5' con gzip)
+    float32: guardar en precisión simple para reducir el tamaño a la mitad
+    tamano_bloque: número de instantáneas por bloque
+
+    Se usa como administrador de contexto:
+
+        with EscritorSerie('corrida', (Nx,)) as salida:
+            salida.agregar(t, T)
+    """
+
+    def __init__(self, ruta, forma, formato='npy', compresion=False, float32=False,
+                 tamano_bloque=64):
+        if formato not in FORMATOS:
+            raise ValueError(f"Formato desconocido: {formato}")
+        if formato == 'hdf5' and h5py is None:
+            raise ImportError("El formato 'hdf5' requiere el paquete h5py")
+        if formato == 'npy' and compresion:
+            raise ValueError("El formato 'npy' no admite compresión; use 'npz' o 'hdf5'")
+
+        self.ruta = ruta
+        self.forma = tuple(forma)
+        self.formato = formato
+        self.compresion = compresion
+        self.dtype = np.dtype(np.float32 if float32 else np.float64)
+        self.tamano_bloque = tamano_bloque
+
+        self._buffer = np.empty((tamano_bloque,) + self.forma, dtype=self.dtype)
+        self._tiempos = np.empty(tamano_bloque)
+        self._n = 0
+        self._bloques = []
+        self._archivo_h5 = None
+
+        os.makedirs(ruta, exist_ok=True)
+        if formato == 'hdf5':
+            self._archivo_h5 = h5py.File(os.path.join(ruta, 'serie.h5'), 'w')
+            opciones = {'compression': 'gzip'} if compresion else {}
+            self._archivo_h5.create_dataset(
+                'datos', shape=(0,) + self.forma, maxshape=(None,) + self.forma,
+                chunks=(tamano_bloque,) + self.forma, dtype=self.dtype, **opciones)
+            self._archivo_h5.create_dataset('tiempos', shape=(0,), maxshape=(None,),
+                                            dtype=float)
+
+    def agregar(self, t, datos):
+        """
+        Agrega una instantánea; el bloque se escribe al llenarse
+        """
+        self._buffer[self._n] = datos
+        self._tiempos[self._n] = t
+        self._n += 1
+        if self._n == self.tamano_bloque:
+            self.vaciar()
+
+    def vaciar(self):
+        """
+        Escribe en disco las instantáneas pendientes y actualiza el índice
+        """
+        if self._n == 0:
+            return
+        datos = self._buffer[:self._n]
+        tiempos = self._tiempos[:self._n].tolist()
+
+        if self.formato == 'hdf5':
+            inicio = self._archivo_h5['datos'].shape[0]
+            for nombre, valores in (('datos', datos), ('tiempos', tiempos)):
+                self._archivo_h5[nombre].resize(inicio + self._n, axis=0)
+                self._archivo_h5[nombre][inicio:] = valores
+            self._archivo_h5.flush()
+            archivo = 'serie.h5'
+        else:
+            archivo = f'bloque_{len(self._bloques):05d}.{self.formato}'
+            destino = os.path.join(self.ruta, archivo)
+            if self.formato == 'npy':
+                np.save(destino, datos)
+            elif self.compresion:
+                np.savez_compressed(destino, datos=datos)
+            else:
+                np.savez(destino, datos=datos)
+
+        self._bloques.append({'archivo': archivo, 'tiempos': tiempos})
+        self._n = 0
+        self._escribir_indice()
+
+    def _escribir_indice(self):
+        indice = {
+            'forma': list(self.forma),
+            'dtype': self.dtype.str,
+            'formato': self.formato,
+            'bloques': self._bloques,
+        }
+        temporal = os.path.join(self.ruta, 'indice.json.tmp')
+        with open(temporal, 'w') as f:
+            json.dump(indice, f)
+        os.replace(temporal, os.path.join(self.ruta, 'indice.json'))
+
+    def cerrar(self):
+        """
+        Escribe el último bloque y cierra los archivos
+        """
+        self.vaciar()
+        if self._archivo_h5 is not None:
+            self._archivo_h5.close()
+            self._archivo_h5 = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.cerrar()
+
+
+class LectorSerie:
+    """
+    Lectura perezosa de una serie escrita por EscritorSerie
+
+    serie[k] o serie[i:j] devuelve instantáneas con el tiempo en el primer eje;
+    serie.ventana(t0, t1) devuelve (t, datos) con el tiempo en el último eje,
+    la misma convención que los resolvedores (por ejemplo T[:, j] en calor.py).
+    """
+
+    def __init__(self, ruta):
+        self.ruta = ruta
+        with open(os.path.join(ruta, 'indice.json')) as f:
+            indice = json.load(f)
+
+        self.forma = tuple(indice['forma'])
+        self.dtype = np.dtype(indice['dtype'])
+        self.formato = indice['formato']
+        self._bloques = indice['bloques']
+
+        tamanos = [len(b['tiempos']) for b in self._bloques]
+        self._inicios = np.concatenate([[0], np.cumsum(tamanos)]).astype(int)
+        self.tiempos = np.array([t for b in self._bloques for t in b['tiempos']])
+
+        self._cache = {}
+        self._archivo_h5 = None
+        if self.formato == 'hdf5':
+            if h5py is None:
+                raise ImportError("El formato 'hdf5' requiere el paquete h5py")
+            self._archivo_h5 = h5py.File(os.path.join(ruta, 'serie.h5'), 'r')
+
+    def __len__(self):
+        return len(self.tiempos)
+
+    def _bloque(self, b):
+        """
+        Arreglo del bloque b: memmap para .npy; los .npz se cargan (el último queda en caché)
+        """
+        if b not in self._cache:
+            destino = os.path.join(self.ruta, self._bloques[b]['archivo'])
+            if self.formato == 'npy':
+                self._cache[b] = np.load(destino, mmap_mode='r')
+            else:
+                with np.load(destino) as archivo:
+                    self._cache = {b: archivo['datos']}
+        return self._cache[b]
+
+    def __getitem__(self, indices):
+        indices_arr = np.arange(len(self))[indices]
+        if self.formato == 'hdf5':
+            return self._archivo_h5['datos'][indices]
+
+        escalar = np.ndim(indices_arr) == 0
+        indices_arr = np.atleast_1d(indices_arr)
+        salida = np.empty((len(indices_arr),) + self.forma, dtype=self.dtype)
+
+        bloques = np.searchsorted(self._inicios, indices_arr, side='right') - 1
+        for b in np.unique(bloques):
+            seleccion = bloques == b
+            salida[seleccion] = self._bloque(b)[indices_arr[seleccion] - self._inicios[b]]
+
+        return salida[0] if escalar else salida
+
+    def ventana(self, t_inicio=None, t_fin=None, cada=1):
+        """
+        Instantáneas con t_inicio <= t <= t_fin, tomando una de cada 'cada'
+
+        Retorna los tiempos y un arreglo de forma self.forma + (n,)
+        """
+        seleccion = np.ones(len(self), dtype=bool)
+        if t_inicio is not None:
+            seleccion &= self.tiempos >= t_inicio
+        if t_fin is not None:
+            seleccion &= self.tiempos <= t_fin
+        indices = np.flatnonzero(seleccion)[::cada]
+
+        return self.tiempos[indices], np.moveaxis(self[indices], 0, -1)
+
+    def cerrar(self):
+        if self._archivo_h5 is not None:
+            self._archivo_h5.close()
+            self._archivo_h5 = None
+        self._cache = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.cerrar()
@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Exportación de animaciones sin ventana (lienzo Agg)
+
+Los cuadros se dibujan fuera de pantalla sobre una sola figura cuyos artistas
+se actualizan en sitio, se leen del lienzo sin copiar (buffer_rgba) y se
+envían en orden a un escritor:
+- 'ffmpeg' (cualquier formato, incluido GIF): los cuadros pasan por una
+  tubería al proceso de ffmpeg y no se acumulan en memoria
+- 'pillow' (sólo GIF): cada cuadro se reduce a una paleta de 256 colores al
+  llegar (1 byte por píxel) y el archivo se escribe al cerrar, porque el
+  codificador GIF de Pillow necesita todos los cuadros
+
+Con procesos > 1 los cuadros se reparten en bloques que se dibujan en
+paralelo, cada proceso con su propia figura, y se escriben en orden.
+"""
+
+import shutil
+import subprocess
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import matplotlib
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+from PIL import Image
+
+
+def figura_agg(figsize, dpi=100):
+    """
+    Figura con lienzo Agg, independiente de pyplot (no abre ventanas)
+    """
+    fig = Figure(figsize=figsize, dpi=dpi)
+    FigureCanvasAgg(fig)
+    return fig
+
+
+def indices_decimados(n_cuadros, fps=20, duracion=None):
+    """
+    Índices de los cuadros a dibujar, repartidos uniformemente
+
+    Parámetros:
+    n_cuadros: cuadros disponibles (por ejemplo pasos de tiempo)
+    fps: cuadros por segundo del archivo
+    duracion: duración del video en segundos (None = todos los cuadros)
+    """
+    if duracion is None:
+        return np.arange(n_cuadros)
+    n = max(1, min(n_cuadros, int(round(fps * duracion))))
+    return np.unique(np.rint(np.linspace(0, n_cuadros - 1, n)).astype(int))
+
+
+def renderizar_cuadros(fig, actualizar, cuadros):
+    """
+    Genera los cuadros como arreglos RGBA (alto, ancho, 4) de uint8
+
+    actualizar(i) modifica los artistas de fig para el cuadro i. Si los retorna
+    (como en FuncAnimation con blit=True), el fondo estático se dibuja una sola
+    vez y en cada cuadro sólo se redibujan esos artistas; si no, se redibuja la
+    figura completa.
+
+    Cada arreglo es una vista del búfer del lienzo (sin copia) que se
+    sobrescribe al dibujar el siguiente cuadro: hay que consumirlo o copiarlo
+    antes de avanzar.
+    """
+    lienzo = fig.canvas if isinstance(fig.canvas, FigureCanvasAgg) else FigureCanvasAgg(fig)
+    fondo = None
+    for k, i in enumerate(cuadros):
+        artistas = actualizar(i)
+        if k == 0 and artistas:
+            for artista in artistas:
+                artista.set_animated(True)
+            lienzo.draw()
+            fondo = lienzo.copy_from_bbox(fig.bbox)
+
+        if fondo is None:
+            lienzo.draw()
+        else:
+            lienzo.restore_region(fondo)
+            for artista in artistas:
+                fig.draw_artist(artista)
+        yield np.asarray(lienzo.buffer_rgba())
+
+
+class EscritorPillow:
+    """
+    Escritor de GIF con Pillow; guarda los cuadros reducidos a paleta hasta cerrar
+    """
+
+    def __init__(self, archivo, fps):
+        self.archivo = archivo
+        self.duracion = 1000.0 / fps
+        self.cuadros = []
+
+    def agregar(self, cuadro):
+        imagen = Image.fromarray(np.ascontiguousarray(cuadro[..., :3]))
+        self.cuadros.append(imagen.quantize(256, method=Image.Quantize.FASTOCTREE))
+
+    def cerrar(self):
+        if not self.cuadros:
+            return
+        primero, *resto = self.cuadros
+        primero.save(self.archivo, save_all=True, append_images=resto,
+                     duration=self.duracion, loop=0)
+        self.cuadros = []
+
+
+class EscritorFFmpeg:
+    """
+    Escritor que envía los cuadros crudos a ffmpeg por una tubería
+    """
+
+    def __init__(self, archivo, fps):
+        self.archivo = archivo
+        self.fps = fps
+        self._proceso = None
+
+    def _iniciar(self, cuadro):
+        alto, ancho, canales = cuadro.shape
+        comando = [matplotlib.rcParams['animation.ffmpeg_path'], '-y',
+                   '-loglevel', 'error', '-f', 'rawvideo',
+                   '-pix_fmt', 'rgba' if canales == 4 else 'rgb24',
+                   '-s', f'{ancho}x{alto}', '-r', str(self.fps), '-i', '-']
+        if not self.archivo.lower().endswith('.gif'):
+            # H.264 y similares requieren dimensiones pares y yuv420p
+            comando += ['-vf', 'pad=ceil(iw/2)*2:ceil(ih/2)*2', '-pix_fmt', 'yuv420p']
+        self._proceso = subprocess.Popen(comando + [self.archivo], stdin=subprocess.PIPE)
+
+    def agregar(self, cuadro):
+        if self._proceso is None:
+            self._iniciar(cuadro)
+        self._proceso.stdin.write(np.ascontiguousarray(cuadro).data)
+
+    def cerrar(self):
+        if self._proceso is None:
+            return
+        self._proceso.stdin.close()
+        if self._proceso.wait() != 0:
+            raise RuntimeError(f"ffmpeg terminó con código {self._proceso.returncode}")
+        self._proceso = None
+
+
+def crear_escritor(archivo, fps, escritor=None):
+    """
+    Escritor para el archivo: 'ffmpeg', 'pillow' o None (ffmpeg si está instalado)
+    """
+    if escritor is None:
+        hay_ffmpeg = shutil.which(matplotlib.rcParams['animation.ffmpeg_path'])
+        escritor = 'ffmpeg' if hay_ffmpeg else 'pillow'
+    if escritor == 'ffmpeg':
+        return EscritorFFmpeg(archivo, fps)
+    if escritor == 'pillow':
+        if not archivo.lower().endswith('.gif'):
+            raise ValueError("El escritor 'pillow' sólo produce GIF; instale ffmpeg")
+        return EscritorPillow(archivo, fps)
+    raise ValueError(f"Escritor desconocido: {escritor}")
+
+
+def _renderizar_bloque(fabrica, cuadros):
+    """
+    Dibuja un bloque de cuadros en un proceso auxiliar (copias RGB)
+    """
+    fig, actualizar = fabrica()
+    return [cuadro[..., :3].copy() for cuadro in renderizar_cuadros(fig, actualizar, cuadros)]
+
+
+def exportar_animacion(fabrica, cuadros, archivo, fps=20, escritor=None, procesos=None,
+                       cuadros_por_bloque=25):
+    """
+    Dibuja los cuadros sin ventana y los escribe en un GIF o video
+
+    Parámetros:
+    fabrica: función sin argumentos que crea (fig, actualizar); con procesos > 1
+             debe poder enviarse a otro proceso (una función de módulo o un
+             functools.partial de una, no una lambda)
+    cuadros: índices que se pasan a actualizar, en orden
+    archivo: archivo de salida (.gif, .mp4, ...)
+    fps: cuadros por segundo
+    escritor: 'ffmpeg', 'pillow' o None (automático)
+    procesos: procesos que dibujan en paralelo (None o 1 = en serie)
+    cuadros_por_bloque: cuadros por tarea en paralelo
+
+    Retorna el nombre del archivo
+    """
+    cuadros = list(cuadros)
+    salida = crear_escritor(archivo, fps, escritor)
+    try:
+        if procesos is None or procesos <= 1:
+            fig, actualizar = fabrica()
+            for cuadro in renderizar_cuadros(fig, actualizar, cuadros):
+                salida.agregar(cuadro)
+        else:
+            bloques = [cuadros[i:i + cuadros_por_bloque]
+                       for i in range(0, len(cuadros), cuadros_por_bloque)]
+            # A lo sumo 2*procesos bloques pendientes, para acotar la memoria
+            with ProcessPoolExecutor(max_workers=procesos) as ejecutor:
+                pendientes = deque()
+                for bloque in bloques:
+                    pendientes.append(ejecutor.submit(_renderizar_bloque, fabrica, bloque))
+                    if len(pendientes) >= 2 * procesos:
+                        for cuadro in pendientes.popleft().result():
+                            salida.agregar(cuadro)
+                while pendientes:
+                    for cuadro in pendientes.popleft().result():
+                        salida.agregar(cuadro)
+    finally:
+        salida.cerrar()
+
+    return archivo
@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Análisis espectral de trayectorias muestreadas en una malla uniforme de tiempo
+
+- espectro: espectro de amplitud con ventana (rfft); un seno de amplitud A
+  da un pico de altura A
+- picos_espectrales: picos más altos con interpolación parabólica del
+  logaritmo de la magnitud, que ubica la frecuencia dentro del bin (con
+  ventana de Hann el error es una fracción pequeña del ancho del bin)
+- frecuencias_dominantes / comparar_frecuencias: picos de la salida de
+  solve_ivp (o de cualquier resultado con t e y) y sus desplazamientos
+- EspectroWelch: densidad espectral promediada por segmentos que se
+  alimenta por bloques, para corridas que no caben en memoria
+- energias_modales: energía de cada modo normal a lo largo del tiempo
+
+Las frecuencias están en ciclos por unidad de tiempo (ω = 2π f).
+"""
+
+import numpy as np
+from scipy.signal import find_peaks, get_window
+
+
+def paso_uniforme(t, rtol=1e-6):
+    """
+    Paso de una malla de tiempo uniforme; ValueError si no lo es
+    """
+    t = np.asarray(t, dtype=float)
+    dt = (t[-1] - t[0]) / (len(t) - 1)
+    if not np.allclose(np.diff(t), dt, rtol=rtol, atol=0):
+        raise ValueError("El análisis espectral requiere tiempos equiespaciados (use t_eval)")
+    return dt
+
+
+def espectro(x, dt, ventana='hann', relleno=1):
+    """
+    Espectro de amplitud con ventana de señales reales muestreadas con paso dt
+
+    Parámetros:
+    x: señal o señales, con el tiempo en el último eje (como sol.y)
+    dt: paso de tiempo
+    ventana: ventana de scipy.signal.get_window
+    relleno: factor de relleno con ceros (interpola el espectro, no mejora la resolución)
+
+    Retorna las frecuencias y la amplitud (se resta antes la media de la señal)
+    """
+    x = np.asarray(x, dtype=float)
+    n = x.shape[-1]
+    w = get_window(ventana, n)
+    X = np.fft.rfft((x - x.mean(axis=-1, keepdims=True)) * w, n=relleno*n, axis=-1)
+    return np.fft.rfftfreq(relleno*n, dt), 2*np.abs(X) / np.sum(w)
+
+
+def picos_espectrales(f, A, n_picos=2, umbral=1e-3):
+    """
+    Los n_picos más altos de un espectro, interpolados con una parábola en log|A|
+
+    Parámetros:
+    f: frecuencias equiespaciadas
+    A: magnitud (1D)
+    n_picos: número de picos
+    umbral: altura mínima relativa al máximo
+
+    Retorna las frecuencias y alturas interpoladas, en orden de frecuencia
+    """
+    A = np.asarray(A, dtype=float)
+    indices, _ = find_peaks(A, height=umbral * np.max(A))
+    indices = np.sort(indices[np.argsort(A[indices])[::-1][:n_picos]])
+
+    izquierda, centro, derecha = (np.log(np.maximum(A[indices + d], np.finfo(float).tiny))
+                                  for d in (-1, 0, 1))
+    curvatura = izquierda - 2*centro + derecha
+    delta = 0.5 * (izquierda - derecha) / np.where(curvatura == 0, -1.0, curvatura)
+    frecuencias = f[indices] + delta * (f[1] - f[0])
+    alturas = np.exp(centro - 0.25 * (izquierda - derecha) * delta)
+    return frecuencias, alturas
+
+
+def frecuencias_dominantes(sol, componentes=None, n_picos=2, ventana='hann', relleno=4):
+    """
+    Frecuencias dominantes de una trayectoria (salida de solve_ivp o equivalente)
+
+    Las magnitudes de las componentes se suman, de modo que aparecen todos
+    los modos presentes aunque alguno no se vea en una masa.
+
+    Parámetros:
+    sol: resultado con t (equiespaciado) e y (forma (n_variables, len(t)))
+    componentes: filas de y a analizar (None = todas)
+    n_picos, ventana, relleno: como en picos_espectrales y espectro
+
+    Retorna las frecuencias y las alturas de los picos
+    """
+    dt = paso_uniforme(sol.t)
+    y = sol.y if componentes is None else sol.y[componentes]
+    f, A = espectro(np.atleast_2d(y), dt, ventana, relleno)
+    return picos_espectrales(f, A.sum(axis=0), n_picos)
+
+
+def comparar_picos(referencia, otra):
+    """
+    Desplazamiento de cada frecuencia de referencia respecto a la más cercana de otra
+
+    Retorna un diccionario con ambas frecuencias, el desplazamiento absoluto
+    y el relativo
+    """
+    referencia = np.asarray(referencia, dtype=float)
+    otra = np.asarray(otra, dtype=float)
+    cercanas = otra[np.argmin(np.abs(otra[np.newaxis, :] - referencia[:, np.newaxis]), axis=1)]
+    return {
+        'referencia': referencia,
+        'otra': cercanas,
+        'desplazamiento': cercanas - referencia,
+        'relativo': cercanas / referencia - 1,
+    }
+
+
+def comparar_frecuencias(sol_referencia, sol_otra, componentes=None, n_picos=2, **opciones):
+    """
+    Picos dominantes de dos trayectorias y sus desplazamientos (ver comparar_picos)
+    """
+    f_referencia, _ = frecuencias_dominantes(sol_referencia, componentes, n_picos, **opciones)
+    f_otra, _ = frecuencias_dominantes(sol_otra, componentes, n_picos, **opciones)
+    return comparar_picos(f_referencia, f_otra)
+
+
+class EspectroWelch:
+    """
+    Densidad espectral de potencia de Welch acumulada por bloques
+
+    Los bloques se cortan en segmentos con solapamiento, a cada uno se le
+    resta la media, se multiplica por la ventana y se acumula |rfft|². Entre
+    bloques sólo se guarda la cola que aún no completa un segmento, así que
+    la memoria no depende de la duración de la corrida. Con un solo bloque
+    coincide con scipy.signal.welch.
+
+    Parámetros:
+    dt: paso de tiempo
+    n_segmento: muestras por segmento (la resolución es 1/(n_segmento dt))
+    solapamiento: fracción de solapamiento entre segmentos
+    ventana: ventana de scipy.signal.get_window
+    """
+
+    def __init__(self, dt, n_segmento=4096, solapamiento=0.5, ventana='hann'):
+        self.dt = dt
+        self.n_segmento = n_segmento
+        self.salto = max(1, int(round(n_segmento * (1 - solapamiento))))
+        self.ventana = get_window(ventana, n_segmento)
+        self.segmentos = 0
+        self._suma = None
+        self._pendiente = None
+
+    def agregar(self, bloque):
+        """
+        Agrega muestras consecutivas (el tiempo en el último eje)
+        """
+        bloque = np.asarray(bloque, dtype=float)
+        datos = bloque if self._pendiente is None else np.concatenate(
+            [self._pendiente, bloque], axis=-1)
+
+        inicio = 0
+        while inicio + self.n_segmento <= datos.shape[-1]:
+            segmento = datos[..., inicio:inicio + self.n_segmento]
+            segmento = (segmento - segmento.mean(axis=-1, keepdims=True)) * self.ventana
+            potencia = np.abs(np.fft.rfft(segmento, axis=-1))**2
+            self._suma = potencia if self._suma is None else self._suma + potencia
+            self.segmentos += 1
+            inicio += self.salto
+        self._pendiente = datos[..., inicio:].copy()
+
+    def espectro(self):
+        """
+        Frecuencias y densidad espectral promedio (unilateral)
+        """
+        if self.segmentos == 0:
+            raise ValueError("Aún no hay muestras suficientes para un segmento")
+        densidad = self._suma / self.segmentos * (2 * self.dt / np.sum(self.ventana**2))
+        densidad[..., 0] /= 2
+        if self.n_segmento % 2 == 0:
+            densidad[..., -1] /= 2
+        return np.fft.rfftfreq(self.n_segmento, self.dt), densidad
+
+
+def energias_modales(y, modos):
+    """
+    Energía armónica de cada modo normal en cada instante
+
+    E_j = (q̇_j² + ω_j² q_j²)/2, con q = V M x las coordenadas modales. En un
+    sistema lineal cada E_j es constante; en uno no lineal muestra el
+    intercambio de energía entre modos.
+
+    Parámetros:
+    y: [x; v] con forma (2N, n_tiempos)
+    modos: diccionario con 'modos' (filas normalizadas con la masa),
+           'frecuencias' y 'masas', como el de calcular_modos_normales
+
+    Retorna un arreglo de forma (n_modos, n_tiempos)
+    """
+    y = np.asarray(y, dtype=float)
+    N = y.shape[0] // 2
+    V = modos['modos']
+    masas = np.asarray(modos['masas'], dtype=float)[:, np.newaxis]
+    q = V @ (masas * y[:N])
+    q_punto = V @ (masas * y[N:])
+    return 0.5 * (q_punto**2 + (modos['frecuencias']**2)[:, np.newaxis] * q**2)
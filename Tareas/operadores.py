@@ -0,0 +1,289 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Operadores diferenciales discretos (diferencias finitas) vectorizados
+
+Laplacianos y gradientes en 1D, 2D y 3D con condiciones de frontera
+periódicas, de Dirichlet o de Neumann y precisión de orden 2 o 4. Todas las
+funciones aceptan arreglos out= (y trabajo= para los coeficientes distintos
+de ±1 y ±2), de modo que un ciclo temporal que los reutiliza no reserva
+memoria; el Laplaciano de orden 2 no necesita trabajo=.
+
+Convenciones de frontera a lo largo de cada eje con n puntos:
+- 'periodica': el punto n-1 es vecino del punto 0
+- 'dirichlet': los valores de los extremos son fijos; la segunda derivada vale
+  cero en ellos y cerca de ellos se usan estenciles descentrados
+- 'neumann': derivada normal nula, por reflexión par respecto a los extremos
+"""
+
+import time
+
+import numpy as np
+
+# Estenciles centrados: (derivada, orden) -> (pares (desplazamiento, coeficiente), divisor)
+_CENTRADOS = {
+    (1, 2): ([(-1, -1.0), (1, 1.0)], 2.0),
+    (1, 4): ([(-2, 1.0), (-1, -8.0), (1, 8.0), (2, -1.0)], 12.0),
+    (2, 2): ([(-1, 1.0), (0, -2.0), (1, 1.0)], 1.0),
+    (2, 4): ([(-2, -1.0), (-1, 16.0), (0, -30.0), (1, 16.0), (2, -1.0)], 12.0),
+}
+
+# Estenciles descentrados para Dirichlet en el extremo izquierdo: índice -> pares
+# (índice absoluto, coeficiente), con el mismo divisor que el estencil centrado
+_DESCENTRADOS = {
+    (1, 2): {0: [(0, -3.0), (1, 4.0), (2, -1.0)]},
+    (1, 4): {0: [(0, -25.0), (1, 48.0), (2, -36.0), (3, 16.0), (4, -3.0)],
+             1: [(0, -3.0), (1, -10.0), (2, 18.0), (3, -6.0), (4, 1.0)]},
+    (2, 2): {0: []},
+    (2, 4): {0: [],
+             1: [(0, 10.0), (1, -15.0), (2, -4.0), (3, 14.0), (4, -6.0), (5, 1.0)]},
+}
+
+FRONTERAS = ('periodica', 'dirichlet', 'neumann')
+
+
+def _corte(ndim, eje, s):
+    """
+    Tupla de índices que aplica s en el eje dado y toma todo en los demás
+    """
+    return (slice(None),) * eje + (s,) + (slice(None),) * (ndim - eje - 1)
+
+
+def _por_eje(valor, ndim):
+    """
+    Convierte un valor escalar (o cadena) en una tupla con un valor por eje
+    """
+    if isinstance(valor, str) or np.ndim(valor) == 0:
+        return (valor,) * ndim
+    if len(valor) != ndim:
+        raise ValueError(f"Se esperaban {ndim} valores, se recibieron {len(valor)}")
+    return tuple(valor)
+
+
+def _estencil_borde(i, n, derivada, orden, frontera):
+    """
+    Pares (índice absoluto, coeficiente) del estencil para el punto de borde i
+    """
+    pares, _ = _CENTRADOS[(derivada, orden)]
+
+    if frontera == 'periodica':
+        return [((i + d) % n, c) for d, c in pares]
+
+    if frontera == 'neumann':
+        resultado = []
+        for d, c in pares:
+            j = i + d
+            if j < 0:
+                j = -j
+            elif j > n - 1:
+                j = 2*(n - 1) - j
+            resultado.append((j, c))
+        return resultado
+
+    # Dirichlet: estencil descentrado, reflejado en el extremo derecho
+    if i < n // 2:
+        return list(_DESCENTRADOS[(derivada, orden)][i])
+    signo = -1.0 if derivada % 2 else 1.0
+    return [(n - 1 - j, signo*c) for j, c in _DESCENTRADOS[(derivada, orden)][n - 1 - i]]
+
+
+def _sumar(destino, fuente, coef, trabajo):
+    """
+    destino += coef * fuente, en sitio; usa trabajo sólo si coef no es ±1 o ±2
+    """
+    if coef in (1.0, 2.0):
+        for _ in range(int(coef)):
+            destino += fuente
+    elif coef in (-1.0, -2.0):
+        for _ in range(int(-coef)):
+            destino -= fuente
+    else:
+        np.multiply(fuente, coef, out=trabajo)
+        destino += trabajo
+
+
+def _acumular_diferencia(u, eje, derivada, orden, frontera, out, trabajo):
+    """
+    Suma a out la diferencia finita de u a lo largo de eje, sin dividir entre h
+
+    El resultado acumulado debe dividirse entre divisor * h**derivada.
+    """
+    pares, divisor = _CENTRADOS[(derivada, orden)]
+    n = u.shape[eje]
+    r = max(abs(d) for d, _ in pares)
+    minimo = 6 if (frontera == 'dirichlet' and orden == 4) else 2*r + 1
+    if n < minimo:
+        raise ValueError(f"Se necesitan al menos {minimo} puntos en el eje {eje}")
+
+    # Puntos interiores: vistas desplazadas del arreglo completo
+    interior = _corte(u.ndim, eje, slice(r, n - r))
+    t = None if trabajo is None else trabajo[interior]
+    for d, c in pares:
+        _sumar(out[interior], u[_corte(u.ndim, eje, slice(r + d, n - r + d))], c, t)
+
+    # Puntos de borde: una hiper-rebanada (de grosor uno, para que sea vista) por punto
+    for i in list(range(r)) + list(range(n - r, n)):
+        k = _corte(u.ndim, eje, slice(i, i + 1))
+        t = None if trabajo is None else trabajo[k]
+        for j, c in _estencil_borde(i, n, derivada, orden, frontera):
+            _sumar(out[k], u[_corte(u.ndim, eje, slice(j, j + 1))], c, t)
+
+    return divisor
+
+
+def derivada(u, h, eje=0, n=1, orden=2, frontera='periodica', out=None, trabajo=None):
+    """
+    Primera (n=1) o segunda (n=2) derivada de u a lo largo de un eje
+
+    Parámetros:
+    u: arreglo de 1, 2 o 3 dimensiones
+    h: espaciamiento de la malla en ese eje
+    eje: eje de derivación
+    n: orden de la derivada (1 o 2)
+    orden: orden de precisión (2 o 4)
+    frontera: 'periodica', 'dirichlet' o 'neumann'
+    out: arreglo de salida con la forma de u (opcional)
+    trabajo: arreglo auxiliar con la forma de u (opcional)
+    """
+    if (n, orden) not in _CENTRADOS:
+        raise ValueError(f"Combinación no soportada: derivada {n}, orden {orden}")
+    if frontera not in FRONTERAS:
+        raise ValueError(f"Frontera desconocida: {frontera}")
+
+    if out is None:
+        out = np.empty_like(u, dtype=float)
+    if trabajo is None:
+        trabajo = np.empty_like(out)
+
+    out[...] = 0.0
+    divisor = _acumular_diferencia(u, eje, n, orden, frontera, out, trabajo)
+    out *= 1.0 / (divisor * h**n)
+
+    return out
+
+
+def laplaciano(u, h, frontera='periodica', orden=2, out=None, trabajo=None):
+    """
+    Laplaciano discreto de u en 1, 2 o 3 dimensiones
+
+    Parámetros:
+    u: arreglo de 1, 2 o 3 dimensiones
+    h: espaciamiento (escalar o uno por eje)
+    frontera: 'periodica', 'dirichlet' o 'neumann' (o una por eje)
+    orden: orden de precisión (2 o 4)
+    out: arreglo de salida con la forma de u (opcional)
+    trabajo: arreglo auxiliar con la forma de u, usado sólo en orden 4 (opcional)
+
+    En los ejes con frontera de Dirichlet el resultado vale cero en los
+    extremos, de modo que u + dt*laplaciano(u) conserva los valores de frontera.
+    """
+    hs = _por_eje(h, u.ndim)
+    fronteras = _por_eje(frontera, u.ndim)
+    for f in fronteras:
+        if f not in FRONTERAS:
+            raise ValueError(f"Frontera desconocida: {f}")
+
+    if out is None:
+        out = np.empty_like(u, dtype=float)
+    if trabajo is None and orden != 2:
+        trabajo = np.empty_like(out)
+
+    # out acumula sum_k D_k * escala / escala_k; la escala común se cambia
+    # en sitio al pasar de un eje al siguiente, sin arreglos temporales
+    out[...] = 0.0
+    escala = None
+    for eje in range(u.ndim):
+        escala_eje = _CENTRADOS[(2, orden)][1] * hs[eje]**2
+        if escala is not None and escala_eje != escala:
+            out *= escala_eje / escala
+        escala = escala_eje
+        _acumular_diferencia(u, eje, 2, orden, fronteras[eje], out, trabajo)
+    out *= 1.0 / escala
+
+    for eje in range(u.ndim):
+        if fronteras[eje] == 'dirichlet':
+            out[_corte(u.ndim, eje, 0)] = 0.0
+            out[_corte(u.ndim, eje, -1)] = 0.0
+
+    return out
+
+
+def gradiente(u, h, frontera='periodica', orden=2, out=None, trabajo=None):
+    """
+    Gradiente discreto de u en 1, 2 o 3 dimensiones
+
+    Parámetros:
+    u: arreglo de 1, 2 o 3 dimensiones
+    h: espaciamiento (escalar o uno por eje)
+    frontera: 'periodica', 'dirichlet' (estenciles descentrados) o 'neumann'
+              (o una por eje)
+    orden: orden de precisión (2 o 4)
+    out: arreglo de salida de forma (u.ndim,) + u.shape (opcional)
+    trabajo: arreglo auxiliar con la forma de u (opcional)
+
+    Retorna un arreglo con una componente por eje: out[k] = ∂u/∂x_k
+    """
+    hs = _por_eje(h, u.ndim)
+    fronteras = _por_eje(frontera, u.ndim)
+
+    if out is None:
+        out = np.empty((u.ndim,) + u.shape)
+    if trabajo is None:
+        trabajo = np.empty(u.shape)
+
+    for eje in range(u.ndim):
+        derivada(u, hs[eje], eje, 1, orden, fronteras[eje], out=out[eje],
+                 trabajo=trabajo)
+
+    return out
+
+
+def _laplaciano_ciclos(u, h):
+    """
+    Laplaciano periódico de 5 puntos con ciclos de Python (referencia)
+    """
+    N, M = u.shape
+    lap = np.zeros_like(u)
+    for i in range(N):
+        for j in range(M):
+            lap[i, j] = ((u[(i + 1) % N, j] - 2*u[i, j] + u[(i - 1) % N, j]) +
+                         (u[i, (j + 1) % M] - 2*u[i, j] + u[i, (j - 1) % M])) / h**2
+    return lap
+
+
+def comparar_con_ciclos(tamanos=(64, 128, 256), repeticiones=5):
+    """
+    Compara el tiempo del Laplaciano vectorizado con el de los ciclos anidados
+
+    Retorna una lista de tuplas (N, tiempo con ciclos, tiempo vectorizado)
+    """
+    print("=== LAPLACIANO: CICLOS VS VECTORIZADO ===")
+    print(f"{'N':>6} {'ciclos (s)':>12} {'vectorizado (s)':>16} {'aceleración':>12}")
+
+    resultados = []
+    for N in tamanos:
+        h = 2*np.pi / N
+        x = np.arange(N) * h
+        u = np.sin(x)[:, np.newaxis] * np.cos(2*x)[np.newaxis, :]
+
+        inicio = time.perf_counter()
+        ref = _laplaciano_ciclos(u, h)
+        t_ciclos = time.perf_counter() - inicio
+
+        out = np.empty_like(u)
+        inicio = time.perf_counter()
+        for _ in range(repeticiones):
+            laplaciano(u, h, out=out)
+        t_vec = (time.perf_counter() - inicio) / repeticiones
+
+        if not np.allclose(out, ref):
+            print(f"Advertencia: diferencia entre métodos en N = {N}")
+
+        print(f"{N:>6} {t_ciclos:>12.4f} {t_vec:>16.6f} {t_ciclos/t_vec:>11.0f}x")
+        resultados.append((N, t_ciclos, t_vec))
+
+    return resultados
+
+
+if __name__ == "__main__":
+    comparar_con_ciclos()